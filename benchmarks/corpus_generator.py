@@ -0,0 +1,225 @@
+# Benchmark Corpus Generator
+# Deterministic synthetic PDF collections of configurable size
+
+import json
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any
+
+# Collection sizes used by the benchmark suite
+SCALES = {
+    'small': {'documents': 3, 'pages': 4},
+    'medium': {'documents': 5, 'pages': 12},
+    'large': {'documents': 10, 'pages': 30},
+}
+
+# Vocabulary matching the generated persona, so relevance scores are non-trivial
+TOPIC_WORDS = [
+    'itinerary', 'hotel', 'restaurant', 'beach', 'museum', 'budget', 'group', 'friends',
+    'nightlife', 'train', 'booking', 'activities', 'culture', 'local', 'attractions',
+    'accommodation', 'transportation', 'tour', 'coastal', 'village', 'market', 'festival',
+    'day', 'trip', 'college', 'experience', 'recommendation', 'sightseeing', 'cuisine', 'wine'
+]
+
+FILLER_WORDS = [
+    'the', 'a', 'and', 'of', 'to', 'in', 'with', 'for', 'is', 'are', 'on', 'by', 'from',
+    'this', 'that', 'many', 'several', 'often', 'usually', 'visitors', 'region', 'city',
+    'small', 'large', 'historic', 'popular', 'quiet', 'early', 'late', 'season', 'summer',
+    'winter', 'morning', 'evening', 'walk', 'view', 'old', 'new', 'famous', 'nearby',
+    'offers', 'includes', 'provides', 'features', 'along', 'around', 'between', 'during'
+]
+
+PERSONA = {'role': 'Travel Planner', 'focus': 'Group Travel for Young Adults'}
+JOB = {'task': 'Plan a trip of 4 days for a group of 10 college friends.'}
+
+# Page layout (points) for generated PDFs
+PAGE_MARGIN = 50
+HEADER_HEIGHT = 24
+PARAGRAPH_HEIGHT = 110
+BLOCK_GAP = 8
+PARAGRAPHS_PER_PAGE = 4
+
+class CorpusGenerator:
+    """
+    Generates a collection directory of PDFs (and optional text fallbacks).
+
+    The same arguments and seed always produce the same document text and
+    layout. Headers are numbered so PDFProcessor classifies them as headers;
+    a share of paragraphs repeats earlier paragraphs to exercise
+    deduplication and uniqueness scoring. Text fallback documents are
+    written as markdown .pdf.txt files with no PDF, the way the input
+    examples are shipped.
+    """
+
+    def __init__(self, documents: int = 5, pages: int = 10, header_density: float = 1.0,
+                 duplicate_ratio: float = 0.1, text_fallback_ratio: float = 0.0,
+                 topic_ratio: float = 0.3, seed: int = 0):
+        if not 0.0 <= duplicate_ratio <= 1.0 or not 0.0 <= text_fallback_ratio <= 1.0:
+            raise ValueError("duplicate_ratio and text_fallback_ratio must be between 0.0 and 1.0")
+
+        self.documents = documents
+        self.pages = pages
+        self.header_density = header_density
+        self.duplicate_ratio = duplicate_ratio
+        self.text_fallback_ratio = text_fallback_ratio
+        self.topic_ratio = topic_ratio
+        self.seed = seed
+
+    def generate(self, output_dir: str) -> Dict[str, Any]:
+        """
+        Write the collection and its persona.json.
+
+        Args:
+            output_dir: Collection directory to create
+
+        Returns:
+            Manifest with the generation settings and per-document counts
+        """
+        import fitz  # PyMuPDF, only needed to generate PDFs
+
+        rng = random.Random(self.seed)
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        paragraph_pool = []
+        text_fallbacks = round(self.documents * self.text_fallback_ratio)
+        manifest_documents = []
+
+        for doc_index in range(self.documents):
+            is_text = doc_index >= self.documents - text_fallbacks
+            pages = [self._generate_page(rng, paragraph_pool) for _ in range(self.pages)]
+
+            filename = f"document_{doc_index + 1:03d}.pdf"
+            if is_text:
+                self._write_text(output_path / f"{filename}.txt", doc_index, pages)
+                filename += '.txt'
+            else:
+                self._write_pdf(fitz, output_path / filename, pages)
+
+            manifest_documents.append({
+                'filename': filename,
+                'format': 'text' if is_text else 'pdf',
+                'pages': len(pages),
+                'headers': sum(len(page['headers']) for page in pages),
+                'paragraphs': sum(len(page['blocks']) - len(page['headers']) for page in pages)
+            })
+
+        input_config = {
+            'persona': PERSONA,
+            'job_to_be_done': JOB,
+            'documents': [doc['filename'] for doc in manifest_documents]
+        }
+        with open(output_path / 'persona.json', 'w', encoding='utf-8') as f:
+            json.dump(input_config, f, indent=2)
+
+        return {
+            'settings': {
+                'documents': self.documents,
+                'pages': self.pages,
+                'header_density': self.header_density,
+                'duplicate_ratio': self.duplicate_ratio,
+                'text_fallback_ratio': self.text_fallback_ratio,
+                'topic_ratio': self.topic_ratio,
+                'seed': self.seed
+            },
+            'total_pages': sum(doc['pages'] for doc in manifest_documents),
+            'documents': manifest_documents
+        }
+
+    def _generate_page(self, rng: random.Random, paragraph_pool: List[str]) -> Dict[str, Any]:
+        """Lay out one page as a list of header and paragraph blocks."""
+        header_count = int(self.header_density)
+        if rng.random() < self.header_density - header_count:
+            header_count += 1
+        header_count = min(header_count, PARAGRAPHS_PER_PAGE)
+
+        # Headers are placed before evenly spread paragraphs
+        header_slots = set(rng.sample(range(PARAGRAPHS_PER_PAGE), header_count))
+        blocks = []
+        headers = []
+        for slot in range(PARAGRAPHS_PER_PAGE):
+            if slot in header_slots:
+                header = self._generate_header(rng)
+                headers.append(header)
+                blocks.append(('header', header))
+
+            if paragraph_pool and rng.random() < self.duplicate_ratio:
+                paragraph = rng.choice(paragraph_pool)
+            else:
+                paragraph = self._generate_paragraph(rng)
+                paragraph_pool.append(paragraph)
+            blocks.append(('paragraph', paragraph))
+
+        return {'blocks': blocks, 'headers': headers}
+
+    def _generate_header(self, rng: random.Random) -> str:
+        """Make a numbered header from a few topic words."""
+        words = rng.sample(TOPIC_WORDS, rng.randint(2, 4))
+        return f"{rng.randint(1, 9)}. " + ' '.join(word.capitalize() for word in words)
+
+    def _generate_paragraph(self, rng: random.Random) -> str:
+        """Make a paragraph of sentences mixing topic and filler words."""
+        sentences = []
+        for _ in range(rng.randint(3, 5)):
+            words = [rng.choice(TOPIC_WORDS) if rng.random() < self.topic_ratio else rng.choice(FILLER_WORDS)
+                     for _ in range(rng.randint(8, 15))]
+            sentences.append(' '.join(words).capitalize() + '.')
+        return ' '.join(sentences)
+
+    def _write_pdf(self, fitz: Any, path: Path, pages: List[Dict[str, Any]]) -> None:
+        """Render page layouts into a reproducible PDF file."""
+        doc = fitz.open()
+        for page_layout in pages:
+            page = doc.new_page()
+            width = page.rect.width
+            y = PAGE_MARGIN
+            for kind, text in page_layout['blocks']:
+                height = HEADER_HEIGHT if kind == 'header' else PARAGRAPH_HEIGHT
+                rect = fitz.Rect(PAGE_MARGIN, y, width - PAGE_MARGIN, y + height)
+                page.insert_textbox(rect, text, fontsize=14 if kind == 'header' else 9)
+                y += height + BLOCK_GAP
+
+        # Fixed metadata and document id keep the file bytes reproducible
+        doc.set_metadata({'title': path.stem, 'creationDate': '', 'modDate': ''})
+        doc.save(str(path), garbage=3, deflate=True, no_new_id=True)
+        doc.close()
+
+    def _write_text(self, path: Path, doc_index: int, pages: List[Dict[str, Any]]) -> None:
+        """Write page layouts as a markdown text fallback document."""
+        lines = [f"# Document {doc_index + 1}", ""]
+        for page_layout in pages:
+            for kind, text in page_layout['blocks']:
+                lines.append(f"## {text}" if kind == 'header' else text)
+                lines.append("")
+        path.write_text('\n'.join(lines), encoding='utf-8')
+
+def main():
+    """Generate a benchmark collection from the command line."""
+    parser = argparse.ArgumentParser(description='Generate a deterministic synthetic PDF collection')
+    parser.add_argument('output', help='Collection directory to create')
+    parser.add_argument('--scale', choices=list(SCALES), default=None,
+                        help='Preset document and page counts')
+    parser.add_argument('--documents', type=int, default=5, help='Number of documents')
+    parser.add_argument('--pages', type=int, default=10, help='Pages per document')
+    parser.add_argument('--header-density', type=float, default=1.0, help='Average headers per page')
+    parser.add_argument('--duplicate-ratio', type=float, default=0.1,
+                        help='Share of paragraphs repeating an earlier paragraph')
+    parser.add_argument('--text-fallback-ratio', type=float, default=0.0,
+                        help='Share of documents written as .pdf.txt text fallbacks')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    sizes = SCALES[args.scale] if args.scale else {'documents': args.documents, 'pages': args.pages}
+    generator = CorpusGenerator(
+        header_density=args.header_density,
+        duplicate_ratio=args.duplicate_ratio,
+        text_fallback_ratio=args.text_fallback_ratio,
+        seed=args.seed,
+        **sizes
+    )
+    manifest = generator.generate(args.output)
+    print(f"Generated {len(manifest['documents'])} documents ({manifest['total_pages']} pages) in {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+# Differential Equivalence Harness
+# Compares the reference per-section scoring code with the fast batched/vectorized paths
+
+import sys
+import json
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+# Run from the repository root: python -m benchmarks.equivalence_harness
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import DocumentIntelligenceSystem
+from src.persona_matcher import PersonaMatcher
+from src.section_ranker import SectionRanker, TokenSetCache
+from src.topk_retriever import MaxScoreRetriever
+from src.collection_stats import CollectionStatistics, InvertedIndex
+from src.token_stream import TokenStream
+from benchmarks.corpus_generator import CorpusGenerator, SCALES
+
+logger = logging.getLogger(__name__)
+
+# Accuracy target for approximate uniqueness, as the largest and mean change it
+# may cause in a section's final score. Its errors reach the final score scaled
+# by the uniqueness weight, which sets the score tolerances below; the ranking
+# tolerances allow at most two of the top 10 sections to change.
+APPROXIMATE_MAX_FINAL_SCORE_ERROR = 0.005
+APPROXIMATE_MEAN_FINAL_SCORE_ERROR = 0.001
+UNIQUENESS_WEIGHT = SectionRanker().ranking_weights['uniqueness_score']
+
+# Default tolerances per check. Exact fast paths differ only by float rounding
+# (ranking accumulates in float32); approximate uniqueness estimates each
+# section's similarity sum from a sample of partners.
+DEFAULT_TOLERANCES = {
+    'relevance_keyword': {'max_abs_delta': 1e-9, 'min_top_k_overlap': 1.0, 'min_rank_correlation': 0.999},
+    'relevance_bm25': {'max_abs_delta': 1e-9, 'min_top_k_overlap': 1.0, 'min_rank_correlation': 0.999},
+    'topk_bm25': {'max_abs_delta': 1e-9, 'min_top_k_overlap': 1.0},
+    'uniqueness_exact': {'max_abs_delta': 1e-9, 'min_top_k_overlap': 1.0, 'min_rank_correlation': 0.999},
+    'uniqueness_approximate': {'max_abs_delta': APPROXIMATE_MAX_FINAL_SCORE_ERROR / UNIQUENESS_WEIGHT,
+                               'max_mean_abs_delta': APPROXIMATE_MEAN_FINAL_SCORE_ERROR / UNIQUENESS_WEIGHT,
+                               'min_top_k_overlap': 0.8, 'min_rank_correlation': 0.95},
+    'ranking': {'max_abs_delta': 1e-5, 'min_top_k_overlap': 1.0, 'min_rank_correlation': 0.999},
+}
+
+def rank_correlation(reference: np.ndarray, fast: np.ndarray) -> float:
+    """Spearman rank correlation (average ranks for ties; 1.0 for constant inputs)."""
+    if len(reference) < 2:
+        return 1.0
+    reference_ranks = _average_ranks(reference)
+    fast_ranks = _average_ranks(fast)
+    if reference_ranks.std() == 0 or fast_ranks.std() == 0:
+        return 1.0 if np.array_equal(reference_ranks, fast_ranks) else 0.0
+    return float(np.corrcoef(reference_ranks, fast_ranks)[0, 1])
+
+def _average_ranks(values: np.ndarray) -> np.ndarray:
+    order = np.argsort(values, kind='stable')
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(len(values))
+    # Tied values share the mean of their ranks
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ranks)
+    return sums[inverse] / counts[inverse]
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the K highest scores, ties broken by position."""
+    return np.argsort(-scores, kind='stable')[:k]
+
+def compare_scores(reference: np.ndarray, fast: np.ndarray, k: int) -> Dict[str, float]:
+    """
+    Compare aligned reference and fast scores.
+
+    Args:
+        reference: Scores from the reference path
+        fast: Scores from the fast path, aligned with reference
+        k: Top-K size for the overlap measure
+
+    Returns:
+        Maximum and mean absolute delta, top-K overlap and rank correlation
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    fast = np.asarray(fast, dtype=np.float64)
+    if len(reference) == 0:
+        return {'sections': 0, 'max_abs_delta': 0.0, 'mean_abs_delta': 0.0,
+                'top_k_overlap': 1.0, 'rank_correlation': 1.0}
+
+    deltas = np.abs(reference - fast)
+    k = min(k, len(reference))
+    overlap = len(set(top_k_indices(reference, k).tolist()) & set(top_k_indices(fast, k).tolist()))
+    return {
+        'sections': len(reference),
+        'max_abs_delta': float(deltas.max()),
+        'mean_abs_delta': float(deltas.mean()),
+        'top_k_overlap': overlap / k,
+        'rank_correlation': rank_correlation(reference, fast)
+    }
+
+class EquivalenceHarness:
+    """
+    Runs reference and fast implementations on the same sections.
+
+    References are the per-section PersonaMatcher.calculate_relevance,
+    SectionRanker._calculate_uniqueness_score and the per-section
+    _calculate_all_scores/_calculate_final_score ranking. Fast paths are the
+    token-stream batch scoring, MaxScore top-K retrieval, bulk exact and
+    sampled approximate uniqueness, and the vectorized rank_sections. Semantic scoring
+    has no per-section reference and is not compared.
+    """
+
+    def __init__(self, tolerances: Dict[str, Dict[str, float]] = None, top_k: int = 10):
+        self.tolerances = {check: dict(limits) for check, limits in DEFAULT_TOLERANCES.items()}
+        for check, limits in (tolerances or {}).items():
+            self.tolerances.setdefault(check, {}).update(limits)
+        self.top_k = top_k
+        self.system = DocumentIntelligenceSystem()
+
+    def load_sections(self, collection_dir: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Extract and section a collection, returning sections and the persona profile."""
+        input_config = self.system._load_input_config(collection_dir)
+        persona_profile = self.system.persona_matcher.analyze_persona(
+            input_config['persona'], input_config['job_to_be_done']
+        )
+        documents = self.system._extract_documents(collection_dir, input_config['documents'])
+        sections = [section for doc in documents for section in self.system._section_document(doc)]
+        return sections, persona_profile
+
+    def run_collection(self, collection_dir: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Run every check on one collection.
+
+        Args:
+            collection_dir: Collection with an input configuration and documents
+
+        Returns:
+            Check results with metrics, tolerances and pass/fail
+        """
+        sections, persona_profile = self.load_sections(collection_dir)
+        token_stream = TokenStream.build(sections)
+        collection_stats = CollectionStatistics.build(sections, token_stream)
+
+        metrics = {}
+        metrics.update(self._check_relevance(sections, persona_profile, token_stream, collection_stats))
+        metrics['topk_bm25'] = self._check_topk(sections, persona_profile, token_stream, collection_stats)
+        metrics.update(self._check_uniqueness(sections, token_stream))
+        metrics['ranking'] = self._check_ranking(sections, persona_profile, token_stream)
+
+        return {check: self._evaluate(check, check_metrics) for check, check_metrics in metrics.items()}
+
+    def _check_relevance(self, sections: List[Dict[str, Any]], persona_profile: Dict[str, Any],
+                         token_stream: TokenStream,
+                         collection_stats: CollectionStatistics) -> Dict[str, Dict[str, float]]:
+        results = {}
+        for mode in ('keyword', 'bm25'):
+            matcher = PersonaMatcher(scoring_mode=mode)
+            stats = collection_stats if mode == 'bm25' else None
+            reference = [matcher.calculate_relevance(section, persona_profile, stats) for section in sections]
+            fast = matcher.calculate_relevance_batch(sections, persona_profile, stats, token_stream)
+            results[f"relevance_{mode}"] = compare_scores(reference, fast, self.top_k)
+        return results
+
+    def _check_topk(self, sections: List[Dict[str, Any]], persona_profile: Dict[str, Any],
+                    token_stream: TokenStream, collection_stats: CollectionStatistics) -> Dict[str, float]:
+        """Top-K retrieval against full BM25 scoring: same sections, same scores."""
+        matcher = PersonaMatcher(scoring_mode='bm25')
+        reference = np.array(matcher.calculate_relevance_batch(
+            sections, persona_profile, collection_stats, token_stream
+        ))
+        k = min(self.top_k, len(sections))
+        index = InvertedIndex.build(sections, token_stream)
+        retrieved = MaxScoreRetriever(matcher).retrieve(sections, persona_profile, collection_stats, index, k)
+        if not retrieved:
+            return compare_scores([], [], k)
+
+        # Scores are compared on the retrieved sections; the overlap is against the full ranking
+        retrieved_indices = np.array([section_index for section_index, _ in retrieved])
+        retrieved_scores = np.array([score for _, score in retrieved])
+        deltas = np.abs(reference[retrieved_indices] - retrieved_scores)
+
+        # Sections tied with the K-th score may be retrieved in either order
+        kth_score = np.sort(reference)[::-1][k - 1]
+        eligible = set(np.flatnonzero(reference >= kth_score).tolist())
+        return {
+            'sections': len(sections),
+            'max_abs_delta': float(deltas.max()),
+            'mean_abs_delta': float(deltas.mean()),
+            'top_k_overlap': len(set(retrieved_indices.tolist()) & eligible) / k,
+            'rank_correlation': None
+        }
+
+    def _check_uniqueness(self, sections: List[Dict[str, Any]],
+                          token_stream: TokenStream) -> Dict[str, Dict[str, float]]:
+        ranker = SectionRanker()
+        reference = [ranker._calculate_uniqueness_score(section, sections) for section in sections]
+        results = {}
+        for mode in ('exact', 'approximate'):
+            fast = ranker._compute_uniqueness_scores(sections, TokenSetCache(token_stream), mode)
+            results[f"uniqueness_{mode}"] = compare_scores(reference, fast, self.top_k)
+        return results
+
+    def _check_ranking(self, sections: List[Dict[str, Any]], persona_profile: Dict[str, Any],
+                       token_stream: TokenStream) -> Dict[str, float]:
+        """Per-section final scores against the vectorized cascade with full ranking."""
+        matcher = PersonaMatcher()
+        for section, relevance_score in zip(sections, matcher.calculate_relevance_batch(
+                sections, persona_profile, token_stream=token_stream)):
+            section['relevance_score'] = relevance_score
+
+        ranker = SectionRanker(uniqueness_mode='exact')
+        reference = [ranker._calculate_final_score(ranker._calculate_all_scores(section, persona_profile, sections))
+                     for section in sections]
+
+        ranked = ranker.rank_sections(sections, persona_profile, full_ranking=True, token_stream=token_stream)
+        final_scores = {id(section): section['final_score'] for section in ranked}
+        fast = [final_scores[id(section)] for section in sections]
+        return compare_scores(reference, fast, self.top_k)
+
+    def _evaluate(self, check: str, metrics: Dict[str, float]) -> Dict[str, Any]:
+        limits = self.tolerances.get(check, {})
+        failures = []
+        if limits.get('max_abs_delta') is not None and metrics['max_abs_delta'] > limits['max_abs_delta']:
+            failures.append('max_abs_delta')
+        if limits.get('max_mean_abs_delta') is not None and metrics['mean_abs_delta'] > limits['max_mean_abs_delta']:
+            failures.append('mean_abs_delta')
+        if limits.get('min_top_k_overlap') is not None and metrics['top_k_overlap'] < limits['min_top_k_overlap']:
+            failures.append('top_k_overlap')
+        if (limits.get('min_rank_correlation') is not None and metrics['rank_correlation'] is not None and
+                metrics['rank_correlation'] < limits['min_rank_correlation']):
+            failures.append('rank_correlation')
+
+        return {'metrics': metrics, 'tolerances': limits, 'passed': not failures, 'failures': failures}
+
+def parse_tolerance(value: str) -> Tuple[str, str, float]:
+    """Parse CHECK.LIMIT=VALUE (e.g. uniqueness_approximate.max_abs_delta=0.2)."""
+    try:
+        key, number = value.split('=', 1)
+        check, limit = key.split('.', 1)
+        return check, limit, float(number)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected CHECK.LIMIT=VALUE, got: {value}")
+
+def main():
+    """Entry point for the equivalence harness; exits 1 when any check is out of tolerance."""
+    parser = argparse.ArgumentParser(
+        description='Compare reference and fast scoring paths on generated and real collections'
+    )
+    parser.add_argument('--collections', nargs='*', default=['input'],
+                        help='Real collection directories to check')
+    parser.add_argument('--scales', nargs='*', choices=list(SCALES), default=['small', 'medium'],
+                        help='Generated corpus scales to check')
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0, 1], help='Corpus generator seeds')
+    parser.add_argument('--top-k', type=int, default=10, help='K for top-K overlap')
+    parser.add_argument('--tolerance', action='append', type=parse_tolerance, default=[],
+                        metavar='CHECK.LIMIT=VALUE', help='Override a tolerance (repeatable)')
+    parser.add_argument('--output', default=None, help='Write the full report to this JSON file')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    tolerances = {}
+    for check, limit, value in args.tolerance:
+        tolerances.setdefault(check, {})[limit] = value
+    harness = EquivalenceHarness(tolerances, top_k=args.top_k)
+
+    report = {}
+    with tempfile.TemporaryDirectory(prefix='equivalence_') as temp_dir:
+        inputs = [(collection, collection) for collection in args.collections]
+        for scale in args.scales:
+            for seed in args.seeds:
+                collection_dir = str(Path(temp_dir) / f"{scale}_{seed}")
+                CorpusGenerator(seed=seed, duplicate_ratio=0.2, text_fallback_ratio=0.2,
+                                **SCALES[scale]).generate(collection_dir)
+                inputs.append((f"generated:{scale}:seed{seed}", collection_dir))
+
+        for name, collection_dir in inputs:
+            logger.info(f"Checking {name}")
+            report[name] = harness.run_collection(collection_dir)
+
+    failed = 0
+    for name, checks in report.items():
+        print(f"\n{name}")
+        for check, result in checks.items():
+            metrics = result['metrics']
+            correlation = metrics['rank_correlation']
+            print(f"  {check:<24} {'ok' if result['passed'] else 'FAIL':<5} "
+                  f"max delta {metrics['max_abs_delta']:.2e}  "
+                  f"top-K overlap {metrics['top_k_overlap']:.2f}  "
+                  f"rank corr {'-' if correlation is None else f'{correlation:.4f}'}"
+                  f"{'  (' + ', '.join(result['failures']) + ')' if result['failures'] else ''}")
+            failed += not result['passed']
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if failed:
+        logger.error(f"{failed} check(s) out of tolerance")
+        sys.exit(1)
+    print("\nAll checks within tolerance")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+# Performance Regression Gate
+# Compares benchmark runs against a checked-in baseline with noise-aware thresholds
+#
+# Latencies are only comparable on the machine and software stack that
+# produced the baseline, so the baseline must be regenerated on each CI
+# runner (python -m benchmarks.regression_gate --update-baseline) and again
+# whenever its Python, platform, numpy or PyMuPDF version changes. The gate
+# refuses to compare against a baseline from a different environment.
+
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any
+
+# Run from the repository root: python -m benchmarks.regression_gate
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.run_benchmarks import run_benchmarks, environment_info
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+# Scales a MAD to the standard deviation of normally distributed samples
+MAD_TO_SIGMA = 1.4826
+
+class RegressionGate:
+    """
+    Decides whether benchmark medians regressed against a baseline.
+
+    A stage at a scale regresses when its median latency exceeds the baseline
+    median by more than the largest of: `noise_multiplier` standard deviations
+    (estimated from the larger of the two MADs), `min_relative` of the
+    baseline median, and `min_absolute` seconds. The relative and absolute
+    floors keep very stable or very fast stages from failing on jitter.
+    Regressions found in a fresh run are re-measured; only those seen in
+    every attempt are reported, since machine load shifts whole runs in a
+    way within-run MAD does not capture.
+    """
+
+    def __init__(self, noise_multiplier: float = 3.0, min_relative: float = 0.20,
+                 min_absolute: float = 0.002):
+        self.noise_multiplier = noise_multiplier
+        self.min_relative = min_relative
+        self.min_absolute = min_absolute
+
+    def compare(self, baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Compare every stage and scale present in both results.
+
+        Args:
+            baseline: Baseline benchmark results
+            current: Current benchmark results
+
+        Returns:
+            One comparison per (scale, stage) with medians, allowed slowdown
+            and status ('regression', 'improvement' or 'ok')
+        """
+        comparisons = []
+        for scale, base_scale in baseline['scales'].items():
+            current_scale = current['scales'].get(scale)
+            if current_scale is None:
+                continue
+
+            for stage, base_stage in base_scale['stages'].items():
+                current_stage = current_scale['stages'].get(stage)
+                if current_stage is None:
+                    continue
+                comparisons.append(self._compare_stage(
+                    scale, stage, base_stage['latency_seconds'], current_stage['latency_seconds']
+                ))
+
+        return comparisons
+
+    def _compare_stage(self, scale: str, stage: str, base: Dict[str, float],
+                       current: Dict[str, float]) -> Dict[str, Any]:
+        noise = MAD_TO_SIGMA * max(base['mad'], current['mad'])
+        allowed = max(self.noise_multiplier * noise,
+                      self.min_relative * base['median'],
+                      self.min_absolute)
+        change = current['median'] - base['median']
+
+        if change > allowed:
+            status = 'regression'
+        elif change < -allowed:
+            status = 'improvement'
+        else:
+            status = 'ok'
+
+        return {
+            'scale': scale,
+            'stage': stage,
+            'baseline_median': base['median'],
+            'current_median': current['median'],
+            'change_seconds': change,
+            'change_ratio': change / base['median'] if base['median'] > 0 else None,
+            'allowed_seconds': allowed,
+            'status': status
+        }
+
+def environment_differences(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """
+    List the environment fields that differ between two benchmark results.
+
+    Args:
+        baseline: Baseline environment
+        current: Current environment
+
+    Returns:
+        One 'field: baseline -> current' description per differing field
+    """
+    return [
+        f"{key}: {baseline.get(key)} -> {current.get(key)}"
+        for key in sorted(set(baseline) | set(current))
+        if baseline.get(key) != current.get(key)
+    ]
+
+def make_baseline(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only what the gate needs: configuration and latency summaries."""
+    return {
+        'environment': results['environment'],
+        'config': results['config'],
+        'scales': {
+            scale: {
+                'total_pages': scale_results['total_pages'],
+                'sections': scale_results['sections'],
+                'stages': {
+                    stage: {'latency_seconds': stage_results['latency_seconds']}
+                    for stage, stage_results in scale_results['stages'].items()
+                }
+            }
+            for scale, scale_results in results['scales'].items()
+        }
+    }
+
+def print_report(comparisons: List[Dict[str, Any]]) -> None:
+    """Print one line per comparison, flagging regressions."""
+    print(f"{'scale':<8} {'stage':<10} {'baseline':>11} {'current':>11} {'change':>8} {'allowed':>10}  status")
+    for comparison in comparisons:
+        ratio = comparison['change_ratio']
+        print(f"{comparison['scale']:<8} {comparison['stage']:<10} "
+              f"{comparison['baseline_median'] * 1000:9.2f}ms {comparison['current_median'] * 1000:9.2f}ms "
+              f"{(ratio or 0) * 100:+7.1f}% {comparison['allowed_seconds'] * 1000:8.2f}ms  "
+              f"{comparison['status'].upper() if comparison['status'] == 'regression' else comparison['status']}")
+
+def main():
+    """
+    Entry point for the regression gate.
+
+    Exits 1 when any stage regressed and 2 when the baseline comes from a
+    different environment.
+    """
+    parser = argparse.ArgumentParser(
+        description='Run the benchmark matrix and compare it against a stored baseline'
+    )
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+    parser.add_argument('--results', default=None,
+                        help='Compare an existing run_benchmarks results file instead of running')
+    parser.add_argument('--repeat', type=int, default=None,
+                        help='Timed repetitions (defaults to the baseline configuration)')
+    parser.add_argument('--noise-multiplier', type=float, default=3.0,
+                        help='Allowed slowdown in noise standard deviations (from MAD)')
+    parser.add_argument('--min-relative', type=float, default=0.20,
+                        help='Minimum allowed slowdown as a fraction of the baseline median')
+    parser.add_argument('--min-absolute', type=float, default=0.002,
+                        help='Minimum allowed slowdown in seconds')
+    parser.add_argument('--retries', type=int, default=1,
+                        help='Re-runs confirming regressions before they fail the gate')
+    parser.add_argument('--report', default=None, help='Write the comparisons to this JSON file')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Run the matrix and overwrite the baseline instead of comparing')
+    parser.add_argument('--ignore-environment', action='store_true',
+                        help='Compare even when the baseline was recorded in a different environment')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    baseline_path = Path(args.baseline)
+    baseline = None
+    if baseline_path.exists():
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    elif not args.update_baseline:
+        parser.error(f"Baseline not found: {baseline_path} (create it with --update-baseline)")
+
+    def run_matrix() -> Dict[str, Any]:
+        # Reproduce the baseline's matrix so medians are comparable
+        config = baseline['config'] if baseline else {}
+        return run_benchmarks(
+            list(baseline['scales']) if baseline else ['small', 'medium'],
+            repeat=args.repeat or config.get('repeat', 5),
+            warmup=config.get('warmup', 1),
+            seed=config.get('seed', 0),
+            system_options=config.get('system_options'),
+            corpus_options=config.get('corpus_options')
+        )
+
+    if args.update_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(make_baseline(run_matrix()), f, indent=2)
+            f.write('\n')
+        print(f"Baseline saved to: {baseline_path}")
+        return
+
+    # Results files carry their own environment; fresh runs use this one
+    if args.results:
+        with open(args.results, 'r', encoding='utf-8') as f:
+            current_environment = json.load(f).get('environment', {})
+    else:
+        current_environment = environment_info()
+    differences = environment_differences(baseline.get('environment', {}), current_environment)
+    if differences:
+        for difference in differences:
+            logger.warning(f"Environment differs from the baseline: {difference}")
+        if not args.ignore_environment:
+            logger.error("Baseline was recorded in a different environment; regenerate it on this "
+                         "runner with --update-baseline (or pass --ignore-environment)")
+            sys.exit(2)
+
+    gate = RegressionGate(args.noise_multiplier, args.min_relative, args.min_absolute)
+    attempts = 1 if args.results else 1 + max(0, args.retries)
+    confirmed = None
+    for attempt in range(attempts):
+        if args.results:
+            with open(args.results, 'r', encoding='utf-8') as f:
+                current = json.load(f)
+        else:
+            current = run_matrix()
+
+        comparisons = gate.compare(baseline, current)
+        flagged = {(comparison['scale'], comparison['stage'])
+                   for comparison in comparisons if comparison['status'] == 'regression'}
+        confirmed = flagged if confirmed is None else confirmed & flagged
+        if not confirmed:
+            break
+        if attempt + 1 < attempts:
+            logger.info(f"Re-running to confirm {len(confirmed)} possible regression(s)")
+
+    for comparison in comparisons:
+        if comparison['status'] == 'regression' and (comparison['scale'], comparison['stage']) not in confirmed:
+            comparison['status'] = 'unconfirmed'
+    print_report(comparisons)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'comparisons': comparisons}, f, indent=2)
+
+    regressions = [comparison for comparison in comparisons if comparison['status'] == 'regression']
+    if regressions:
+        for regression in regressions:
+            logger.error(f"Regression in {regression['stage']} at {regression['scale']} scale: "
+                         f"{regression['baseline_median'] * 1000:.2f} ms -> "
+                         f"{regression['current_median'] * 1000:.2f} ms")
+        sys.exit(1)
+
+    print(f"\nNo regressions in {len(comparisons)} stage/scale comparisons")
+
+if __name__ == "__main__":
+    main()
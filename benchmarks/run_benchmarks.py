@@ -0,0 +1,276 @@
+# Benchmark Suite
+# Runs the full pipeline and each stage over generated corpora at several scales
+
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Tuple
+
+import numpy as np
+
+# Run from the repository root: python -m benchmarks.run_benchmarks
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import DocumentIntelligenceSystem
+from src.memory_monitor import MemoryMonitor, peak_rss, MB
+from benchmarks.corpus_generator import CorpusGenerator, SCALES
+
+logger = logging.getLogger(__name__)
+
+# Stages timed separately, in pipeline order, followed by the full pipeline
+STAGES = ('extract', 'section', 'score', 'rank', 'refine')
+PIPELINE = 'pipeline'
+
+def summarize_samples(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples.
+
+    Args:
+        samples: Latencies in seconds
+
+    Returns:
+        Median, median absolute deviation, percentiles, mean, min and max
+    """
+    values = np.asarray(samples, dtype=np.float64)
+    median = float(np.median(values))
+    return {
+        'median': median,
+        'mad': float(np.median(np.abs(values - median))),
+        'p50': float(np.percentile(values, 50)),
+        'p90': float(np.percentile(values, 90)),
+        'p99': float(np.percentile(values, 99)),
+        'mean': float(values.mean()),
+        'min': float(values.min()),
+        'max': float(values.max())
+    }
+
+class BenchmarkRunner:
+    """
+    Times the pipeline stages and the full pipeline on collection directories.
+
+    Each stage is timed on the output of the previous one, in a fresh pass
+    per repetition so that no stage benefits from work cached by an earlier
+    run. Memory is measured in one extra pass with allocation tracing, kept
+    separate because tracemalloc slows the timed code.
+    """
+
+    def __init__(self, system_options: Dict[str, Any] = None, repeat: int = 5, warmup: int = 1):
+        self.system_options = system_options or {}
+        self.repeat = repeat
+        self.warmup = warmup
+        self.system = DocumentIntelligenceSystem(**self.system_options)
+
+    def run_collection(self, collection_dir: str, total_pages: int) -> Dict[str, Any]:
+        """
+        Benchmark one collection.
+
+        Args:
+            collection_dir: Collection with persona.json and documents
+            total_pages: Page count used for pages/s throughput
+
+        Returns:
+            Per-stage latency summaries, raw samples, throughput and memory
+        """
+        input_config = self.system._load_input_config(collection_dir)
+        persona_profile = self.system.persona_matcher.analyze_persona(
+            input_config['persona'], input_config['job_to_be_done']
+        )
+
+        samples = {name: [] for name in STAGES + (PIPELINE,)}
+        section_count = 0
+        with tempfile.TemporaryDirectory(prefix='benchmark_output_') as output_dir:
+            for iteration in range(self.warmup + self.repeat):
+                timings, section_count = self._run_stages(collection_dir, input_config, persona_profile)
+                timings[PIPELINE] = self._time(
+                    lambda: self._check(self.system.process_collection(collection_dir, output_dir))
+                )
+                if iteration >= self.warmup:
+                    for name, seconds in timings.items():
+                        samples[name].append(seconds)
+
+            memory = self._measure_memory(collection_dir, input_config, persona_profile, output_dir)
+
+        stages = {}
+        for name, stage_samples in samples.items():
+            summary = summarize_samples(stage_samples)
+            stages[name] = {
+                'latency_seconds': summary,
+                'samples': stage_samples,
+                'pages_per_second': total_pages / summary['median'] if summary['median'] > 0 else None,
+                'sections_per_second': section_count / summary['median'] if summary['median'] > 0 else None,
+                'memory': memory.get(name, {})
+            }
+
+        return {'sections': section_count, 'stages': stages}
+
+    def _run_stages(self, collection_dir: str, input_config: Dict[str, Any],
+                    persona_profile: Dict[str, Any], stage: Callable = None) -> Tuple[Dict[str, float], int]:
+        """Run every stage once, returning stage timings and the section count."""
+        system = self.system
+        timings = {}
+        results = {}
+
+        def timed(name, step):
+            if stage is None:
+                timings[name] = self._time(lambda: results.__setitem__(name, step()))
+            else:
+                with stage(name):
+                    results[name] = step()
+
+        timed('extract', lambda: system._extract_documents(collection_dir, input_config['documents']))
+        timed('section', lambda: [section for doc in results['extract']
+                                  for section in system._section_document(doc)])
+        timed('score', lambda: system._score_sections(results['section'], persona_profile))
+        sections, token_stream = results['score']
+        timed('rank', lambda: system.section_ranker.rank_sections(
+            sections, persona_profile, token_stream=token_stream
+        ))
+        timed('refine', lambda: list(system._analyze_subsections(results['rank'], persona_profile)))
+
+        return timings, len(results['section'])
+
+    def _measure_memory(self, collection_dir: str, input_config: Dict[str, Any],
+                        persona_profile: Dict[str, Any], output_dir: str) -> Dict[str, Dict[str, Any]]:
+        """Peak traced allocation and RSS per stage, from one traced pass."""
+        monitor = MemoryMonitor(trace_allocations=True, top_allocators=3)
+        monitor.start()
+        try:
+            self._run_stages(collection_dir, input_config, persona_profile, stage=monitor.stage)
+            with monitor.stage(PIPELINE):
+                self._check(self.system.process_collection(collection_dir, output_dir))
+        finally:
+            monitor.stop()
+        return monitor.stages
+
+    def _time(self, step: Callable[[], Any]) -> float:
+        start = time.perf_counter()
+        step()
+        return time.perf_counter() - start
+
+    def _check(self, result: Dict[str, Any]) -> None:
+        if result['status'] != 'success':
+            raise RuntimeError(f"Pipeline failed during benchmark: {result.get('error')}")
+
+def run_benchmarks(scales: List[str], repeat: int = 5, warmup: int = 1, seed: int = 0,
+                   system_options: Dict[str, Any] = None, corpus_dir: str = None,
+                   corpus_options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Generate a corpus per scale and benchmark it.
+
+    Args:
+        scales: Scale names from SCALES
+        repeat: Timed repetitions per stage
+        warmup: Untimed repetitions before timing
+        seed: Corpus generator seed
+        system_options: DocumentIntelligenceSystem constructor arguments
+        corpus_dir: Directory to keep generated corpora in (temporary if None)
+        corpus_options: Extra CorpusGenerator arguments (header density, duplicates, ...)
+
+    Returns:
+        Benchmark results with environment, configuration and per-scale stages
+    """
+    runner = BenchmarkRunner(system_options, repeat=repeat, warmup=warmup)
+    results = {
+        'environment': environment_info(),
+        'config': {
+            'repeat': repeat,
+            'warmup': warmup,
+            'seed': seed,
+            'system_options': system_options or {},
+            'corpus_options': corpus_options or {}
+        },
+        'scales': {}
+    }
+
+    with tempfile.TemporaryDirectory(prefix='benchmark_corpus_') as temp_dir:
+        root = Path(corpus_dir or temp_dir)
+        for scale in scales:
+            generator = CorpusGenerator(seed=seed, **SCALES[scale], **(corpus_options or {}))
+            manifest = generator.generate(str(root / scale))
+            logger.info(f"Benchmarking {scale}: {len(manifest['documents'])} documents, "
+                        f"{manifest['total_pages']} pages")
+
+            scale_results = runner.run_collection(str(root / scale), manifest['total_pages'])
+            scale_results['corpus'] = manifest['settings']
+            scale_results['total_pages'] = manifest['total_pages']
+            results['scales'][scale] = scale_results
+
+    peak = peak_rss()
+    results['peak_rss_mb'] = round(peak / MB, 2) if peak is not None else None
+    return results
+
+def environment_info() -> Dict[str, Any]:
+    """Get the interpreter, platform and library versions that latencies depend on."""
+    environment = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__
+    }
+    try:
+        import fitz
+        environment['pymupdf'] = fitz.VersionBind
+    except ImportError:
+        environment['pymupdf'] = None
+    return environment
+
+def print_summary(results: Dict[str, Any]) -> None:
+    """Print median latency and throughput per scale and stage."""
+    for scale, scale_results in results['scales'].items():
+        print(f"\n{scale}: {scale_results['total_pages']} pages, {scale_results['sections']} sections")
+        for name, stage in scale_results['stages'].items():
+            latency = stage['latency_seconds']
+            print(f"  {name:<10} median {latency['median'] * 1000:9.2f} ms  "
+                  f"p90 {latency['p90'] * 1000:9.2f} ms  "
+                  f"{stage['pages_per_second'] or 0:10.1f} pages/s  "
+                  f"{stage['sections_per_second'] or 0:10.1f} sections/s")
+
+def main():
+    """Entry point for the benchmark suite."""
+    parser = argparse.ArgumentParser(description='Document Intelligence System benchmarks')
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=list(SCALES),
+                        help='Corpus scales to benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions per stage')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed repetitions before timing')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus generator seed')
+    parser.add_argument('--scoring-mode', choices=['keyword', 'bm25', 'semantic'], default='keyword',
+                        help='Relevance scoring mode')
+    parser.add_argument('--header-density', type=float, default=1.0, help='Average headers per page')
+    parser.add_argument('--duplicate-ratio', type=float, default=0.1,
+                        help='Share of paragraphs repeating an earlier paragraph')
+    parser.add_argument('--text-fallback-ratio', type=float, default=0.0,
+                        help='Share of documents written as .pdf.txt text fallbacks')
+    parser.add_argument('--corpus-dir', default=None, help='Keep generated corpora in this directory')
+    parser.add_argument('--output', default='benchmark_results.json', help='Results JSON file')
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    # Per-document pipeline logging would dominate the console
+    logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    results = run_benchmarks(
+        args.scales, repeat=args.repeat, warmup=args.warmup, seed=args.seed,
+        system_options={'scoring_mode': args.scoring_mode},
+        corpus_dir=args.corpus_dir,
+        corpus_options={
+            'header_density': args.header_density,
+            'duplicate_ratio': args.duplicate_ratio,
+            'text_fallback_ratio': args.text_fallback_ratio
+        }
+    )
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    print_summary(results)
+    print(f"\nResults saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
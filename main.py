@@ -6,9 +6,12 @@ import os
 import sys
 import time
 import logging
+import tempfile
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Iterable, Iterator, Optional
 import argparse
+import functools
+import contextlib
 
 # Core modules
 from src.pdf_processor import PDFProcessor
@@ -16,6 +19,22 @@ from src.text_analyzer import TextAnalyzer
 from src.persona_matcher import PersonaMatcher
 from src.section_ranker import SectionRanker
 from src.output_generator import OutputGenerator
+from src.output_writer import StreamingOutputWriter, OUTPUT_FORMATS, OUTPUT_FILE_MODE
+from src.result_cache import ResultCache
+from src.batch_runner import BatchRunner
+from src.lru_cache import LRUCache
+from src.deadline_scheduler import DeadlineScheduler
+from src import tracing
+from src.memory_monitor import MemoryMonitor, MB
+from src.collection_stats import CollectionStatistics, InvertedIndex
+from src.topk_retriever import MaxScoreRetriever
+from src.token_stream import TokenStream
+from src.document_prefilter import DocumentPrefilter
+from src.instrumentation import ComponentInstrumentation, SECTION_RANKER_METHODS, PERSONA_MATCHER_METHODS
+from src.lazy_imports import preload
+
+# Page fields released after sectioning when running on a memory budget
+PAGE_DATA_FIELDS = ('structured_content', 'raw_text', 'text', 'sections')
 
 # Configure logging
 logging.basicConfig(
@@ -30,70 +49,246 @@ class DocumentIntelligenceSystem:
     Extracts and ranks relevant sections from PDF collections.
     """
     
-    def __init__(self):
+    def __init__(self, scoring_mode: str = 'keyword', stats_cache_dir: str = None,
+                 top_k_candidates: int = None, max_documents: int = None,
+                 prefilter_threshold: float = 0.0, stage_two_top_n: int = None,
+                 stage_three_top_m: int = None, full_ranking: bool = False,
+                 mmr_lambda: float = None, max_per_document: int = None,
+                 instrument: bool = False, output_format: str = 'pretty',
+                 result_cache_dir: str = None, result_cache_ttl: float = None,
+                 result_cache_max_entries: int = None,
+                 extraction_cache: LRUCache = None, profile_cache: LRUCache = None,
+                 pipelined: bool = False, time_budget: float = None,
+                 trace_path: str = None, trace_profile: bool = False,
+                 memory_budget_mb: float = None, memory_report: bool = False):
+        if top_k_candidates is not None and scoring_mode != 'bm25':
+            raise ValueError("Top-K candidate retrieval requires the bm25 scoring mode")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+        if memory_budget_mb is not None and memory_budget_mb <= 0:
+            raise ValueError("memory_budget_mb must be positive")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}. Expected one of {OUTPUT_FORMATS}")
+        
         self.pdf_processor = PDFProcessor()
         self.text_analyzer = TextAnalyzer()
-        self.persona_matcher = PersonaMatcher()
-        self.section_ranker = SectionRanker()
+        self.persona_matcher = PersonaMatcher(scoring_mode=scoring_mode)
+        self.section_ranker = SectionRanker(
+            stage_two_top_n=stage_two_top_n,
+            stage_three_top_m=stage_three_top_m,
+            full_ranking=full_ranking,
+            mmr_lambda=mmr_lambda,
+            max_per_document=max_per_document
+        )
         self.output_generator = OutputGenerator()
+        self.topk_retriever = MaxScoreRetriever(self.persona_matcher)
+        self.document_prefilter = DocumentPrefilter(max_documents, prefilter_threshold)
+        self.stats_cache_dir = stats_cache_dir
+        self.top_k_candidates = top_k_candidates
+        self.output_format = output_format
+        
+        # Options that change the output, part of every result cache key
+        self.result_config = {
+            'scoring_mode': scoring_mode,
+            'top_k_candidates': top_k_candidates,
+            'max_documents': max_documents,
+            'prefilter_threshold': prefilter_threshold,
+            'stage_two_top_n': stage_two_top_n,
+            'stage_three_top_m': stage_three_top_m,
+            'full_ranking': full_ranking,
+            'mmr_lambda': mmr_lambda,
+            'max_per_document': max_per_document,
+            'output_format': output_format,
+            'time_budget': time_budget
+        }
+        
+        # Optional in-memory caches, shareable between systems of one process
+        self.extraction_cache = extraction_cache
+        self.profile_cache = profile_cache
+        
+        self.async_pipeline = None
+        if pipelined:
+            # asyncio is only imported for pipelined runs
+            from src.async_pipeline import AsyncPipeline
+            self.async_pipeline = AsyncPipeline(self)
+        
+        # Deadline scheduler of the collection being processed (None without a time budget)
+        self.time_budget = time_budget
+        self.scheduler = None
+        
+        self.result_cache = None
+        if result_cache_dir:
+            self.result_cache = ResultCache(result_cache_dir, result_cache_ttl, result_cache_max_entries)
+        
+        # Memory accounting per stage; a budget also switches to low-memory processing
+        self.memory_budget_mb = memory_budget_mb
+        self.memory_report = memory_report
+        self.memory_monitor = None
+        if memory_budget_mb is not None or memory_report:
+            budget_bytes = int(memory_budget_mb * MB) if memory_budget_mb is not None else None
+            self.memory_monitor = MemoryMonitor(budget_bytes, trace_allocations=memory_report)
+        
+        # Span tracing is process-wide and costs nothing unless enabled
+        self.tracer = tracing.enable(trace_path, trace_profile) if trace_path else None
         
-    def process_collection(self, input_dir: str, output_dir: str) -> Dict[str, Any]:
+        # Component timing is wired in only when requested
+        self.instrumentation = None
+        if instrument:
+            self.instrumentation = ComponentInstrumentation()
+            self.instrumentation.attach(self.section_ranker, SECTION_RANKER_METHODS)
+            self.instrumentation.attach(self.persona_matcher, PERSONA_MATCHER_METHODS)
+    
+    def warm_up(self) -> None:
+        """
+        Load the lazily imported libraries and NLTK data now.
+        
+        Construction stays cheap for one-off CLI runs; long-lived processes
+        (the service and batch workers) call this once so their first request
+        does not pay for the imports.
+        """
+        preload('numpy', 'fitz', 'nltk')
+        try:
+            self.text_analyzer.stop_words
+        except Exception as e:
+            logger.warning(f"Could not load NLTK data: {str(e)}")
+        
+    def process_collection(self, input_dir: str, output_dir: str,
+                           input_config: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Process a complete document collection.
         
         Args:
             input_dir: Directory containing input.json and PDF files
             output_dir: Directory for output files
+            input_config: Persona/job configuration to use instead of the
+                input file in input_dir (documents are auto-detected if absent)
             
         Returns:
             Processing results dictionary
         """
         start_time = time.time()
+        if self.instrumentation is not None:
+            self.instrumentation.reset()
+        if self.time_budget is not None:
+            self.scheduler = DeadlineScheduler(self.time_budget)
+        if self.memory_monitor is not None:
+            self.memory_monitor.start()
         
         try:
             # Load input configuration
-            input_config = self._load_input_config(input_dir)
+            if input_config is None:
+                input_config = self._load_input_config(input_dir)
+            else:
+                input_config = self._complete_input_config(input_dir, dict(input_config))
             
-            # Extract text from all PDFs
-            logger.info("Extracting text from PDF documents...")
-            documents = self._extract_documents(input_dir, input_config['documents'])
+            output_name = "output.ndjson" if self.output_format == 'ndjson' else "output.json"
+            output_path = Path(output_dir) / output_name
+            
+            # Return the stored output for a previously processed identical request
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self.result_cache.make_key(input_dir, input_config, self.result_config)
+                cached_entry = self.result_cache.get(cache_key)
+                if cached_entry is not None:
+                    return self._restore_cached_output(*cached_entry, output_path, start_time)
             
             # Analyze persona and job requirements
             logger.info("Analyzing persona and job requirements...")
-            persona_profile = self.persona_matcher.analyze_persona(
-                input_config['persona'], 
-                input_config['job_to_be_done']
-            )
+            with self._stage('persona'):
+                persona_profile = self._get_persona_profile(
+                    input_config['persona'], 
+                    input_config['job_to_be_done']
+                )
             
-            # Extract and rank sections
-            logger.info("Extracting and ranking relevant sections...")
-            sections = self._extract_sections(documents, persona_profile)
-            ranked_sections = self.section_ranker.rank_sections(sections, persona_profile)
+            # Screen out clearly irrelevant documents before full processing
+            with self._stage('prefilter'):
+                document_list = self._prefilter_documents(
+                    input_dir, input_config['documents'], persona_profile
+                )
             
-            # Generate sub-section analysis
+            if self.async_pipeline is not None:
+                # Overlap extraction, sectioning and scoring across documents
+                logger.info("Extracting and scoring sections in a pipeline...")
+                import asyncio
+                sections, token_stream = asyncio.run(
+                    self.async_pipeline.run(input_dir, document_list, persona_profile)
+                )
+            else:
+                # Extract text from all PDFs (one at a time, sectioned as it goes, on a memory budget)
+                logger.info("Extracting text from PDF documents...")
+                documents = self._iter_documents(input_dir, document_list)
+                if self.memory_budget_mb is None:
+                    documents = list(documents)
+                
+                # Extract and score sections
+                logger.info("Extracting and ranking relevant sections...")
+                sections, token_stream = self._extract_sections(documents, persona_profile)
+            
+            with self._stage('rank'):
+                ranked_sections = self.section_ranker.rank_sections(
+                    sections, persona_profile, token_stream=token_stream,
+                    uniqueness_mode=self._degraded_uniqueness_mode(len(sections))
+                )
+            
+            # Generate sub-section analysis and stream the output as it is produced
             logger.info("Generating sub-section analysis...")
-            subsections = self._analyze_subsections(ranked_sections, persona_profile)
+            refinement_limit = 10  # Top 10 sections
+            extra_metadata = None
+            if self.scheduler is not None:
+                refinement_limit = self.scheduler.refinement_limit()
+                extra_metadata = {
+                    'time_budget_seconds': self.time_budget,
+                    'degradations': [dict(degradation) for degradation in self.scheduler.degradations]
+                }
+            subsections = self._analyze_subsections(ranked_sections, persona_profile, refinement_limit)
             
-            # Generate output
-            output_data = self.output_generator.generate_output(
-                input_config, ranked_sections, subsections
-            )
+            with self._stage('refine_and_write'):
+                with StreamingOutputWriter(str(output_path), self.output_format) as writer:
+                    _, subsection_count = self.output_generator.write_output(
+                        input_config, ranked_sections, subsections, writer, extra_metadata
+                    )
             
-            # Save output
-            output_path = Path(output_dir) / "output.json"
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            # Degraded outputs depend on timing, so they are not reused
+            if cache_key is not None and not (extra_metadata and extra_metadata['degradations']):
+                self.result_cache.put(cache_key, output_path.read_bytes(), {
+                    'sections_extracted': len(ranked_sections),
+                    'subsections_analyzed': subsection_count
+                })
             
             processing_time = time.time() - start_time
             logger.info(f"Processing completed in {processing_time:.2f} seconds")
             
-            return {
+            result = {
                 'status': 'success',
                 'processing_time': processing_time,
                 'output_path': str(output_path),
                 'sections_extracted': len(ranked_sections),
-                'subsections_analyzed': len(subsections)
+                'subsections_analyzed': subsection_count,
+                'ranking_stats': self.section_ranker.last_stats,
+                'cache_hit': False
             }
+            if self.result_cache is not None:
+                result['cache_stats'] = dict(self.result_cache.stats)
+            if self.scheduler is not None:
+                result['deadline'] = self.scheduler.summary()
+            if self.memory_monitor is not None:
+                result['memory'] = self.memory_monitor.summary()
+                if self.memory_report:
+                    memory_path = Path(output_dir) / "memory.json"
+                    if self.memory_monitor.save(str(memory_path)):
+                        result['memory_report_path'] = str(memory_path)
+            
+            # Write timing and score distributions next to output.json
+            if self.instrumentation is not None:
+                self.instrumentation.record_scores(
+                    'final_score',
+                    [section['final_score'] for section in ranked_sections if 'final_score' in section]
+                )
+                instrumentation_path = Path(output_dir) / "instrumentation.json"
+                if self.instrumentation.save(str(instrumentation_path)):
+                    result['instrumentation_path'] = str(instrumentation_path)
+            
+            return result
             
         except Exception as e:
             logger.error(f"Error processing collection: {str(e)}")
@@ -102,6 +297,69 @@ class DocumentIntelligenceSystem:
                 'error': str(e),
                 'processing_time': time.time() - start_time
             }
+        finally:
+            if self.tracer is not None:
+                self.tracer.save()
+            if self.memory_monitor is not None:
+                self.memory_monitor.stop()
+    
+    def _stage(self, name: str, **args: Any):
+        """Time and measure a stage for the deadline scheduler, tracer and memory monitor."""
+        if self.scheduler is None and self.tracer is None and self.memory_monitor is None:
+            return contextlib.nullcontext()
+        
+        stage = contextlib.ExitStack()
+        if self.tracer is not None:
+            stage.enter_context(self.tracer.span(name, **args))
+        if self.scheduler is not None:
+            stage.enter_context(self.scheduler.stage(name))
+        if self.memory_monitor is not None:
+            stage.enter_context(self.memory_monitor.stage(name))
+        return stage
+    
+    def _degraded_uniqueness_mode(self, section_count: int) -> Optional[str]:
+        """
+        Switch uniqueness to approximate mode when the time budget runs low.
+        
+        Collections up to the ranker's approximate_threshold stay exact: the
+        exact product is as cheap as estimating there.
+        """
+        if section_count <= self.section_ranker.approximate_threshold:
+            return None
+        if self.scheduler is not None and self.scheduler.should_degrade('approximate_uniqueness', 'rank',
+                                                                         sections=section_count):
+            return 'approximate'
+        return None
+    
+    def _restore_cached_output(self, cached_output: bytes, cached_metadata: Dict[str, Any],
+                               output_path: Path, start_time: float) -> Dict[str, Any]:
+        """Write a cached output payload atomically and report the cache hit."""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{output_path.name}.",
+                                         suffix='.cached.tmp', dir=str(output_path.parent))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(cached_output)
+                os.fchmod(f.fileno(), OUTPUT_FILE_MODE)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+        
+        processing_time = time.time() - start_time
+        logger.info(f"Returned cached result in {processing_time:.3f} seconds")
+        
+        return {
+            'status': 'success',
+            'processing_time': processing_time,
+            'output_path': str(output_path),
+            'sections_extracted': cached_metadata.get('sections_extracted'),
+            'subsections_analyzed': cached_metadata.get('subsections_analyzed'),
+            'ranking_stats': {},
+            'cache_hit': True,
+            'cache_stats': dict(self.result_cache.stats)
+        }
     
     def _load_input_config(self, input_dir: str) -> Dict[str, Any]:
         """Load and validate input configuration."""
@@ -132,6 +390,10 @@ class DocumentIntelligenceSystem:
         
         logger.info(f"Loaded input configuration from: {input_path.name}")
         
+        return self._complete_input_config(input_dir, config)
+    
+    def _complete_input_config(self, input_dir: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate an input configuration and auto-detect missing documents."""
         # Handle different input formats
         if 'persona' in config and 'job_to_be_done' in config:
             # Standard format - either direct or nested
@@ -162,58 +424,369 @@ class DocumentIntelligenceSystem:
         
         return config
     
-    def _extract_documents(self, input_dir: str, document_list: List[str]) -> List[Dict[str, Any]]:
-        """Extract text content from PDF documents."""
-        documents = []
+    def _prefilter_documents(self, input_dir: str, document_list: List[str],
+                             persona_profile: Dict[str, Any]) -> List[str]:
+        """Keep only the documents whose cheap signature matches the persona."""
+        if not self.document_prefilter.is_needed(len(document_list)):
+            return document_list
         
+        logger.info("Prefiltering documents by signature...")
+        signatures = {}
         for doc_name in document_list:
             doc_path = Path(input_dir) / doc_name
-            if not doc_path.exists():
-                logger.warning(f"Document not found: {doc_path}")
-                continue
-            
-            try:
-                doc_content = self.pdf_processor.extract_text(str(doc_path))
-                doc_content['name'] = doc_name
-                documents.append(doc_content)
-                logger.info(f"Processed document: {doc_name}")
-            except Exception as e:
-                logger.error(f"Error processing {doc_name}: {str(e)}")
-                continue
-        
-        return documents
+            signatures[doc_name] = self.pdf_processor.extract_signature(str(doc_path))
+        
+        return self.document_prefilter.select(signatures, persona_profile)
+    
+    def _extract_documents(self, input_dir: str, document_list: List[str]) -> List[Dict[str, Any]]:
+        """Extract text content from PDF documents."""
+        return list(self._iter_documents(input_dir, document_list))
+    
+    def _iter_documents(self, input_dir: str, document_list: List[str]) -> Iterator[Dict[str, Any]]:
+        """Extract and yield documents one at a time, skipping unreadable ones."""
+        for doc_name in document_list:
+            doc_content = self._extract_named_document(input_dir, doc_name)
+            if doc_content is not None:
+                yield doc_content
+    
+    def _extract_named_document(self, input_dir: str, doc_name: str) -> Optional[Dict[str, Any]]:
+        """Extract one collection document, or None if it is missing, unreadable or out of time."""
+        doc_path = Path(input_dir) / doc_name
+        if not doc_path.exists():
+            logger.warning(f"Document not found: {doc_path}")
+            return None
+        
+        max_pages = None
+        if self.scheduler is not None:
+            if self.scheduler.should_skip_document():
+                logger.warning(f"Time budget spent, skipping document: {doc_name}")
+                return None
+            max_pages = self.scheduler.page_limit()
+        
+        try:
+            with self._stage('extract', document=doc_name):
+                doc_content = self._extract_document(doc_path, max_pages)
+            doc_content['name'] = doc_name
+            logger.info(f"Processed document: {doc_name}")
+            return doc_content
+        except Exception as e:
+            logger.error(f"Error processing {doc_name}: {str(e)}")
+            return None
     
-    def _extract_sections(self, documents: List[Dict[str, Any]], 
-                         persona_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract relevant sections from documents."""
+    def _extract_document(self, doc_path: Path, max_pages: int = None) -> Dict[str, Any]:
+        """Extract one document, reusing the extraction cache for unchanged files."""
+        if self.extraction_cache is None:
+            return self.pdf_processor.extract_text(str(doc_path), max_pages)
+        
+        stat = doc_path.stat()
+        cache_key = (str(doc_path.resolve()), stat.st_size, stat.st_mtime_ns)
+        doc_content = self.extraction_cache.get(cache_key)
+        if doc_content is None:
+            doc_content = self.pdf_processor.extract_text(str(doc_path), max_pages)
+            if max_pages is not None:
+                return doc_content  # Page samples are never cached as the full document
+            self.extraction_cache.put(cache_key, doc_content)
+        
+        # Cached page data is shared read-only; per-request fields go on a copy
+        return dict(doc_content)
+    
+    def _get_persona_profile(self, persona: Any, job_to_be_done: Any) -> Dict[str, Any]:
+        """Analyze a persona and job, reusing compiled profiles when cached."""
+        if self.profile_cache is None:
+            return self.persona_matcher.analyze_persona(persona, job_to_be_done)
+        
+        cache_key = json.dumps([persona, job_to_be_done], sort_keys=True, ensure_ascii=False)
+        persona_profile = self.profile_cache.get(cache_key)
+        if persona_profile is None:
+            persona_profile = self.persona_matcher.analyze_persona(persona, job_to_be_done)
+            self.profile_cache.put(cache_key, persona_profile)
+        
+        return persona_profile
+    
+    def _extract_sections(self, documents: Iterable[Dict[str, Any]], 
+                         persona_profile: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], TokenStream]:
+        """Extract relevant sections from documents, with their shared token stream."""
         all_sections = []
         
         for doc in documents:
-            sections = self.text_analyzer.extract_sections(doc)
+            all_sections.extend(self._section_document(doc))
+        
+        return self._score_sections(all_sections, persona_profile)
+    
+    def _section_document(self, doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extract the sections of one document."""
+        use_sliding_window = not (self.scheduler is not None and
+                                  self.scheduler.should_degrade('skip_sliding_window', 'section'))
+        with self._stage('section', document=doc['name']):
+            sections = self.text_analyzer.extract_sections(doc, use_sliding_window)
+        for section in sections:
+            section['document_name'] = doc['name']
+        
+        if self.memory_budget_mb is not None:
+            self._release_page_data(doc)
+        return sections
+    
+    def _release_page_data(self, doc: Dict[str, Any]) -> None:
+        """Drop a sectioned document's page text and structure."""
+        # Page dicts may be shared with the extraction cache, so they are replaced, not mutated
+        doc['pages'] = [
+            {key: value for key, value in page.items() if key not in PAGE_DATA_FIELDS}
+            for page in doc.get('pages', [])
+        ]
+        doc.pop('full_text', None)
+    
+    def _score_sections(self, all_sections: List[Dict[str, Any]], persona_profile: Dict[str, Any],
+                        prescored: bool = False) -> Tuple[List[Dict[str, Any]], TokenStream]:
+        """
+        Score the sections of the whole collection for persona relevance.
+        
+        Args:
+            all_sections: Sections of every document, in collection order
+            persona_profile: Persona matching profile
+            prescored: Sections already carry collection-independent relevance scores
             
-            # Score sections based on persona relevance
-            for section in sections:
-                relevance_score = self.persona_matcher.calculate_relevance(
-                    section, persona_profile
+        Returns:
+            Tuple of (scored candidate sections, token stream over all sections)
+        """
+        with self._stage('score'):
+            return self._score_all_sections(all_sections, persona_profile, prescored)
+    
+    def _score_all_sections(self, all_sections: List[Dict[str, Any]], persona_profile: Dict[str, Any],
+                            prescored: bool) -> Tuple[List[Dict[str, Any]], TokenStream]:
+        """Build the token stream and statistics, then score or retrieve candidates."""
+        # Tokenize once; statistics, scoring and similarity all reuse the ids
+        with tracing.span('token_stream', 'step', sections=len(all_sections)):
+            token_stream = TokenStream.build(all_sections)
+        with tracing.span('collection_stats', 'step'):
+            collection_stats = self._get_collection_statistics(all_sections, token_stream)
+        
+        # Keep only the top-K candidates, skipping full scoring of the tail
+        if self.top_k_candidates is not None:
+            with tracing.span('topk_retrieval', 'step', k=self.top_k_candidates):
+                index = InvertedIndex.build(all_sections, token_stream)
+                candidates = self.topk_retriever.retrieve(
+                    all_sections, persona_profile, collection_stats, index, self.top_k_candidates
                 )
+            
+            top_sections = []
+            for section_index, relevance_score in candidates:
+                section = all_sections[section_index]
                 section['relevance_score'] = relevance_score
-                section['document_name'] = doc['name']
-                all_sections.append(section)
+                top_sections.append(section)
+            
+            return top_sections, token_stream
+        
+        if prescored:
+            return all_sections, token_stream
+        
+        # Score sections based on persona relevance
+        relevance_scores = self.persona_matcher.calculate_relevance_batch(
+            all_sections, persona_profile, collection_stats, token_stream
+        )
+        for section, relevance_score in zip(all_sections, relevance_scores):
+            section['relevance_score'] = relevance_score
         
-        return all_sections
+        return all_sections, token_stream
     
-    def _analyze_subsections(self, sections: List[Dict[str, Any]], 
-                           persona_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Analyze and extract refined sub-sections."""
-        subsections = []
+    def _get_collection_statistics(self, sections: List[Dict[str, Any]],
+                                   token_stream: TokenStream = None) -> CollectionStatistics:
+        """Build or load cached collection statistics when the scoring mode needs them."""
+        if self.persona_matcher.scoring_mode != 'bm25':
+            return None
+        
+        cache_path = None
+        if self.stats_cache_dir:
+            fingerprint = CollectionStatistics.fingerprint_sections(sections)
+            cache_path = Path(self.stats_cache_dir) / f"stats_{fingerprint}.json"
+            cached_stats = CollectionStatistics.load(str(cache_path))
+            if cached_stats is not None:
+                logger.info(f"Loaded cached collection statistics: {cache_path.name}")
+                return cached_stats
+        
+        collection_stats = CollectionStatistics.build(sections, token_stream)
+        
+        if cache_path is not None:
+            Path(self.stats_cache_dir).mkdir(parents=True, exist_ok=True)
+            collection_stats.save(str(cache_path))
         
-        for section in sections[:10]:  # Top 10 sections
-            sub_analysis = self.text_analyzer.analyze_subsections(
+        return collection_stats
+    
+    def _analyze_subsections(self, sections: List[Dict[str, Any]], 
+                           persona_profile: Dict[str, Any],
+                           limit: int = 10) -> Iterator[Dict[str, Any]]:
+        """Analyze and yield refined sub-sections, one top section at a time."""
+        for section in sections[:limit]:
+            # Sections left unranked (e.g. by per-document caps) are not refined
+            if 'importance_rank' not in section:
+                break
+            yield from self.text_analyzer.analyze_subsections(
                 section, persona_profile
             )
-            subsections.extend(sub_analysis)
-        
-        return subsections
+
+def add_system_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the DocumentIntelligenceSystem options shared by all entry points."""
+    parser.add_argument(
+        '--scoring-mode',
+        choices=['keyword', 'bm25', 'semantic'],
+        default='keyword',
+        help='Keyword relevance scoring mode'
+    )
+    parser.add_argument(
+        '--top-k',
+        type=int,
+        default=None,
+        help='Retrieve only the top K relevant sections for ranking (requires bm25)'
+    )
+    parser.add_argument(
+        '--max-documents',
+        type=int,
+        default=None,
+        help='Fully process only the top M documents by prefilter score'
+    )
+    parser.add_argument(
+        '--prefilter-threshold',
+        type=float,
+        default=0.0,
+        help='Minimum prefilter score for a document to be processed'
+    )
+    parser.add_argument(
+        '--stage-two-top-n',
+        type=int,
+        default=None,
+        help='Sections kept for quality/completeness scoring in the ranking cascade'
+    )
+    parser.add_argument(
+        '--stage-three-top-m',
+        type=int,
+        default=None,
+        help='Sections kept for uniqueness scoring in the ranking cascade'
+    )
+    parser.add_argument(
+        '--full-ranking',
+        action='store_true',
+        help='Assign importance ranks to every section, not only the top 10'
+    )
+    parser.add_argument(
+        '--mmr-lambda',
+        type=float,
+        default=None,
+        help='Rerank the top sections for diversity with this MMR relevance weight (0.0 to 1.0)'
+    )
+    parser.add_argument(
+        '--max-per-document',
+        type=int,
+        default=None,
+        help='Maximum ranked sections per document (used with --mmr-lambda)'
+    )
+    parser.add_argument(
+        '--output-format',
+        choices=list(OUTPUT_FORMATS),
+        default='pretty',
+        help='Output layout: indented JSON, compact JSON, or NDJSON with one record per section'
+    )
+    parser.add_argument(
+        '--pipelined',
+        action='store_true',
+        help='Overlap document extraction, sectioning and scoring with an asyncio pipeline'
+    )
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        default=None,
+        help='Seconds per collection; past growing shares of the budget processing is '
+             'progressively degraded (degradations are listed in the output metadata)'
+    )
+    parser.add_argument(
+        '--trace',
+        default=None,
+        metavar='FILE',
+        help='Write per-stage, per-document and per-page-batch spans to FILE '
+             'in the Chrome trace-event format (viewable in Perfetto)'
+    )
+    parser.add_argument(
+        '--trace-profile',
+        action='store_true',
+        help='Also write a cProfile profile per stage next to the --trace file'
+    )
+    parser.add_argument(
+        '--memory-budget',
+        type=float,
+        default=None,
+        metavar='MB',
+        help='Resident memory budget in MB: documents are streamed through sectioning, page '
+             'data is released once sectioned, and stages ending above the budget are reported'
+    )
+    parser.add_argument(
+        '--memory-report',
+        action='store_true',
+        help='Record RSS growth and top tracemalloc allocators per stage to memory.json'
+    )
+    parser.add_argument(
+        '--instrument',
+        action='store_true',
+        help='Record per-component timings and score histograms to instrumentation.json'
+    )
+    parser.add_argument(
+        '--result-cache',
+        default=None,
+        help='Directory for caching finished outputs of identical requests'
+    )
+    parser.add_argument(
+        '--result-cache-ttl',
+        type=float,
+        default=None,
+        help='Seconds before a cached result expires'
+    )
+    parser.add_argument(
+        '--result-cache-size',
+        type=int,
+        default=None,
+        help='Maximum number of cached results (least recently used are evicted)'
+    )
+    parser.add_argument(
+        '--stats-cache',
+        default=None,
+        help='Directory for caching collection statistics between runs'
+    )
+
+def get_system_options(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Dict[str, Any]:
+    """Validate parsed system options and map them to constructor arguments."""
+    if args.top_k is not None and args.scoring_mode != 'bm25':
+        parser.error("--top-k requires --scoring-mode bm25")
+    if args.mmr_lambda is not None and not 0.0 <= args.mmr_lambda <= 1.0:
+        parser.error("--mmr-lambda must be between 0.0 and 1.0")
+    if args.max_per_document is not None and args.mmr_lambda is None:
+        parser.error("--max-per-document requires --mmr-lambda")
+    if args.time_budget is not None and args.time_budget <= 0:
+        parser.error("--time-budget must be positive")
+    if args.memory_budget is not None and args.memory_budget <= 0:
+        parser.error("--memory-budget must be positive")
+    if args.trace_profile and not args.trace:
+        parser.error("--trace-profile requires --trace")
+    
+    return dict(
+        scoring_mode=args.scoring_mode,
+        stats_cache_dir=args.stats_cache,
+        top_k_candidates=args.top_k,
+        max_documents=args.max_documents,
+        prefilter_threshold=args.prefilter_threshold,
+        stage_two_top_n=args.stage_two_top_n,
+        stage_three_top_m=args.stage_three_top_m,
+        full_ranking=args.full_ranking,
+        mmr_lambda=args.mmr_lambda,
+        max_per_document=args.max_per_document,
+        instrument=args.instrument,
+        output_format=args.output_format,
+        result_cache_dir=args.result_cache,
+        result_cache_ttl=args.result_cache_ttl,
+        result_cache_max_entries=args.result_cache_size,
+        pipelined=args.pipelined,
+        time_budget=args.time_budget,
+        trace_path=args.trace,
+        trace_profile=args.trace_profile,
+        memory_budget_mb=args.memory_budget,
+        memory_report=args.memory_report
+    )
 
 def main():
     """Main entry point for the application."""
@@ -230,27 +803,69 @@ def main():
         default='/app/output',
         help='Output directory for results'
     )
+    parser.add_argument(
+        '--batch',
+        nargs='+',
+        default=None,
+        metavar='DIR_OR_GLOB',
+        help='Process several collection directories (paths or glob patterns) into '
+             'per-collection subdirectories of --output'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes for --batch (each keeps one warmed system)'
+    )
     parser.add_argument(
         '--debug', 
         action='store_true',
         help='Enable debug logging'
     )
+    add_system_arguments(parser)
     
     args = parser.parse_args()
     
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.trace and args.workers > 1:
+        parser.error("--trace records a single process; use it with --workers 1")
+    
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
     
     # Ensure output directory exists
     Path(args.output).mkdir(parents=True, exist_ok=True)
     
+    system_options = get_system_options(parser, args)
+    
+    # Batch mode: many collections with warmed systems
+    if args.batch:
+        collections = BatchRunner.find_collections(args.batch)
+        if not collections:
+            parser.error("--batch matched no collection directories")
+        runner = BatchRunner(functools.partial(DocumentIntelligenceSystem, **system_options),
+                             workers=args.workers)
+        summary = runner.run(collections, args.output)
+        if summary['failed']:
+            logger.error(f"{summary['failed']} collection(s) failed!")
+            sys.exit(1)
+        return
+    
     # Initialize and run the system
-    system = DocumentIntelligenceSystem()
+    system = DocumentIntelligenceSystem(**system_options)
     result = system.process_collection(args.input, args.output)
     
     if result['status'] == 'success':
         logger.info("Document intelligence processing completed successfully!")
         logger.info(f"Output saved to: {result['output_path']}")
+        if 'cache_stats' in result:
+            stats = result['cache_stats']
+            logger.info(f"Result cache: {'hit' if result['cache_hit'] else 'miss'} "
+                        f"({stats['hits']} hits, {stats['misses']} misses)")
+        for stage in result['ranking_stats'].get('stages', []):
+            logger.info(f"Ranking stage {stage['stage']}: {stage['input']} sections in, "
+                        f"{stage['pruned']} pruned")
     else:
         logger.error("Processing failed!")
         sys.exit(1)
@@ -0,0 +1,298 @@
+# Document Intelligence Service
+# Long-running local HTTP / Unix socket server keeping the system warm between requests
+
+import os
+import sys
+import json
+import queue
+import stat
+import signal
+import socket
+import tempfile
+import threading
+import logging
+import argparse
+import socketserver
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, Tuple
+
+from main import DocumentIntelligenceSystem, add_system_arguments, get_system_options
+from src.lru_cache import LRUCache
+from src.token_normalizer import get_term_table
+
+logger = logging.getLogger(__name__)
+
+# Request fields forwarded to the system as the input configuration
+CONFIG_FIELDS = ('persona', 'job_to_be_done', 'documents', 'challenge_info')
+
+class DocumentIntelligenceService:
+    """
+    Serves collection processing requests from a pool of warm systems.
+
+    Systems share an extraction cache and a persona profile cache. At most
+    `concurrency` requests are processed at once and at most `max_pending`
+    are admitted (the rest are rejected); identical requests arriving while
+    one is in flight wait for and share its response.
+    """
+
+    def __init__(self, system_options: Dict[str, Any], concurrency: int = 2,
+                 max_pending: int = 32, extraction_cache_size: int = 64,
+                 profile_cache_size: int = 256):
+        self.extraction_cache = LRUCache(extraction_cache_size)
+        self.profile_cache = LRUCache(profile_cache_size)
+        self.output_format = system_options.get('output_format', 'pretty')
+        self.stats = {'requests': 0, 'coalesced': 0, 'rejected': 0, 'errors': 0}
+
+        self._systems = queue.Queue()
+        for _ in range(concurrency):
+            system = DocumentIntelligenceSystem(
+                **system_options,
+                extraction_cache=self.extraction_cache,
+                profile_cache=self.profile_cache
+            )
+            system.warm_up()  # Libraries are imported lazily; load them before the first request
+            self._systems.put(system)
+
+        self._admission = threading.BoundedSemaphore(max_pending)
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, request: Dict[str, Any]) -> Tuple[int, bytes]:
+        """
+        Process a request, sharing the result with identical in-flight requests.
+
+        Args:
+            request: JSON request with 'input_dir' and optionally persona,
+                job_to_be_done, documents and challenge_info
+
+        Returns:
+            Tuple of (HTTP status, response body)
+        """
+        if not isinstance(request.get('input_dir'), str):
+            return 400, self._error("Request must include 'input_dir'")
+
+        request_key = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        with self._lock:
+            self.stats['requests'] += 1
+            future = self._in_flight.get(request_key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[request_key] = future
+            else:
+                self.stats['coalesced'] += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            if not self._admission.acquire(blocking=False):
+                with self._lock:
+                    self.stats['rejected'] += 1
+                future.set_result((503, self._error("Too many pending requests")))
+            else:
+                try:
+                    future.set_result(self._process(request))
+                finally:
+                    self._admission.release()
+        except Exception as e:
+            logger.error(f"Request failed: {str(e)}")
+            future.set_result((500, self._error(str(e))))
+        finally:
+            with self._lock:
+                del self._in_flight[request_key]
+
+        status, body = future.result()
+        if status >= 500:
+            with self._lock:
+                self.stats['errors'] += 1
+        return status, body
+
+    def health(self) -> Dict[str, Any]:
+        """Get service status and counters."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['in_flight'] = len(self._in_flight)
+        term_table = get_term_table()
+        return {
+            'status': 'ok',
+            'requests': stats,
+            'extraction_cache': dict(self.extraction_cache.stats, entries=len(self.extraction_cache)),
+            'profile_cache': dict(self.profile_cache.stats, entries=len(self.profile_cache)),
+            'term_table': dict(term_table.stats, entries=len(term_table))
+        }
+
+    def _process(self, request: Dict[str, Any]) -> Tuple[int, bytes]:
+        """Run one request on a warm system and return its output file."""
+        input_config = None
+        if 'persona' in request or 'job_to_be_done' in request:
+            input_config = {field: request[field] for field in CONFIG_FIELDS if field in request}
+
+        system = self._systems.get()  # Blocks while all systems are busy
+        try:
+            with tempfile.TemporaryDirectory(prefix='docintel_') as output_dir:
+                result = system.process_collection(request['input_dir'], output_dir, input_config)
+                if result['status'] != 'success':
+                    return 500, self._error(result.get('error', 'Processing failed'))
+                return 200, Path(result['output_path']).read_bytes()
+        finally:
+            self._systems.put(system)
+
+    def _error(self, message: str) -> bytes:
+        return json.dumps({'status': 'error', 'error': message}).encode('utf-8')
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler: GET /health and POST /process."""
+
+    service: DocumentIntelligenceService = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send(404, b'{"status": "error", "error": "Not found"}')
+            return
+        self._send(200, json.dumps(self.service.health()).encode('utf-8'))
+
+    def do_POST(self):
+        if self.path != '/process':
+            self._send(404, b'{"status": "error", "error": "Not found"}')
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError("Request body must be a JSON object")
+        except ValueError as e:
+            self._send(400, json.dumps({'status': 'error', 'error': f"Invalid request: {str(e)}"}).encode('utf-8'))
+            return
+
+        status, body = self.service.handle(request)
+        content_type = 'application/x-ndjson' if (
+            status == 200 and self.service.output_format == 'ndjson') else 'application/json'
+        self._send(status, body, content_type)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+    def _send(self, status: int, body: bytes, content_type: str = 'application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+def _remove_stale_socket(path: str) -> None:
+    """
+    Remove a Unix socket left behind by a previous run.
+
+    Raises:
+        ValueError: If the path is not a socket, or a server is still listening on it
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{path} exists and is not a socket")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.remove(path)  # Nothing is listening: stale socket from a previous run
+        return
+    finally:
+        probe.close()
+    raise ValueError(f"Another server is already listening on {path}")
+
+def create_server(service: DocumentIntelligenceService, host: str = '127.0.0.1',
+                  port: int = 8080, unix_socket: str = None) -> socketserver.BaseServer:
+    """
+    Create an HTTP server for the service on localhost or a Unix socket.
+
+    Args:
+        service: Service answering requests
+        host: TCP host (ignored with unix_socket)
+        port: TCP port (ignored with unix_socket)
+        unix_socket: Unix socket path to listen on instead of TCP
+
+    Returns:
+        Server ready for serve_forever()
+
+    Raises:
+        ValueError: If the Unix socket path is taken by another file or a live server
+    """
+    handler = type('BoundServiceRequestHandler', (ServiceRequestHandler,), {'service': service})
+
+    if unix_socket:
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ValueError("Unix sockets are not supported on this platform")
+        _remove_stale_socket(unix_socket)
+        return ThreadingUnixHTTPServer(unix_socket, handler)
+
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    """Entry point for the long-running service."""
+    parser = argparse.ArgumentParser(
+        description='Document Intelligence System - local service mode'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Host to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='TCP port to listen on')
+    parser.add_argument('--unix-socket', default=None, help='Listen on a Unix socket path instead of TCP')
+    parser.add_argument('--concurrency', type=int, default=2,
+                        help='Requests processed at once (one warm system each)')
+    parser.add_argument('--max-pending', type=int, default=32,
+                        help='Requests admitted before new ones are rejected with 503')
+    parser.add_argument('--extraction-cache-size', type=int, default=64,
+                        help='Extracted documents kept in memory')
+    parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    add_system_arguments(parser)
+
+    args = parser.parse_args()
+    if args.concurrency < 1 or args.max_pending < 1:
+        parser.error("--concurrency and --max-pending must be at least 1")
+
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    service = DocumentIntelligenceService(
+        get_system_options(parser, args),
+        concurrency=args.concurrency,
+        max_pending=args.max_pending,
+        extraction_cache_size=args.extraction_cache_size
+    )
+    try:
+        server = create_server(service, args.host, args.port, args.unix_socket)
+    except ValueError as e:
+        parser.error(str(e))
+    logger.info(f"Serving on {args.unix_socket or f'http://{args.host}:{args.port}'}")
+
+    # Exit through the cleanup below on SIGTERM as well as Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.remove(args.unix_socket)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Async Pipeline Module
+# Overlapped extract -> section -> score execution with bounded queues
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output
+_DONE = object()
+
+class AsyncPipeline:
+    """
+    Runs document extraction, sectioning and relevance scoring as concurrent
+    asyncio stages connected by bounded queues.
+
+    CPU-heavy steps run in a thread pool so that one document can be sectioned
+    while the next is read and parsed. Keyword relevance only depends on the
+    section and the persona, so it is scored per document as sections arrive;
+    BM25, semantic scoring and top-K retrieval need collection-wide statistics
+    and are deferred to the global barrier, together with ranking.
+    """
+
+    def __init__(self, system: Any, queue_size: int = 4, max_workers: int = 3):
+        self.system = system
+        self.queue_size = queue_size
+        self.max_workers = max_workers
+
+    def scores_per_document(self) -> bool:
+        """Check whether relevance can be scored before the collection is complete."""
+        return (self.system.persona_matcher.scoring_mode == 'keyword' and
+                self.system.top_k_candidates is None)
+
+    async def run(self, input_dir: str, document_list: List[str],
+                  persona_profile: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Any]:
+        """
+        Extract, section and score a collection with overlapping stages.
+
+        Args:
+            input_dir: Collection directory
+            document_list: Document file names in collection order
+            persona_profile: Persona matching profile
+
+        Returns:
+            Tuple of (scored candidate sections, token stream), identical to
+            the sequential extraction and scoring path
+        """
+        loop = asyncio.get_running_loop()
+        extracted = asyncio.Queue(self.queue_size)
+        sectioned = asyncio.Queue(self.queue_size)
+        score_early = self.scores_per_document()
+        system = self.system
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline') as executor:
+
+            async def extract_stage():
+                try:
+                    for position, doc_name in enumerate(document_list):
+                        doc = await loop.run_in_executor(
+                            executor, system._extract_named_document, input_dir, doc_name
+                        )
+                        if doc is not None:
+                            await extracted.put((position, doc))
+                finally:
+                    await extracted.put(_DONE)
+
+            async def section_stage():
+                try:
+                    while (item := await extracted.get()) is not _DONE:
+                        position, doc = item
+                        sections = await loop.run_in_executor(executor, system._section_document, doc)
+                        await sectioned.put((position, sections))
+                finally:
+                    await sectioned.put(_DONE)
+
+            async def score_stage():
+                while (item := await sectioned.get()) is not _DONE:
+                    position, sections = item
+                    if score_early:
+                        scores = await loop.run_in_executor(
+                            executor, system.persona_matcher.calculate_relevance_batch,
+                            sections, persona_profile
+                        )
+                        for section, relevance_score in zip(sections, scores):
+                            section['relevance_score'] = relevance_score
+                    results[position] = sections
+
+            await asyncio.gather(extract_stage(), section_stage(), score_stage())
+
+        # Global barrier: collection order is restored before collection-wide steps
+        all_sections = [section for position in sorted(results) for section in results[position]]
+        logger.info(f"Pipeline produced {len(all_sections)} sections from {len(results)} documents")
+
+        return system._score_sections(all_sections, persona_profile, prescored=score_early)
@@ -0,0 +1,187 @@
+# Batch Runner Module
+# Processes many collections with warmed systems, optionally across worker processes
+
+from __future__ import annotations
+
+import glob
+import json
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Callable, Iterable, Tuple
+import logging
+
+from .lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+# System built once per worker process by the pool initializer
+_worker_system = None
+
+def _init_worker(system_factory: Callable[[], Any]) -> None:
+    """Build the warmed system of a worker process."""
+    global _worker_system
+    _worker_system = _build_warm_system(system_factory)
+
+def _build_warm_system(system_factory: Callable[[], Any]) -> Any:
+    """Build a system and load its lazily imported libraries before the first collection."""
+    system = system_factory()
+    system.warm_up()
+    return system
+
+def _process_in_worker(input_dir: str, output_dir: str) -> Dict[str, Any]:
+    """Process one collection with the worker's warmed system."""
+    return _process_collection(_worker_system, input_dir, output_dir)
+
+def _process_collection(system: Any, input_dir: str, output_dir: str) -> Dict[str, Any]:
+    """Process one collection and record its wall time."""
+    start_time = time.time()
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    result = system.process_collection(input_dir, output_dir)
+    result['wall_time'] = time.time() - start_time
+    return result
+
+class BatchRunner:
+    """
+    Runs a DocumentIntelligenceSystem over many collection directories.
+
+    The system is constructed once (once per worker when a process pool is
+    used), so interpreter start-up, NLTK loading and component construction
+    are paid once per process rather than once per collection.
+    """
+
+    def __init__(self, system_factory: Callable[[], Any], workers: int = 1):
+        self.system_factory = system_factory
+        self.workers = max(1, workers)
+
+    @staticmethod
+    def find_collections(patterns: Iterable[str]) -> List[str]:
+        """
+        Expand collection directory paths and glob patterns.
+
+        Args:
+            patterns: Directory paths or glob patterns
+
+        Returns:
+            Matching directories, deduplicated, in pattern order (sorted within a glob)
+        """
+        collections = []
+        seen = set()
+        for pattern in patterns:
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            for match in matches:
+                resolved = str(Path(match).resolve())
+                if Path(match).is_dir() and resolved not in seen:
+                    seen.add(resolved)
+                    collections.append(match)
+        return collections
+
+    def run(self, collections: List[str], output_root: str) -> Dict[str, Any]:
+        """
+        Process every collection and write a timing summary.
+
+        Args:
+            collections: Collection directories
+            output_root: Directory receiving one output subdirectory per
+                collection and batch_summary.json
+
+        Returns:
+            Batch summary dictionary
+        """
+        start_time = time.time()
+        jobs = self._plan_outputs(collections, output_root)
+        logger.info(f"Processing {len(jobs)} collections with {self.workers} worker(s)")
+
+        if self.workers == 1:
+            system = _build_warm_system(self.system_factory)
+            startup_time = time.time() - start_time
+            results = []
+            for input_dir, output_dir in jobs:
+                results.append(self._run_safely(lambda: _process_collection(system, input_dir, output_dir)))
+        else:
+            startup_time = None  # Paid inside each worker, overlapping with processing
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.system_factory,)) as executor:
+                futures = [executor.submit(_process_in_worker, input_dir, output_dir)
+                           for input_dir, output_dir in jobs]
+                results = [self._run_safely(future.result) for future in futures]
+
+        summary = self._summarize(jobs, results, startup_time, time.time() - start_time)
+
+        Path(output_root).mkdir(parents=True, exist_ok=True)
+        summary_path = Path(output_root) / "batch_summary.json"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        logger.info(f"Batch summary saved to: {summary_path}")
+
+        return summary
+
+    def _plan_outputs(self, collections: List[str], output_root: str) -> List[Tuple[str, str]]:
+        """Assign each collection a unique output directory named after it."""
+        jobs = []
+        used_names = set()
+        for input_dir in collections:
+            base_name = Path(input_dir).resolve().name or 'collection'
+            name = base_name
+            suffix = 2
+            while name in used_names:
+                name = f"{base_name}_{suffix}"
+                suffix += 1
+            used_names.add(name)
+            jobs.append((input_dir, str(Path(output_root) / name)))
+        return jobs
+
+    def _run_safely(self, task: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Run a collection task, turning crashes into error results."""
+        try:
+            return task()
+        except Exception as e:
+            logger.error(f"Collection failed: {str(e)}")
+            return {'status': 'error', 'error': str(e)}
+
+    def _summarize(self, jobs: List[Tuple[str, str]], results: List[Dict[str, Any]],
+                   startup_time: float, total_time: float) -> Dict[str, Any]:
+        """Build per-collection records and aggregate timings."""
+        records = []
+        for (input_dir, output_dir), result in zip(jobs, results):
+            record = {
+                'input_dir': input_dir,
+                'output_dir': output_dir,
+                'status': result.get('status'),
+                'processing_time': result.get('processing_time'),
+                'wall_time': result.get('wall_time'),
+                'sections_extracted': result.get('sections_extracted'),
+                'cache_hit': result.get('cache_hit')
+            }
+            if 'error' in result:
+                record['error'] = result['error']
+            records.append(record)
+
+        times = np.array([record['processing_time'] for record in records
+                          if record['status'] == 'success' and record['processing_time'] is not None])
+        timing = {
+            'total_seconds': total_time,
+            'startup_seconds': startup_time,
+            'workers': self.workers
+        }
+        if len(times):
+            timing.update({
+                'mean_seconds': float(times.mean()),
+                'p50_seconds': float(np.percentile(times, 50)),
+                'p95_seconds': float(np.percentile(times, 95)),
+                'max_seconds': float(times.max()),
+                'collections_per_second': len(records) / total_time if total_time > 0 else None
+            })
+
+        succeeded = sum(1 for record in records if record['status'] == 'success')
+        logger.info(f"Batch completed: {succeeded}/{len(records)} collections in {total_time:.2f} seconds")
+
+        return {
+            'collections': len(records),
+            'succeeded': succeeded,
+            'failed': len(records) - succeeded,
+            'timing': timing,
+            'results': records
+        }
@@ -0,0 +1,222 @@
+# Collection Statistics Module
+# Per-collection term statistics used by BM25 relevance scoring
+
+from __future__ import annotations
+
+import json
+import math
+import hashlib
+import logging
+from pathlib import Path
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+
+from .token_normalizer import get_term_table
+from .token_stream import TokenStream
+from .lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever tokenization changes so cached statistics are not reused
+STATS_VERSION = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized terms used for collection statistics."""
+    return get_term_table().normalize_tokens(text.split())
+
+
+class CollectionStatistics:
+    """
+    Document frequencies and section length statistics for a section collection.
+    Computed once per collection and cacheable as JSON next to extraction results.
+    """
+
+    def __init__(self, document_frequencies: Dict[str, int], section_count: int,
+                 avg_section_length: float, fingerprint: str = ''):
+        self.document_frequencies = document_frequencies
+        self.section_count = section_count
+        self.avg_section_length = avg_section_length
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, sections: List[Dict[str, Any]],
+              token_stream: TokenStream = None) -> 'CollectionStatistics':
+        """
+        Compute statistics from extracted sections.
+
+        Args:
+            sections: Extracted sections with content
+            token_stream: Token stream over the same sections (optional)
+
+        Returns:
+            Collection statistics for the given sections
+        """
+        if token_stream is not None:
+            document_frequencies = token_stream.document_frequencies()
+            total_length = int(token_stream.term_lengths().sum())
+        else:
+            document_frequencies = {}
+            total_length = 0
+
+            for section in sections:
+                terms = tokenize(section.get('content', ''))
+                total_length += len(terms)
+                for term in set(terms):
+                    document_frequencies[term] = document_frequencies.get(term, 0) + 1
+
+        section_count = len(sections)
+        avg_section_length = total_length / section_count if section_count else 0.0
+
+        logger.debug(f"Collection statistics: {section_count} sections, "
+                     f"{len(document_frequencies)} terms, avg length {avg_section_length:.1f}")
+
+        return cls(document_frequencies, section_count, avg_section_length,
+                   cls.fingerprint_sections(sections))
+
+    @staticmethod
+    def fingerprint_sections(sections: List[Dict[str, Any]]) -> str:
+        """Create a stable content fingerprint for a list of sections."""
+        digest = hashlib.sha1(f"v{STATS_VERSION}".encode('utf-8'))
+        for section in sections:
+            digest.update(section.get('document_name', '').encode('utf-8'))
+            digest.update(b'\0')
+            digest.update(section.get('content', '').encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def idf(self, term: str) -> float:
+        """Calculate BM25 inverse document frequency for a term."""
+        df = self.document_frequencies.get(term, 0)
+        return math.log(1.0 + (self.section_count - df + 0.5) / (df + 0.5))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize statistics to a JSON-compatible dictionary."""
+        return {
+            'fingerprint': self.fingerprint,
+            'section_count': self.section_count,
+            'avg_section_length': self.avg_section_length,
+            'document_frequencies': self.document_frequencies
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CollectionStatistics':
+        """Restore statistics from a serialized dictionary."""
+        return cls(
+            data['document_frequencies'],
+            data['section_count'],
+            data['avg_section_length'],
+            data.get('fingerprint', '')
+        )
+
+    def save(self, path: str) -> bool:
+        """
+        Save statistics to a JSON file.
+
+        Args:
+            path: Destination file path
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not save collection statistics to {path}: {str(e)}")
+            return False
+
+    @classmethod
+    def load(cls, path: str) -> Optional['CollectionStatistics']:
+        """
+        Load statistics from a JSON file.
+
+        Args:
+            path: Source file path
+
+        Returns:
+            Collection statistics, or None if the file is missing or invalid
+        """
+        if not Path(path).exists():
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        except Exception as e:
+            logger.warning(f"Could not load collection statistics from {path}: {str(e)}")
+            return None
+
+
+class InvertedIndex:
+    """
+    Term postings over a section collection.
+    Each posting list holds ascending section indices and matching term frequencies.
+    """
+
+    def __init__(self, postings: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                 section_lengths: np.ndarray):
+        self.postings = postings
+        self.section_lengths = section_lengths
+
+    @classmethod
+    def build(cls, sections: List[Dict[str, Any]],
+              token_stream: TokenStream = None) -> 'InvertedIndex':
+        """
+        Build postings for every term in the given sections.
+
+        Args:
+            sections: Extracted sections with content
+            token_stream: Token stream over the same sections (optional)
+
+        Returns:
+            Inverted index aligned with the section list order
+        """
+        if token_stream is not None:
+            return cls._build_from_stream(token_stream)
+
+        raw_postings = {}
+        section_lengths = np.zeros(len(sections), dtype=np.int32)
+
+        for index, section in enumerate(sections):
+            terms = tokenize(section.get('content', ''))
+            section_lengths[index] = len(terms)
+            for term, count in Counter(terms).items():
+                raw_postings.setdefault(term, []).append((index, count))
+
+        postings = {}
+        for term, entries in raw_postings.items():
+            ids, counts = zip(*entries)
+            postings[term] = (np.array(ids, dtype=np.int32), np.array(counts, dtype=np.int32))
+
+        return cls(postings, section_lengths)
+
+    @classmethod
+    def _build_from_stream(cls, token_stream: TokenStream) -> 'InvertedIndex':
+        """Build postings by grouping (section, term) counts of a token stream."""
+        section_ids, term_ids, frequencies = token_stream.term_frequencies()
+
+        # Stable sort by term keeps section indices ascending within each posting list
+        order = np.argsort(term_ids, kind='stable')
+        section_ids, term_ids, frequencies = section_ids[order], term_ids[order], frequencies[order]
+        bounds = np.flatnonzero(np.diff(term_ids)) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [len(term_ids)]))
+
+        postings = {}
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if start < end:
+                postings[token_stream.terms[term_ids[start]]] = (section_ids[start:end],
+                                                                 frequencies[start:end])
+
+        return cls(postings, token_stream.term_lengths())
+
+    def get_postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (section indices, term frequencies) for a term."""
+        if term not in self.postings:
+            empty = np.zeros(0, dtype=np.int32)
+            return empty, empty
+        return self.postings[term]
@@ -0,0 +1,144 @@
+# Deadline Scheduler Module
+# Tracks a per-collection time budget and decides when to degrade processing
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterator
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fraction of the budget elapsed before each degradation switches on, cheapest loss first
+DEGRADATION_THRESHOLDS = {
+    'skip_sliding_window': 0.3,
+    'sample_pages': 0.5,
+    'approximate_uniqueness': 0.7,
+    'shrink_refinement': 0.8
+}
+
+class DeadlineScheduler:
+    """
+    Time budget for processing one collection.
+
+    Stages are timed with stage(). Degradations are progressive and sticky:
+    once the elapsed share of the budget passes a degradation's threshold it
+    stays active for the rest of the run, and every activation is recorded
+    (with the stage and elapsed time) so it can be reported in the output
+    metadata. Past the full budget no further documents are extracted and
+    sub-section refinement is skipped, so a valid output is still written.
+    """
+
+    def __init__(self, time_budget: float, thresholds: Dict[str, float] = None,
+                 sampled_pages: int = 5, refinement_top_k: int = 10,
+                 degraded_refinement_top_k: int = 3):
+        if time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+
+        self.time_budget = time_budget
+        self.thresholds = dict(DEGRADATION_THRESHOLDS, **(thresholds or {}))
+        self.sampled_pages = sampled_pages
+        self.refinement_top_k = refinement_top_k
+        self.degraded_refinement_top_k = degraded_refinement_top_k
+
+        # Pipelined runs consult the scheduler from worker threads
+        self._lock = threading.Lock()
+        self.start()
+
+    def start(self) -> None:
+        """Restart the clock and clear stage timings and degradations."""
+        self.start_time = time.perf_counter()
+        self.stage_times: Dict[str, float] = {}
+        self.degradations: List[Dict[str, Any]] = []
+        self._active = set()
+
+    def elapsed(self) -> float:
+        """Seconds since start()."""
+        return time.perf_counter() - self.start_time
+
+    def remaining(self) -> float:
+        """Seconds left in the budget (negative once it is exceeded)."""
+        return self.time_budget - self.elapsed()
+
+    def is_exhausted(self) -> bool:
+        """Check whether the whole budget has been used."""
+        return self.remaining() <= 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a processing stage, accumulating repeated stages by name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.stage_times[name] = self.stage_times.get(name, 0.0) + duration
+
+    def should_degrade(self, name: str, stage: str, **details: Any) -> bool:
+        """
+        Check whether a degradation applies now, recording its first activation.
+
+        Args:
+            name: Degradation name from the thresholds
+            stage: Stage asking, reported with the activation
+            **details: Extra values reported with the activation
+
+        Returns:
+            True if the degradation is active
+        """
+        if name in self._active:
+            return True
+
+        elapsed = self.elapsed()
+        if elapsed < self.thresholds[name] * self.time_budget:
+            return False
+
+        with self._lock:
+            if name not in self._active:
+                self._record(name, stage, elapsed, details)
+        return True
+
+    def should_skip_document(self) -> bool:
+        """Check whether remaining documents must be skipped because the budget is spent."""
+        if not self.is_exhausted():
+            return False
+        self.record_once('skip_documents', 'extract')
+        return True
+
+    def page_limit(self) -> int:
+        """Maximum pages to parse per document (None for all pages)."""
+        if self.should_degrade('sample_pages', 'extract', max_pages=self.sampled_pages):
+            return self.sampled_pages
+        return None
+
+    def refinement_limit(self) -> int:
+        """Number of top sections to refine into sub-sections."""
+        if self.is_exhausted():
+            self.record_once('skip_refinement', 'refine')
+            return 0
+        if self.should_degrade('shrink_refinement', 'refine', top_k=self.degraded_refinement_top_k):
+            return self.degraded_refinement_top_k
+        return self.refinement_top_k
+
+    def record_once(self, name: str, stage: str, **details: Any) -> None:
+        """Record a degradation the caller applies unconditionally."""
+        with self._lock:
+            if name not in self._active:
+                self._record(name, stage, self.elapsed(), details)
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the budget, elapsed time, stage timings and degradations."""
+        return {
+            'time_budget_seconds': self.time_budget,
+            'elapsed_seconds': round(self.elapsed(), 3),
+            'stage_seconds': {name: round(seconds, 3) for name, seconds in self.stage_times.items()},
+            'degradations': list(self.degradations)
+        }
+
+    def _record(self, name: str, stage: str, elapsed: float, details: Dict[str, Any]) -> None:
+        self._active.add(name)
+        self.degradations.append(dict(
+            {'name': name, 'stage': stage, 'elapsed_seconds': round(elapsed, 3)}, **details
+        ))
+        logger.warning(f"Time budget: {name} after {elapsed:.2f}s of {self.time_budget:.2f}s")
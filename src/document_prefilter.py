@@ -0,0 +1,89 @@
+# Document Prefilter Module
+# Cheap document-level relevance screening for large collections
+
+import math
+from collections import Counter
+from typing import Dict, List, Any
+import logging
+
+from .token_normalizer import get_term_table
+
+logger = logging.getLogger(__name__)
+
+class DocumentPrefilter:
+    """
+    Scores whole documents from a cheap signature (title, table of contents and
+    leading text) so only the most promising ones get full processing.
+    """
+
+    def __init__(self, max_documents: int = None, min_score: float = 0.0,
+                 heading_weight: float = 2.0):
+        self.max_documents = max_documents
+        self.min_score = min_score
+        self.heading_weight = heading_weight
+
+    def is_needed(self, document_count: int) -> bool:
+        """Check whether prefiltering would drop anything for a collection size."""
+        if self.max_documents is not None and document_count > self.max_documents:
+            return True
+        return self.min_score > 0
+
+    def score_signature(self, signature: Dict[str, Any],
+                        persona_profile: Dict[str, Any]) -> float:
+        """
+        Score a document signature against a persona profile.
+
+        Args:
+            signature: Document signature from PDFProcessor.extract_signature()
+            persona_profile: Persona matching profile
+
+        Returns:
+            Document relevance score (0.0 to 1.0)
+        """
+        term_weights = persona_profile['term_weights']
+        total_weight = sum(term_weights.values())
+        if total_weight == 0:
+            return 0.0
+
+        term_table = get_term_table()
+        heading_text = ' '.join([signature.get('title', '')] + list(signature.get('toc', [])))
+        heading_terms = set(term_table.normalize_tokens(heading_text.split()))
+        text_counts = Counter(term_table.normalize_tokens(signature.get('text', '').split()))
+
+        score = 0.0
+        for term, weight in term_weights.items():
+            # Sublinear term frequency sketch of the leading pages
+            term_score = min(1.0 + math.log(text_counts[term]), 3.0) / 3.0 if text_counts[term] else 0.0
+            if term in heading_terms:
+                term_score += self.heading_weight
+            score += weight * term_score
+
+        return min(score / (total_weight * (1.0 + self.heading_weight)), 1.0)
+
+    def select(self, signatures: Dict[str, Dict[str, Any]],
+               persona_profile: Dict[str, Any]) -> List[str]:
+        """
+        Select documents worth full processing.
+
+        Args:
+            signatures: Document name -> signature, in collection order
+            persona_profile: Persona matching profile
+
+        Returns:
+            Selected document names, in their original collection order
+        """
+        scores = {name: self.score_signature(signature, persona_profile)
+                  for name, signature in signatures.items()}
+
+        eligible = [name for name in signatures if scores[name] >= self.min_score]
+        eligible.sort(key=lambda name: scores[name], reverse=True)
+
+        if self.max_documents is not None:
+            eligible = eligible[:self.max_documents]
+
+        selected = set(eligible)
+        logger.info(f"Prefilter kept {len(selected)} of {len(signatures)} documents")
+        for name in signatures:
+            logger.debug(f"Prefilter score {scores[name]:.3f} for {name}")
+
+        return [name for name in signatures if name in selected]
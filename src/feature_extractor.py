@@ -0,0 +1,138 @@
+# Feature Extraction Module
+# Single-pass detection of completeness features in section content
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Tuple
+import logging
+
+from .lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+# Completeness features in bit order
+COMPLETENESS_FEATURES = (
+    'percentage',     # 15%, 2.5%
+    'money',          # $100
+    'year',           # 2024
+    'time_period',    # 3 days, 2 weeks, 6 months
+    'specificity',    # specifically, precisely, ...
+    'large_number',   # 5 million, 2 billion
+    'measurement',    # 200 g, 1.5 kg, 500 ml
+    'temperature',    # 180 degrees
+    'duration',       # 30 minutes, 2 hours, 3 days
+    'actionable',     # how to, steps, should, ...
+    'example',        # for example, such as, ...
+)
+
+FEATURE_BITS = {name: 1 << index for index, name in enumerate(COMPLETENESS_FEATURES)}
+
+DETAIL_MASK = (FEATURE_BITS['percentage'] | FEATURE_BITS['money'] | FEATURE_BITS['year'] |
+               FEATURE_BITS['time_period'] | FEATURE_BITS['specificity'])
+QUANTITATIVE_MASK = (FEATURE_BITS['percentage'] | FEATURE_BITS['large_number'] |
+                     FEATURE_BITS['measurement'] | FEATURE_BITS['temperature'] |
+                     FEATURE_BITS['duration'])
+
+ACTION_PHRASES = [
+    'how to', 'steps', 'process', 'method', 'approach', 'strategy',
+    'implement', 'create', 'develop', 'build', 'design', 'plan',
+    'should', 'must', 'need to', 'important to', 'recommended'
+]
+
+EXAMPLE_PHRASES = [
+    'for example', 'such as', 'including', 'like', 'instance',
+    'e.g.', 'i.e.', 'namely', 'case study', 'illustration'
+]
+
+def _phrase_group(name: str, phrases: List[str]) -> str:
+    """Build a named alternation group, longest phrases first."""
+    ordered = sorted(phrases, key=len, reverse=True)
+    return f"(?P<{name}>" + '|'.join(re.escape(phrase) for phrase in ordered) + ")"
+
+# Numbers consume only their digits (and an attached %); the following unit is
+# captured by lookahead so that phrases inside it ("5 steps") are still scanned.
+COMPLETENESS_PATTERN = re.compile(
+    r"(?P<money>\$(?=\d))"
+    r"|\b(?P<number>\d+(?:\.\d+)?)(?P<percent>%)?(?=(?P<space>\s*)(?P<unit>[^\W\d_]+))?"
+    r"|\b(?P<specificity>specifically|particularly|exactly|precisely)\b"
+    "|" + _phrase_group('actionable', ACTION_PHRASES) +
+    "|" + _phrase_group('example', EXAMPLE_PHRASES),
+    re.IGNORECASE
+)
+
+LARGE_NUMBER_UNITS = ('million', 'billion', 'thousand')
+MEASUREMENT_UNITS = ('kg', 'lb', 'oz', 'g', 'l', 'ml')
+DURATION_UNITS = ('minute', 'hour', 'day')
+TIME_PERIOD_UNITS = {'hour', 'hours', 'day', 'days', 'week', 'weeks', 'month', 'months'}
+
+class CompletenessFeatureExtractor:
+    """
+    Detects all completeness features of a text in one regex scan.
+
+    Detail, quantity, time-period, measurement, actionable and example patterns
+    are combined into a single precompiled pattern; each match is classified
+    into feature counts and a bitmask.
+    """
+
+    def extract(self, content: str) -> Tuple[int, np.ndarray]:
+        """
+        Extract completeness features from text.
+
+        Args:
+            content: Section content
+
+        Returns:
+            Tuple of (feature bitmask, per-feature match counts)
+        """
+        counts = np.zeros(len(COMPLETENESS_FEATURES), dtype=np.int32)
+
+        for match in COMPLETENESS_PATTERN.finditer(content):
+            if match.group('number') is not None:
+                for feature in self._classify_number(match):
+                    counts[feature] += 1
+            else:
+                counts[COMPLETENESS_FEATURES.index(match.lastgroup)] += 1
+
+        mask = 0
+        for index in np.flatnonzero(counts):
+            mask |= 1 << int(index)
+
+        return mask, counts
+
+    def describe(self, mask: int) -> List[str]:
+        """Get the names of the features set in a bitmask."""
+        return [name for name, bit in FEATURE_BITS.items() if mask & bit]
+
+    def to_dict(self, counts: np.ndarray) -> Dict[str, int]:
+        """Map a count vector to feature names for diagnostics."""
+        return {name: int(count) for name, count in zip(COMPLETENESS_FEATURES, counts)}
+
+    def _classify_number(self, match: re.Match) -> List[int]:
+        """Classify a number match by its suffix into feature indices."""
+        features = []
+        number = match.group('number')
+        unit = (match.group('unit') or '').lower()
+        attached_unit = bool(unit) and not match.group('space')
+
+        if match.group('percent'):
+            features.append(COMPLETENESS_FEATURES.index('percentage'))
+
+        if not attached_unit and any(len(part) == 4 for part in number.split('.')):
+            features.append(COMPLETENESS_FEATURES.index('year'))
+
+        if unit:
+            if unit.startswith(LARGE_NUMBER_UNITS):
+                features.append(COMPLETENESS_FEATURES.index('large_number'))
+            if unit.startswith(MEASUREMENT_UNITS):
+                features.append(COMPLETENESS_FEATURES.index('measurement'))
+            if unit.startswith('degree'):
+                features.append(COMPLETENESS_FEATURES.index('temperature'))
+            if unit.startswith(DURATION_UNITS):
+                features.append(COMPLETENESS_FEATURES.index('duration'))
+            if unit in TIME_PERIOD_UNITS:
+                features.append(COMPLETENESS_FEATURES.index('time_period'))
+
+        return features
@@ -0,0 +1,112 @@
+# Hashed Vectorizer Module
+# Feature-hashed TF-IDF vectors for offline semantic similarity
+
+from __future__ import annotations
+
+import re
+import zlib
+from functools import lru_cache
+from typing import List, Tuple
+import logging
+
+from .lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r'\w+')
+
+class HashedTfidfVectorizer:
+    """
+    Turns texts into fixed-width TF-IDF vectors using the hashing trick.
+
+    Words and character n-grams of each word are hashed into a fixed number of
+    signed buckets, so memory per vector does not depend on vocabulary size and
+    no model or vocabulary needs to be downloaded or stored.
+    """
+
+    def __init__(self, n_features: int = 4096, char_ngram_range: Tuple[int, int] = (3, 5),
+                 word_cache_size: int = 65536):
+        self.n_features = n_features
+        self.char_ngram_range = char_ngram_range
+        self.idf = None
+
+        # Per-word feature lists are reused across sections and documents
+        self._word_features = lru_cache(maxsize=word_cache_size)(self._compute_word_features)
+
+    def fit_transform(self, texts: List[str]) -> np.ndarray:
+        """
+        Learn bucket document frequencies and return L2-normalized TF-IDF vectors.
+
+        Args:
+            texts: Texts forming the collection
+
+        Returns:
+            Float32 array of shape (len(texts), n_features)
+        """
+        counts = self._count_matrix(texts)
+
+        document_frequencies = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1.0 + len(texts)) / (1.0 + document_frequencies)) + 1.0).astype(np.float32)
+
+        return self._weight_and_normalize(counts)
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """
+        Vectorize texts using the fitted collection IDF.
+
+        Args:
+            texts: Texts to vectorize
+
+        Returns:
+            Float32 array of shape (len(texts), n_features)
+        """
+        if self.idf is None:
+            raise ValueError("Vectorizer must be fitted before transform")
+
+        return self._weight_and_normalize(self._count_matrix(texts))
+
+    def _count_matrix(self, texts: List[str]) -> np.ndarray:
+        """Build signed hashed feature counts for each text."""
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            buckets = []
+            signs = []
+            for word in WORD_PATTERN.findall(text.lower()):
+                word_buckets, word_signs = self._word_features(word)
+                buckets.extend(word_buckets)
+                signs.extend(word_signs)
+
+            if buckets:
+                matrix[row] = np.bincount(buckets, weights=signs, minlength=self.n_features)
+
+        return matrix
+
+    def _weight_and_normalize(self, counts: np.ndarray) -> np.ndarray:
+        """Apply IDF weights and L2-normalize rows in place."""
+        counts *= self.idf
+        norms = np.linalg.norm(counts, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        counts /= norms
+        return counts
+
+    def _compute_word_features(self, word: str) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+        """Hash a word and its character n-grams into (buckets, signs)."""
+        features = ['w:' + word]
+
+        padded = f" {word} "
+        min_n, max_n = self.char_ngram_range
+        for n in range(min_n, max_n + 1):
+            for start in range(len(padded) - n + 1):
+                features.append('c:' + padded[start:start + n])
+
+        buckets = []
+        signs = []
+        for feature in features:
+            hashed = zlib.crc32(feature.encode('utf-8'))
+            buckets.append(hashed % self.n_features)
+            signs.append(1.0 if hashed & 0x80000000 else -1.0)
+
+        return tuple(buckets), tuple(signs)
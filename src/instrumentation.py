@@ -0,0 +1,173 @@
+# Instrumentation Module
+# Optional per-component timing and score distribution recording
+
+from __future__ import annotations
+
+import json
+import time
+import functools
+from typing import Dict, List, Any, Iterable
+import logging
+
+from .lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+# Scoring functions timed when instrumentation is enabled
+SECTION_RANKER_METHODS = (
+    'rank_sections',
+    '_calculate_position_score',
+    '_calculate_quality_score',
+    '_calculate_completeness_score',
+    '_calculate_uniqueness_score',
+    '_compute_uniqueness_scores',
+    '_select_mmr',
+)
+
+PERSONA_MATCHER_METHODS = (
+    'calculate_relevance',
+    'calculate_relevance_batch',
+    '_calculate_semantic_scores',
+    '_calculate_keyword_scores_stream',
+    '_calculate_bm25_scores_stream',
+    '_calculate_keyword_score',
+    '_calculate_bm25_score',
+    '_calculate_title_score',
+    '_calculate_context_score',
+    '_calculate_length_score',
+)
+
+class ComponentInstrumentation:
+    """
+    Records wall time, call counts and score histograms of component methods.
+
+    Methods are wrapped on the component instances only when instrumentation is
+    attached, so disabled runs execute the original methods with no overhead.
+    Timings are inclusive: a method's time includes the instrumented methods it
+    calls. Numeric return values (scalars or 1-D arrays/lists of scores) are
+    added to fixed-width histograms over [0, 1].
+    """
+
+    def __init__(self, histogram_bins: int = 10):
+        self.histogram_bins = histogram_bins
+        self._timings: Dict[str, List[float]] = {}
+        self._histograms: Dict[str, Dict[str, Any]] = {}
+
+    def reset(self) -> None:
+        """Clear all recorded timings and histograms, keeping attached wrappers."""
+        # Wrappers hold their timing entries, so clear them in place
+        for timing in self._timings.values():
+            timing[0] = 0
+            timing[1] = 0.0
+        self._histograms.clear()
+
+    def attach(self, component: Any, method_names: Iterable[str], prefix: str = None) -> None:
+        """
+        Wrap methods of a component instance with timing wrappers.
+
+        Args:
+            component: Object whose methods should be instrumented
+            method_names: Names of the methods to wrap (missing ones are skipped)
+            prefix: Name prefix for recorded entries (defaults to the class name)
+        """
+        prefix = prefix or type(component).__name__
+        for method_name in method_names:
+            method = getattr(component, method_name, None)
+            if method is None:
+                continue
+            # Instance attributes shadow the class methods
+            setattr(component, method_name, self._wrap(f"{prefix}.{method_name}", method))
+
+    def record_scores(self, name: str, values: Any) -> None:
+        """
+        Add score values to a named histogram.
+
+        Args:
+            name: Histogram name
+            values: A single score or a sequence of scores
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = {
+                'count': 0, 'sum': 0.0, 'min': float('inf'), 'max': float('-inf'),
+                'counts': np.zeros(self.histogram_bins, dtype=np.int64)
+            }
+            self._histograms[name] = histogram
+
+        bins = np.clip((values * self.histogram_bins).astype(np.int64), 0, self.histogram_bins - 1)
+        histogram['counts'] += np.bincount(bins, minlength=self.histogram_bins)
+        histogram['count'] += len(values)
+        histogram['sum'] += float(values.sum())
+        histogram['min'] = min(histogram['min'], float(values.min()))
+        histogram['max'] = max(histogram['max'], float(values.max()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get recorded timings and histograms as a JSON-serializable dict."""
+        timings = {}
+        for name, (calls, total) in sorted(self._timings.items(), key=lambda item: -item[1][1]):
+            timings[name] = {
+                'calls': int(calls),
+                'total_seconds': round(total, 6),
+                'mean_seconds': round(total / calls, 9) if calls else 0.0
+            }
+
+        edges = np.linspace(0.0, 1.0, self.histogram_bins + 1)
+        histograms = {}
+        for name, histogram in sorted(self._histograms.items()):
+            histograms[name] = {
+                'count': histogram['count'],
+                'mean': histogram['sum'] / histogram['count'],
+                'min': histogram['min'],
+                'max': histogram['max'],
+                'bin_edges': [round(float(edge), 6) for edge in edges],
+                'counts': histogram['counts'].tolist()
+            }
+
+        return {'timings': timings, 'score_histograms': histograms}
+
+    def save(self, path: str) -> bool:
+        """
+        Write the recorded data as JSON.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            True if written successfully
+        """
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=2)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving instrumentation: {str(e)}")
+            return False
+
+    def _wrap(self, name: str, method):
+        """Create a timing wrapper that also records numeric results."""
+        timing = self._timings.setdefault(name, [0, 0.0])
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            timing[1] += time.perf_counter() - start
+            timing[0] += 1
+
+            # Only floating point results are scores (index arrays are skipped)
+            if isinstance(result, np.ndarray):
+                if result.dtype.kind == 'f':
+                    self.record_scores(name, result)
+            elif isinstance(result, float):
+                self.record_scores(name, result)
+            elif isinstance(result, list) and result and isinstance(result[0], float):
+                self.record_scores(name, result)
+            return result
+
+        return timed
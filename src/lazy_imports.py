@@ -0,0 +1,79 @@
+# Lazy Imports Module
+# Defers loading heavy libraries until their first attribute access
+
+import sys
+import threading
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LazyModule(ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    numpy, PyMuPDF and NLTK together take most of the CLI startup time, and
+    runs served from the result cache or from .pdf.txt fallbacks may not
+    need some of them at all. After loading, the real module's attributes
+    are copied onto the stand-in, so later lookups cost the same as on the
+    module itself. Modules that annotate with lazily imported types use
+    postponed annotation evaluation so defining functions does not load them.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+
+    def load(self) -> ModuleType:
+        """Import the module (once) and return it."""
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__.update(
+                        (key, value) for key, value in vars(module).items()
+                        if key not in ('__name__', '__spec__', '__loader__')
+                    )
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attribute: str) -> Any:
+        # Only called for attributes not copied yet, i.e. before loading
+        return getattr(self.load(), attribute)
+
+    def __dir__(self):
+        return dir(self.load())
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Get a module that is imported on first use.
+
+    Args:
+        name: Absolute module name
+
+    Returns:
+        The module if it is already imported, otherwise a LazyModule
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+def is_available(name: str) -> bool:
+    """Check that a module is installed without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def preload(*names: str) -> None:
+    """Import installed modules now, e.g. to warm up a long-running process."""
+    for name in names:
+        if is_available(name):
+            importlib.import_module(name)
@@ -0,0 +1,203 @@
+# Memory Monitor Module
+# Per-stage RSS growth and tracemalloc allocation accounting
+
+import sys
+import json
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterator, Optional
+import logging
+
+# resource is Unix-only; RSS is not reported without it
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Allocations of the monitor itself and of the import machinery are not reported
+ALLOCATION_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+# tracemalloc is process-wide, while each system has its own monitor and the
+# service runs several systems on threads: tracing stays on while any monitor
+# uses it, and the traced peak is only reset when no other traced stage is running
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False
+_traced_stages = 0
+
+def _acquire_tracing() -> None:
+    """Start tracemalloc for the first monitor using it (unless already running)."""
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_users += 1
+
+def _release_tracing() -> None:
+    """Stop tracemalloc when the last monitor using it is done, if a monitor started it."""
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+def current_rss() -> Optional[int]:
+    """Get the resident set size of this process in bytes (None if unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss()
+
+def peak_rss() -> Optional[int]:
+    """Get the peak resident set size of this process in bytes (None if unavailable)."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+class MemoryMonitor:
+    """
+    Records memory use of processing stages.
+
+    For each stage name, RSS after the stage, the RSS growth during the stage
+    and the process peak RSS so far are recorded. The kernel only tracks a
+    process-lifetime peak, so the growth (RSS at the end minus RSS at the
+    start) is what is attributable to the stage itself; stages that overlap
+    on pipeline worker threads share their growth. With allocation tracing,
+    tracemalloc also reports the peak traced memory during the stage, the
+    net allocation it left behind and its top allocating source lines
+    (tracing slows processing, so it is optional). Repeated stages (one per
+    document) are merged: peaks are maximized, growth and net allocations
+    summed, and the top allocators of the largest call are kept. Traced
+    peaks of stages overlapping on other threads or systems are measured
+    from the earliest of them, so they may include the others' allocations.
+    With a budget, stages that end above it are recorded and logged.
+    """
+
+    def __init__(self, budget_bytes: int = None, trace_allocations: bool = False,
+                 top_allocators: int = 5):
+        self.budget_bytes = budget_bytes
+        self.trace_allocations = trace_allocations
+        self.top_allocators = top_allocators
+        self._using_tracing = False
+        self._lock = threading.Lock()  # Pipelined stages finish on worker threads
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear stage records."""
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.budget_exceeded: List[Dict[str, Any]] = []
+
+    def start(self) -> None:
+        """Start allocation tracing if requested, sharing it with other monitors."""
+        self.reset()
+        if self.trace_allocations and not self._using_tracing:
+            _acquire_tracing()
+            self._using_tracing = True
+
+    def stop(self) -> None:
+        """Release allocation tracing; it stops once no monitor uses it."""
+        if self._using_tracing:
+            _release_tracing()
+            self._using_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the memory use of a processing stage."""
+        global _traced_stages
+        start_rss = current_rss()
+        tracing = self.trace_allocations and tracemalloc.is_tracing()
+        if tracing:
+            start_snapshot = tracemalloc.take_snapshot().filter_traces(ALLOCATION_FILTERS)
+            with _tracing_lock:
+                start_traced = tracemalloc.get_traced_memory()[0]
+                if _traced_stages == 0:
+                    tracemalloc.reset_peak()
+                _traced_stages += 1
+
+        try:
+            yield
+        finally:
+            rss = current_rss()
+            if tracing:
+                with _tracing_lock:
+                    _traced_stages -= 1
+                # Tracing may have been stopped outside the monitors meanwhile
+                tracing = tracemalloc.is_tracing()
+                if tracing:
+                    traced, traced_peak = tracemalloc.get_traced_memory()
+
+            with self._lock:
+                record = self.stages.setdefault(name, {'calls': 0})
+                record['calls'] += 1
+
+                if rss is not None:
+                    record['rss_mb'] = round(rss / MB, 2)
+                    record['rss_delta_mb'] = round(record.get('rss_delta_mb', 0.0) + (rss - start_rss) / MB, 2)
+                    record['process_peak_rss_mb'] = round(max(peak_rss(), rss) / MB, 2)
+                    self._check_budget(name, rss)
+
+                if tracing:
+                    stage_peak = traced_peak - start_traced
+                    record['net_allocated_mb'] = round(
+                        record.get('net_allocated_mb', 0.0) + (traced - start_traced) / MB, 3
+                    )
+                    if stage_peak / MB >= record.get('traced_peak_mb', float('-inf')):
+                        record['traced_peak_mb'] = round(stage_peak / MB, 3)
+                        record['top_allocators'] = self._top_allocators(start_snapshot)
+
+    def summary(self) -> Dict[str, Any]:
+        """Get per-stage records, the process peak RSS and budget overruns."""
+        peak = peak_rss()
+        return {
+            'peak_rss_mb': round(peak / MB, 2) if peak is not None else None,
+            'budget_mb': round(self.budget_bytes / MB, 2) if self.budget_bytes is not None else None,
+            'budget_exceeded': list(self.budget_exceeded),
+            'allocation_tracing': self.trace_allocations,
+            'stages': self.stages
+        }
+
+    def save(self, output_path: str) -> bool:
+        """Write the summary as JSON."""
+        try:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(self.summary(), f, indent=2)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not save memory report: {str(e)}")
+            return False
+
+    def _top_allocators(self, start_snapshot: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        """Source lines that allocated the most memory since the stage started."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(ALLOCATION_FILTERS)
+        differences = snapshot.compare_to(start_snapshot, 'lineno')
+        allocators = []
+        for difference in differences[:self.top_allocators]:
+            frame = difference.traceback[0]
+            allocators.append({
+                'location': f"{frame.filename}:{frame.lineno}",
+                'size_diff_kb': round(difference.size_diff / 1024, 1),
+                'count_diff': difference.count_diff
+            })
+        return allocators
+
+    def _check_budget(self, name: str, rss: int) -> None:
+        if self.budget_bytes is None or rss <= self.budget_bytes:
+            return
+        self.budget_exceeded.append({'stage': name, 'rss_mb': round(rss / MB, 2)})
+        logger.warning(f"Memory budget exceeded after {name}: "
+                       f"{rss / MB:.1f} MB of {self.budget_bytes / MB:.1f} MB")
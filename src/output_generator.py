@@ -1,11 +1,12 @@
 # Output Generation Module
 # Generates structured JSON output in the required format
 
-import json
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Tuple
 import logging
 
+from .output_writer import StreamingOutputWriter
+
 logger = logging.getLogger(__name__)
 
 class OutputGenerator:
@@ -30,19 +31,8 @@ class OutputGenerator:
         Returns:
             Structured output dictionary
         """
-        # Extract document filenames
-        if isinstance(input_config.get('documents'), list):
-            if input_config['documents'] and isinstance(input_config['documents'][0], dict):
-                # Format: [{"filename": "doc.pdf", "title": "Title"}]
-                input_documents = [doc.get('filename', '') for doc in input_config['documents']]
-            else:
-                # Format: ["doc1.pdf", "doc2.pdf"]
-                input_documents = input_config['documents']
-        else:
-            input_documents = []
-        
         # Generate metadata
-        metadata = self._generate_metadata(input_config, input_documents)
+        metadata = self._generate_metadata(input_config, self._get_input_documents(input_config))
         
         # Generate extracted sections (top sections)
         extracted_sections = self._generate_extracted_sections(ranked_sections)
@@ -60,6 +50,54 @@ class OutputGenerator:
         
         return output
     
+    def write_output(self, input_config: Dict[str, Any],
+                     ranked_sections: List[Dict[str, Any]],
+                     subsections: Iterable[Dict[str, Any]],
+                     writer: StreamingOutputWriter,
+                     extra_metadata: Dict[str, Any] = None) -> Tuple[int, int]:
+        """
+        Stream the output document through a writer.
+        
+        Subsections may be a generator; each entry is serialized as soon as it
+        is produced, so the full subsection analysis is never held in memory.
+        
+        Args:
+            input_config: Original input configuration
+            ranked_sections: Ranked sections with importance scores
+            subsections: Analyzed subsections, possibly produced lazily
+            writer: Writer that receives the output document
+            extra_metadata: Additional fields appended to the metadata
+            
+        Returns:
+            Tuple of (extracted section count, subsection count)
+        """
+        metadata = self._generate_metadata(input_config, self._get_input_documents(input_config))
+        if extra_metadata:
+            metadata.update(extra_metadata)
+        writer.begin(metadata)
+        
+        for section in self._top_ranked_sections(ranked_sections):
+            writer.write_section(self._generate_section_entry(section))
+        
+        for subsection in subsections:
+            writer.write_subsection(self._generate_subsection_entry(subsection))
+        
+        section_count = writer.counts['extracted_sections']
+        subsection_count = writer.counts['subsection_analysis']
+        logger.info(f"Generated output with {section_count} sections and {subsection_count} subsections")
+        
+        return section_count, subsection_count
+    
+    def _get_input_documents(self, input_config: Dict[str, Any]) -> List[str]:
+        """Extract document filenames from the input configuration."""
+        if isinstance(input_config.get('documents'), list):
+            if input_config['documents'] and isinstance(input_config['documents'][0], dict):
+                # Format: [{"filename": "doc.pdf", "title": "Title"}]
+                return [doc.get('filename', '') for doc in input_config['documents']]
+            # Format: ["doc1.pdf", "doc2.pdf"]
+            return input_config['documents']
+        return []
+    
     def _generate_metadata(self, input_config: Dict[str, Any], 
                           input_documents: List[str]) -> Dict[str, Any]:
         """Generate metadata section."""
@@ -88,64 +126,79 @@ class OutputGenerator:
         """Generate extracted sections list."""
         extracted_sections = []
         
-        # Take top sections (limit to reasonable number)
-        top_sections = ranked_sections[:10]  # Top 10 sections
-        
-        for section in top_sections:
-            section_entry = {
-                "document": section.get('document_name', section.get('name', 'unknown.pdf')),
-                "section_title": section.get('title', 'Untitled Section'),
-                "importance_rank": section.get('importance_rank', 1),
-                "page_number": section.get('page_number', 1)
-            }
-            
-            # Add optional fields if available
-            if 'relevance_score' in section:
-                section_entry["relevance_score"] = round(section['relevance_score'], 3)
-            
-            if 'final_score' in section:
-                section_entry["final_score"] = round(section['final_score'], 3)
-            
-            extracted_sections.append(section_entry)
+        for section in self._top_ranked_sections(ranked_sections):
+            extracted_sections.append(self._generate_section_entry(section))
         
         return extracted_sections
     
+    def _top_ranked_sections(self, ranked_sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Get the top 10 sections, skipping unranked tail sections (e.g. left by per-document caps)."""
+        return [section for section in ranked_sections[:10] if 'importance_rank' in section]
+    
+    def _generate_section_entry(self, section: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate one extracted_sections entry."""
+        section_entry = {
+            "document": section.get('document_name', section.get('name', 'unknown.pdf')),
+            "section_title": section.get('title', 'Untitled Section'),
+            "importance_rank": section.get('importance_rank', 1),
+            "page_number": section.get('page_number', 1)
+        }
+        
+        # Add optional fields if available
+        if 'relevance_score' in section:
+            section_entry["relevance_score"] = round(section['relevance_score'], 3)
+        
+        if 'final_score' in section:
+            section_entry["final_score"] = round(section['final_score'], 3)
+        
+        return section_entry
+    
     def _generate_subsection_analysis(self, subsections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate subsection analysis list."""
         subsection_analysis = []
         
         for subsection in subsections:
-            analysis_entry = {
-                "document": subsection.get('document', 'unknown.pdf'),
-                "refined_text": subsection.get('refined_text', ''),
-                "page_number": subsection.get('page_number', 1)
-            }
-            
-            # Add optional fields if available
-            if 'analysis_method' in subsection:
-                analysis_entry["analysis_method"] = subsection['analysis_method']
-            
-            if 'relevance_score' in subsection:
-                analysis_entry["relevance_score"] = round(subsection['relevance_score'], 3)
-            
-            subsection_analysis.append(analysis_entry)
+            subsection_analysis.append(self._generate_subsection_entry(subsection))
         
         return subsection_analysis
     
-    def save_output(self, output_data: Dict[str, Any], output_path: str) -> bool:
+    def _generate_subsection_entry(self, subsection: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate one subsection_analysis entry."""
+        analysis_entry = {
+            "document": subsection.get('document', 'unknown.pdf'),
+            "refined_text": subsection.get('refined_text', ''),
+            "page_number": subsection.get('page_number', 1)
+        }
+        
+        # Add optional fields if available
+        if 'analysis_method' in subsection:
+            analysis_entry["analysis_method"] = subsection['analysis_method']
+        
+        if 'relevance_score' in subsection:
+            analysis_entry["relevance_score"] = round(subsection['relevance_score'], 3)
+        
+        return analysis_entry
+    
+    def save_output(self, output_data: Dict[str, Any], output_path: str,
+                    output_format: str = 'pretty') -> bool:
         """
         Save output data to JSON file.
         
         Args:
             output_data: Generated output data
             output_path: Path to save the JSON file
+            output_format: 'pretty', 'compact' or 'ndjson'
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            with StreamingOutputWriter(output_path, output_format) as writer:
+                writer.begin(output_data['metadata'])
+                for entry in output_data['extracted_sections']:
+                    writer.write_section(entry)
+                for entry in output_data['subsection_analysis']:
+                    writer.write_subsection(entry)
             
             logger.info(f"Output saved to {output_path}")
             return True
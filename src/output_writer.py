@@ -0,0 +1,166 @@
+# Output Writer Module
+# Streaming JSON output with pretty, compact and NDJSON formats
+
+import os
+import json
+import tempfile
+from pathlib import Path
+from typing import Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Supported output formats
+OUTPUT_FORMATS = ('pretty', 'compact', 'ndjson')
+
+# Output arrays in the order they are written
+OUTPUT_ARRAYS = ('extracted_sections', 'subsection_analysis')
+
+def _read_umask() -> int:
+    """Get the process umask (os.umask can only be read by setting it)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# Mode for finished output files, as open() would create them. Read once at
+# import, because querying the umask briefly changes it for every thread.
+OUTPUT_FILE_MODE = 0o666 & ~_read_umask()
+
+class StreamingOutputWriter:
+    """
+    Writes the output document incrementally instead of building it in memory.
+
+    Entries are serialized as they are produced into a temporary file in the
+    destination directory, which is atomically renamed over the destination on
+    close(), so readers never see a partial file.
+
+    Formats:
+        pretty:  Same bytes as json.dump(output, indent=2, ensure_ascii=False)
+        compact: Single-line JSON without whitespace
+        ndjson:  One JSON record per line, tagged with a 'record_type' field
+    """
+
+    def __init__(self, output_path: str, output_format: str = 'pretty'):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}. Expected one of {OUTPUT_FORMATS}")
+
+        self.output_path = Path(output_path)
+        self.output_format = output_format
+        self.counts = {name: 0 for name in OUTPUT_ARRAYS}
+        self._array_index = -1
+        self._file = None
+        self._temp_path = None
+
+    def __enter__(self) -> 'StreamingOutputWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def begin(self, metadata: Dict[str, Any]) -> None:
+        """
+        Open the temporary file and write the metadata.
+
+        Args:
+            metadata: Output metadata
+        """
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{self.output_path.name}.",
+                                         suffix='.tmp', dir=str(self.output_path.parent))
+        self._temp_path = temp_path
+        self._file = os.fdopen(fd, 'w', encoding='utf-8')
+
+        if self.output_format == 'ndjson':
+            self._write_record('metadata', {'metadata': metadata})
+        elif self.output_format == 'pretty':
+            self._file.write('{\n  "metadata": ' + self._dumps(metadata, 2))
+        else:
+            self._file.write('{"metadata":' + self._dumps(metadata))
+
+    def write_section(self, entry: Dict[str, Any]) -> None:
+        """Write one extracted_sections entry."""
+        self._write_entry('extracted_sections', entry)
+
+    def write_subsection(self, entry: Dict[str, Any]) -> None:
+        """Write one subsection_analysis entry."""
+        self._write_entry('subsection_analysis', entry)
+
+    def close(self) -> None:
+        """Finish the document and atomically move it into place."""
+        if self._file is None:
+            return
+
+        self._open_array(len(OUTPUT_ARRAYS))
+        if self.output_format != 'ndjson':
+            self._file.write('\n}' if self.output_format == 'pretty' else '}')
+
+        os.fchmod(self._file.fileno(), OUTPUT_FILE_MODE)
+        self._file.close()
+        self._file = None
+        os.replace(self._temp_path, self.output_path)
+        self._temp_path = None
+
+    def abort(self) -> None:
+        """Discard the partial output, leaving any existing destination file untouched."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._temp_path is not None:
+            try:
+                os.remove(self._temp_path)
+            except OSError:
+                pass
+            self._temp_path = None
+
+    def _write_entry(self, array_name: str, entry: Dict[str, Any]) -> None:
+        """Write an entry of an output array, closing earlier arrays as needed."""
+        array_index = OUTPUT_ARRAYS.index(array_name)
+        if array_index < self._array_index:
+            raise ValueError(f"{array_name} entries must be written before {OUTPUT_ARRAYS[self._array_index]}")
+        self._open_array(array_index)
+
+        if self.output_format == 'ndjson':
+            self._write_record(array_name, entry)
+        elif self.output_format == 'pretty':
+            separator = ',\n' if self.counts[array_name] else '\n'
+            self._file.write(separator + '    ' + self._dumps(entry, 4))
+        else:
+            separator = ',' if self.counts[array_name] else ''
+            self._file.write(separator + self._dumps(entry))
+
+        self.counts[array_name] += 1
+
+    def _open_array(self, array_index: int) -> None:
+        """Close the current array and open arrays up to array_index."""
+        while self._array_index < array_index:
+            if self._array_index >= 0:
+                self._close_array(OUTPUT_ARRAYS[self._array_index])
+            self._array_index += 1
+            if self._array_index < len(OUTPUT_ARRAYS) and self.output_format != 'ndjson':
+                name = OUTPUT_ARRAYS[self._array_index]
+                if self.output_format == 'pretty':
+                    self._file.write(f',\n  "{name}": [')
+                else:
+                    self._file.write(f',"{name}":[')
+
+    def _close_array(self, array_name: str) -> None:
+        """Write the closing bracket of an output array."""
+        if self.output_format == 'pretty':
+            self._file.write('\n  ]' if self.counts[array_name] else ']')
+        elif self.output_format == 'compact':
+            self._file.write(']')
+
+    def _write_record(self, record_type: str, record: Dict[str, Any]) -> None:
+        """Write one NDJSON line."""
+        self._file.write(self._dumps({'record_type': record_type, **record}) + '\n')
+
+    def _dumps(self, value: Any, indent_level: int = None) -> str:
+        """Serialize a value, re-indenting pretty output to its nesting level."""
+        if indent_level is None:
+            return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+        text = json.dumps(value, indent=2, ensure_ascii=False)
+        return text.replace('\n', '\n' + ' ' * indent_level)
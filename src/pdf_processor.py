@@ -1,21 +1,23 @@
 # PDF Processing Module
 # Handles text extraction and document parsing
 
-# Try to import PDF processing libraries
-PDF_AVAILABLE = False
-try:
-    import fitz  # PyMuPDF
-    PDF_AVAILABLE = True
-except ImportError:
-    fitz = None
-    
 import re
 import logging
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional
 from pathlib import Path
 
+from . import tracing
+from .lazy_imports import lazy_import, is_available
+
+# PyMuPDF is imported on the first PDF opened; text fallbacks never load it
+PDF_AVAILABLE = is_available('fitz')
+fitz = lazy_import('fitz')
+
 logger = logging.getLogger(__name__)
 
+# Pages parsed per traced batch
+PAGE_BATCH_SIZE = 8
+
 class PDFProcessor:
     """
     Handles PDF text extraction and document parsing.
@@ -31,13 +33,15 @@ class PDFProcessor:
             r'^(Executive Summary|Overview|Results|Discussion|Methodology)$'  # Business sections
         ]
         
-    def extract_text(self, pdf_path: str) -> Dict[str, Any]:
+    def extract_text(self, pdf_path: str, max_pages: int = None) -> Dict[str, Any]:
         """
         Extract structured text content from PDF.
         Falls back to text file reading if PDF processing is unavailable.
         
         Args:
             pdf_path: Path to PDF file
+            max_pages: Parse at most this many pages, evenly sampled across
+                the document (all pages if None)
             
         Returns:
             Dictionary with extracted content and metadata
@@ -46,17 +50,19 @@ class PDFProcessor:
             pdf_file = Path(pdf_path)
             
             # Check for text file fallback (for demo/testing without PyMuPDF)
-            txt_fallback = pdf_file.with_suffix('.pdf.txt')
-            if not PDF_AVAILABLE or not pdf_file.exists():
+            txt_fallback = self._text_source(pdf_file)
+            if txt_fallback is not None:
                 if txt_fallback.exists():
                     logger.info(f"Using text fallback for {pdf_file.name}")
-                    return self._extract_from_text_file(str(txt_fallback))
+                    with tracing.span('text_file', 'pages'):
+                        return self._extract_from_text_file(str(txt_fallback))
                 else:
                     logger.warning(f"PDF processing unavailable and no text fallback found for {pdf_file.name}")
                     return {
                         'text': '',
-                        'pages': [{'page_number': 1, 'text': '', 'sections': []}],
+                        'pages': [{'page_number': 1, 'text': '', 'raw_text': '', 'sections': []}],
                         'sections': [],
+                        'full_text': '',
                         'metadata': {'filename': pdf_file.name, 'error': 'PDF processing unavailable'}
                     }
             
@@ -65,26 +71,32 @@ class PDFProcessor:
             
             pages = []
             full_text = ""
+            page_count = len(doc)
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                
-                # Extract text with formatting
-                text = page.get_text("text")
-                
-                # Extract text blocks for better structure
-                blocks = page.get_text("dict")
-                structured_content = self._parse_page_structure(blocks)
-                
-                page_data = {
-                    'page_number': page_num + 1,
-                    'raw_text': text,
-                    'structured_content': structured_content,
-                    'text_length': len(text.strip())
-                }
-                
-                pages.append(page_data)
-                full_text += text + "\n"
+            # Pages are parsed in batches, each traced as one span
+            page_numbers = self._sample_pages(page_count, max_pages)
+            for batch_start in range(0, len(page_numbers), PAGE_BATCH_SIZE):
+                batch = page_numbers[batch_start:batch_start + PAGE_BATCH_SIZE]
+                with tracing.span('pages', 'pages', first_page=batch[0] + 1, last_page=batch[-1] + 1):
+                    for page_num in batch:
+                        page = doc[page_num]
+                        
+                        # Extract text with formatting
+                        text = page.get_text("text")
+                        
+                        # Extract text blocks for better structure
+                        blocks = page.get_text("dict")
+                        structured_content = self._parse_page_structure(blocks)
+                        
+                        page_data = {
+                            'page_number': page_num + 1,
+                            'raw_text': text,
+                            'structured_content': structured_content,
+                            'text_length': len(text.strip())
+                        }
+                        
+                        pages.append(page_data)
+                        full_text += text + "\n"
             
             doc.close()
             
@@ -95,7 +107,7 @@ class PDFProcessor:
                 'pages': pages,
                 'full_text': full_text,
                 'metadata': metadata,
-                'total_pages': len(pages),
+                'total_pages': page_count,
                 'total_length': len(full_text)
             }
             
@@ -103,6 +115,78 @@ class PDFProcessor:
             logger.error(f"Error extracting text from {pdf_path}: {str(e)}")
             raise
     
+    def _text_source(self, pdf_file: Path) -> Optional[Path]:
+        """
+        Get the text file to read instead of opening a document with PyMuPDF.
+        
+        Text documents (.pdf.txt fallbacks listed by name) are always read
+        directly, so they never load PyMuPDF; a PDF is replaced by its
+        .pdf.txt fallback when it is missing or PyMuPDF is not installed.
+        
+        Returns:
+            Text file path (which may not exist), or None to open the PDF
+        """
+        if pdf_file.suffix.lower() == '.txt':
+            return pdf_file
+        if PDF_AVAILABLE and pdf_file.exists():
+            return None
+        return pdf_file.with_suffix('.pdf.txt')
+    
+    def _sample_pages(self, page_count: int, max_pages: int = None) -> List[int]:
+        """Get evenly spaced page indexes, always keeping the first and last page."""
+        if max_pages is None or page_count <= max_pages:
+            return list(range(page_count))
+        if max_pages <= 1:
+            return [0]
+        
+        step = (page_count - 1) / (max_pages - 1)
+        return sorted({round(i * step) for i in range(max_pages)})
+    
+    def extract_signature(self, pdf_path: str, max_pages: int = 2,
+                          max_chars: int = 8000) -> Dict[str, Any]:
+        """
+        Extract a cheap document signature without full structural parsing.
+        
+        Args:
+            pdf_path: Path to PDF file
+            max_pages: Number of leading pages to sample
+            max_chars: Maximum characters of leading text to keep
+            
+        Returns:
+            Dictionary with title, table of contents entries and leading text
+        """
+        pdf_file = Path(pdf_path)
+        txt_fallback = self._text_source(pdf_file)
+        
+        try:
+            if txt_fallback is not None:
+                if not txt_fallback.exists():
+                    return {'title': pdf_file.stem, 'toc': [], 'text': ''}
+                
+                with open(txt_fallback, 'r', encoding='utf-8') as f:
+                    text = f.read(max_chars)
+                toc = [line.lstrip('#').strip() for line in text.split('\n') if line.startswith('#')]
+                return {'title': pdf_file.stem, 'toc': toc, 'text': text}
+            
+            doc = fitz.open(pdf_path)
+            try:
+                title = (doc.metadata or {}).get('title', '') or pdf_file.stem
+                toc = [entry[1] for entry in doc.get_toc(simple=True)]
+                
+                text = ""
+                for page_num in range(min(max_pages, len(doc))):
+                    text += doc[page_num].get_text("text") + "\n"
+                    if len(text) >= max_chars:
+                        break
+            finally:
+                doc.close()
+            
+            return {'title': title, 'toc': toc, 'text': text[:max_chars]}
+            
+        except Exception as e:
+            logger.warning(f"Could not extract signature from {pdf_path}: {str(e)}")
+            return {'title': pdf_file.stem, 'toc': [], 'text': ''}
+    
     def _parse_page_structure(self, blocks: Dict[str, Any]) -> Dict[str, Any]:
         """Parse page structure from text blocks."""
         headers = []
@@ -298,19 +382,25 @@ class PDFProcessor:
                 section['content'] = section['content'].strip()
                 section['word_count'] = len(section['content'].split())
             
+            # Same page fields as PDF extraction, with the parsed sections attached
             result = {
                 'text': content,
                 'pages': [{
                     'page_number': 1,
                     'text': content,
+                    'raw_text': content,
+                    'text_length': len(content.strip()),
                     'sections': sections
                 }],
                 'sections': sections,
+                'full_text': content,
                 'metadata': {
                     'filename': Path(txt_path).name,
                     'processing_method': 'text_fallback',
                     'total_sections': len(sections)
-                }
+                },
+                'total_pages': 1,
+                'total_length': len(content)
             }
             
             logger.info(f"Extracted {len(content)} characters from text file with {len(sections)} sections")
@@ -320,7 +410,8 @@ class PDFProcessor:
             logger.error(f"Error reading text file {txt_path}: {e}")
             return {
                 'text': '',
-                'pages': [{'page_number': 1, 'text': '', 'sections': []}],
+                'pages': [{'page_number': 1, 'text': '', 'raw_text': '', 'sections': []}],
                 'sections': [],
+                'full_text': '',
                 'metadata': {'filename': Path(txt_path).name, 'error': str(e)}
             }
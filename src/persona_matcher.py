@@ -1,20 +1,50 @@
 # Persona Matching Module
 # Analyzes persona requirements and calculates content relevance
 
+from __future__ import annotations
+
 import re
-import numpy as np
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any, Set, Optional
 from collections import Counter
 import logging
 
+from .collection_stats import CollectionStatistics, tokenize
+from .hashed_vectorizer import HashedTfidfVectorizer
+from .token_normalizer import get_term_table
+from .token_stream import TokenStream
+from . import tracing
+from .lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
 logger = logging.getLogger(__name__)
 
+# Supported keyword scoring modes
+SCORING_MODES = ('keyword', 'bm25', 'semantic')
+
 class PersonaMatcher:
     """
     Handles persona analysis and content relevance scoring.
     """
     
-    def __init__(self):
+    def __init__(self, scoring_mode: str = 'keyword', bm25_k1: float = 1.2, bm25_b: float = 0.75,
+                 hash_features: int = 4096):
+        if scoring_mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode: {scoring_mode}. Expected one of {SCORING_MODES}")
+        
+        self.scoring_mode = scoring_mode
+        self.bm25_k1 = bm25_k1
+        self.bm25_b = bm25_b
+        self.hash_features = hash_features
+        
+        # Relevance component weights
+        self.relevance_weights = {
+            'keyword_score': 0.4,
+            'title_score': 0.3,
+            'context_score': 0.2,
+            'length_score': 0.1
+        }
+        
         # Persona-specific keywords and weights
         self.persona_keywords = {
             'academic': {
@@ -133,12 +163,22 @@ class PersonaMatcher:
         for keyword in task_keywords:
             keyword_weights[keyword] = 2.5
         
+        # Normalized term weights (highest weight wins when keywords share a stem)
+        term_table = get_term_table()
+        term_weights = {}
+        for keyword, weight in keyword_weights.items():
+            term = term_table.normalize(keyword)
+            if term:
+                term_weights[term] = max(weight, term_weights.get(term, 0.0))
+        
         profile = {
             'domain': domain,
             'role': specific_role,
             'job_type': job_type,
             'task_description': task,
+            'query_text': f"{full_role} {task}".strip(),
             'keyword_weights': keyword_weights,
+            'term_weights': term_weights,
             'all_keywords': set(keyword_weights.keys()),
             'priority_keywords': self._get_priority_keywords(task)
         }
@@ -149,13 +189,15 @@ class PersonaMatcher:
         return profile
     
     def calculate_relevance(self, section: Dict[str, Any], 
-                          persona_profile: Dict[str, Any]) -> float:
+                          persona_profile: Dict[str, Any],
+                          collection_stats: Optional[CollectionStatistics] = None) -> float:
         """
         Calculate relevance score for a section based on persona profile.
         
         Args:
             section: Text section with content
             persona_profile: Persona matching profile
+            collection_stats: Collection statistics (required for BM25 mode)
             
         Returns:
             Relevance score (0.0 to 1.0)
@@ -167,21 +209,188 @@ class PersonaMatcher:
             return 0.0
         
         # Calculate different relevance components
-        keyword_score = self._calculate_keyword_score(content, persona_profile)
+        if self.scoring_mode == 'bm25' and collection_stats is not None:
+            keyword_score = self._calculate_bm25_score(content, persona_profile, collection_stats)
+        else:
+            keyword_score = self._calculate_keyword_score(content, persona_profile)
         title_score = self._calculate_title_score(title, persona_profile)
         context_score = self._calculate_context_score(content, persona_profile)
         length_score = self._calculate_length_score(content)
         
         # Weighted combination
+        weights = self.relevance_weights
         total_score = (
-            keyword_score * 0.4 +
-            title_score * 0.3 +
-            context_score * 0.2 +
-            length_score * 0.1
+            keyword_score * weights['keyword_score'] +
+            title_score * weights['title_score'] +
+            context_score * weights['context_score'] +
+            length_score * weights['length_score']
         )
         
         return min(total_score, 1.0)
     
+    def calculate_relevance_batch(self, sections: List[Dict[str, Any]],
+                                  persona_profile: Dict[str, Any],
+                                  collection_stats: Optional[CollectionStatistics] = None,
+                                  token_stream: Optional[TokenStream] = None) -> List[float]:
+        """
+        Calculate relevance scores for a list of sections.
+        
+        In semantic mode the keyword component is replaced by hashed TF-IDF
+        similarity to the persona query, computed as one matrix product. With a
+        token stream, keyword and BM25 components are computed as array
+        operations over the shared token ids instead of per-section splitting.
+        
+        Args:
+            sections: Text sections with content
+            persona_profile: Persona matching profile
+            collection_stats: Collection statistics (required for BM25 mode)
+            token_stream: Token stream covering the sections (optional)
+            
+        Returns:
+            Relevance scores (0.0 to 1.0) aligned with the input sections
+        """
+        if not sections:
+            return []
+        
+        stream_indices = None
+        if token_stream is not None:
+            stream_indices = np.array([token_stream.index_of(section) for section in sections])
+            if (stream_indices < 0).any():
+                stream_indices = None
+        
+        with tracing.span('keyword_scores', 'step', mode=self.scoring_mode, sections=len(sections)):
+            if self.scoring_mode == 'semantic':
+                keyword_scores = self._calculate_semantic_scores(sections, persona_profile)
+            elif stream_indices is not None:
+                if self.scoring_mode == 'bm25' and collection_stats is not None:
+                    keyword_scores = self._calculate_bm25_scores_stream(
+                        token_stream, persona_profile, collection_stats
+                    )[stream_indices]
+                else:
+                    keyword_scores = self._calculate_keyword_scores_stream(
+                        token_stream, persona_profile
+                    )[stream_indices]
+            else:
+                return [self.calculate_relevance(section, persona_profile, collection_stats)
+                        for section in sections]
+        
+        weights = self.relevance_weights
+        
+        scores = []
+        with tracing.span('relevance_components', 'step', sections=len(sections)):
+            for section, keyword_score in zip(sections, keyword_scores):
+                content = section.get('content', '').lower()
+                title = section.get('title', '').lower()
+                
+                if not content:
+                    scores.append(0.0)
+                    continue
+                
+                total_score = (
+                    float(keyword_score) * weights['keyword_score'] +
+                    self._calculate_title_score(title, persona_profile) * weights['title_score'] +
+                    self._calculate_context_score(content, persona_profile) * weights['context_score'] +
+                    self._calculate_length_score(content) * weights['length_score']
+                )
+                scores.append(min(total_score, 1.0))
+        
+        return scores
+    
+    def _calculate_keyword_scores_stream(self, token_stream: TokenStream,
+                                         persona_profile: Dict[str, Any]) -> np.ndarray:
+        """Calculate keyword scores for every section of a token stream."""
+        total_weight = sum(persona_profile['keyword_weights'].values())
+        if total_weight == 0:
+            return np.zeros(len(token_stream))
+        
+        # Per-token keyword weight (0 for non-keywords and punctuation), summed per section;
+        # the padded trailing 0 is the weight of term id -1
+        term_weights = np.append(token_stream.term_weight_vector(persona_profile['term_weights']), 0.0)
+        token_weights = term_weights[token_stream.token_terms]
+        totals = np.bincount(token_stream.section_of_token, weights=token_weights,
+                             minlength=len(token_stream))
+        
+        content_factors = np.minimum(token_stream.word_counts() / 100, 1.0)
+        return np.minimum((totals / total_weight) * content_factors, 1.0)
+    
+    def _calculate_bm25_scores_stream(self, token_stream: TokenStream,
+                                      persona_profile: Dict[str, Any],
+                                      collection_stats: CollectionStatistics) -> np.ndarray:
+        """Calculate normalized BM25 scores for every section of a token stream."""
+        scores = np.zeros(len(token_stream))
+        term_weights, max_score = self.get_bm25_query(persona_profile, collection_stats)
+        if max_score == 0 or collection_stats.avg_section_length == 0:
+            return scores
+        
+        # Query position of each local term (-1 for terms outside the query)
+        query_positions = np.full(len(token_stream.terms) + 1, -1, dtype=np.int64)
+        query_weights = np.zeros(len(term_weights))
+        for position, (term, weight) in enumerate(term_weights.items()):
+            term_id = token_stream.term_index.get(term)
+            if term_id is not None:
+                query_positions[term_id] = position
+            query_weights[position] = weight
+        
+        section_ids, term_ids, frequencies = token_stream.term_frequencies()
+        positions = query_positions[term_ids]
+        matched = positions >= 0
+        section_ids, positions, frequencies = section_ids[matched], positions[matched], frequencies[matched]
+        
+        # Accumulate in query term order within each section
+        order = np.lexsort((positions, section_ids))
+        section_ids, positions, frequencies = section_ids[order], positions[order], frequencies[order]
+        
+        k1 = self.bm25_k1
+        b = self.bm25_b
+        lengths = token_stream.term_lengths()
+        length_norms = k1 * (1 - b + b * lengths / collection_stats.avg_section_length)
+        contributions = (query_weights[positions] * frequencies * (k1 + 1)
+                         / (frequencies + length_norms[section_ids]))
+        
+        totals = np.bincount(section_ids, weights=contributions, minlength=len(token_stream))
+        return np.minimum(totals / max_score, 1.0)
+    
+    def _calculate_semantic_scores(self, sections: List[Dict[str, Any]],
+                                   persona_profile: Dict[str, Any]) -> np.ndarray:
+        """Calculate hashed TF-IDF cosine similarity scaled by the collection maximum."""
+        vectorizer = HashedTfidfVectorizer(n_features=self.hash_features)
+        texts = [f"{section.get('title', '')} {section.get('content', '')}" for section in sections]
+        
+        section_vectors = vectorizer.fit_transform(texts)
+        query_vector = vectorizer.transform([persona_profile.get('query_text', '')])[0]
+        
+        similarities = np.clip(section_vectors @ query_vector, 0.0, None)
+        max_similarity = similarities.max()
+        if max_similarity > 0:
+            similarities /= max_similarity
+        
+        return similarities
+    
+    def calculate_prior_score(self, section: Dict[str, Any],
+                              persona_profile: Dict[str, Any]) -> float:
+        """
+        Calculate the weighted title and length components of relevance.
+        
+        These are cheap to compute and independent of keyword matching, so
+        top-K retrieval uses them as a per-section prior.
+        """
+        content = section.get('content', '').lower()
+        title = section.get('title', '').lower()
+        
+        if not content:
+            return 0.0
+        
+        weights = self.relevance_weights
+        return (
+            self._calculate_title_score(title, persona_profile) * weights['title_score'] +
+            self._calculate_length_score(content) * weights['length_score']
+        )
+    
+    def context_upper_bound(self, persona_profile: Dict[str, Any]) -> float:
+        """Get the maximum weighted context component for a persona profile."""
+        max_context = 1.0 if persona_profile['priority_keywords'] else 0.5
+        return max_context * self.relevance_weights['context_score']
+    
     def _classify_persona(self, role: str) -> tuple:
         """Classify persona into domain and specific role."""
         role = role.lower()
@@ -318,18 +527,18 @@ class PersonaMatcher:
     
     def _calculate_keyword_score(self, content: str, persona_profile: Dict[str, Any]) -> float:
         """Calculate keyword-based relevance score."""
-        keyword_weights = persona_profile['keyword_weights']
-        words = content.lower().split()
+        term_weights = persona_profile['term_weights']
+        words = content.split()
         
         total_score = 0.0
-        total_weight = sum(keyword_weights.values())
+        total_weight = sum(persona_profile['keyword_weights'].values())
         
         if total_weight == 0:
             return 0.0
         
-        for word in words:
-            if word in keyword_weights:
-                total_score += keyword_weights[word]
+        for term in get_term_table().normalize_tokens(words):
+            if term in term_weights:
+                total_score += term_weights[term]
         
         # Normalize by content length and keyword weights
         content_factor = min(len(words) / 100, 1.0)  # Longer content gets slight bonus
@@ -337,18 +546,63 @@ class PersonaMatcher:
         
         return min(normalized_score, 1.0)
     
+    def _calculate_bm25_score(self, content: str, persona_profile: Dict[str, Any],
+                              collection_stats: CollectionStatistics) -> float:
+        """
+        Calculate BM25 keyword score normalized by the query's maximum attainable score.
+        
+        Each persona keyword acts as a weighted query term; the normalizer is the
+        saturated BM25 contribution of every keyword, so scores stay in 0-1 and are
+        comparable across collections.
+        """
+        terms = tokenize(content)
+        term_weights, max_score = self.get_bm25_query(persona_profile, collection_stats)
+        
+        if not terms or max_score == 0 or collection_stats.avg_section_length == 0:
+            return 0.0
+        
+        k1 = self.bm25_k1
+        length_norm = k1 * (1 - self.bm25_b + self.bm25_b * len(terms) / collection_stats.avg_section_length)
+        term_counts = Counter(terms)
+        
+        score = 0.0
+        for keyword, weight in term_weights.items():
+            tf = term_counts.get(keyword, 0)
+            if tf:
+                score += weight * tf * (k1 + 1) / (tf + length_norm)
+        
+        return min(score / max_score, 1.0)
+    
+    def get_bm25_query(self, persona_profile: Dict[str, Any],
+                       collection_stats: CollectionStatistics) -> tuple:
+        """
+        Build IDF-weighted BM25 query terms for a persona profile.
+        
+        Returns:
+            Tuple of (term -> keyword weight * idf, maximum attainable BM25 score)
+        """
+        term_weights = {}
+        max_score = 0.0
+        
+        for term, weight in persona_profile['term_weights'].items():
+            term_weight = weight * collection_stats.idf(term)
+            term_weights[term] = term_weight
+            max_score += term_weight * (self.bm25_k1 + 1)
+        
+        return term_weights, max_score
+    
     def _calculate_title_score(self, title: str, persona_profile: Dict[str, Any]) -> float:
         """Calculate title-based relevance score."""
         if not title:
             return 0.0
         
-        keyword_weights = persona_profile['keyword_weights']
-        title_words = title.lower().split()
+        term_weights = persona_profile['term_weights']
+        title_words = title.split()
         
         score = 0.0
-        for word in title_words:
-            if word in keyword_weights:
-                score += keyword_weights[word] * 2  # Title keywords weighted higher
+        for term in get_term_table().normalize_tokens(title_words):
+            if term in term_weights:
+                score += term_weights[term] * 2  # Title keywords weighted higher
         
         # Normalize by title length
         if len(title_words) > 0:
@@ -0,0 +1,194 @@
+# Result Cache Module
+# Output caching keyed by document contents, persona/job input and configuration
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever extraction, scoring or output changes so stale results are not reused
+ALGORITHM_VERSION = 3
+
+# Suffix of cache entry files
+ENTRY_SUFFIX = '.result'
+
+class ResultCache:
+    """
+    On-disk cache of finished output payloads.
+
+    Entries are keyed by the content hashes of the input documents, the
+    canonical persona/job input configuration, the algorithm version and the
+    system configuration. Each entry is a single file holding a one-line header
+    with its creation time (for TTL expiry) and the payload's metadata,
+    followed by the payload; the file's
+    modification time records its last use, so least-recently-used eviction by
+    entry count or total size needs no separate index.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: float = None,
+                 max_entries: int = None, max_bytes: int = None):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+        # Document hashes keyed by (path, size, mtime) to avoid rehashing unchanged files
+        self._document_hashes: Dict[Tuple[str, int, int], str] = {}
+
+    def make_key(self, input_dir: str, input_config: Dict[str, Any],
+                 system_config: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a collection request.
+
+        Args:
+            input_dir: Collection directory
+            input_config: Loaded input configuration (persona, job, documents)
+            system_config: Options that affect the output
+
+        Returns:
+            Hex digest identifying the request
+        """
+        digest = hashlib.sha256(f"v{ALGORITHM_VERSION}".encode('utf-8'))
+        digest.update(self._canonical_json(system_config).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(self._canonical_json(input_config).encode('utf-8'))
+
+        for document in input_config.get('documents', []):
+            name = document.get('filename', '') if isinstance(document, dict) else document
+            digest.update(b'\0')
+            digest.update(name.encode('utf-8'))
+            digest.update(b'\0')
+            digest.update(self.hash_document(str(Path(input_dir) / name)).encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def hash_document(self, path: str) -> str:
+        """Get the SHA-256 of a document's bytes ('missing' if it does not exist)."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return 'missing'
+
+        stat_key = (path, stat.st_size, stat.st_mtime_ns)
+        cached = self._document_hashes.get(stat_key)
+        if cached is not None:
+            return cached
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+
+        self._document_hashes[stat_key] = digest.hexdigest()
+        return self._document_hashes[stat_key]
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """
+        Look up a cached payload.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Tuple of (payload bytes, metadata stored with it), or None on a
+            miss or an expired entry
+        """
+        path = self._entry_path(key)
+        try:
+            header, payload = path.read_bytes().split(b'\n', 1)
+            header = json.loads(header)
+            created = header['created']
+        except (OSError, ValueError, KeyError, TypeError):
+            self.stats['misses'] += 1
+            return None
+
+        if self._is_expired(created):
+            self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+
+        self.stats['hits'] += 1
+        return payload, header.get('metadata', {})
+
+    def put(self, key: str, payload: bytes, metadata: Dict[str, Any] = None) -> bool:
+        """
+        Store a payload and evict old entries beyond the configured limits.
+
+        Args:
+            key: Cache key from make_key()
+            payload: Output file contents
+            metadata: Small JSON-serializable facts about the payload (e.g. counts),
+                returned with it by get()
+
+        Returns:
+            True if stored successfully
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix='.', suffix='.tmp', dir=str(self.cache_dir))
+            with os.fdopen(fd, 'wb') as f:
+                header = {'created': time.time(), 'metadata': metadata or {}}
+                f.write(json.dumps(header).encode('utf-8') + b'\n')
+                f.write(payload)
+            os.replace(temp_path, self._entry_path(key))
+        except Exception as e:
+            logger.warning(f"Could not store cached result {key[:12]}: {str(e)}")
+            return False
+
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        """Remove least recently used entries beyond the limits."""
+        if self.max_entries is None and self.max_bytes is None:
+            return
+
+        entries = []
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort(key=lambda entry: entry[0], reverse=True)  # Most recent first
+        kept_entries = 0
+        kept_bytes = 0
+        for _, size, path in entries:
+            over_entries = self.max_entries is not None and kept_entries >= self.max_entries
+            over_bytes = self.max_bytes is not None and kept_bytes + size > self.max_bytes
+            if over_entries or over_bytes:
+                self.stats['evictions'] += 1
+                self._remove(path)
+            else:
+                kept_entries += 1
+                kept_bytes += size
+
+    def _is_expired(self, created: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created > self.ttl_seconds
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _canonical_json(self, value: Any) -> str:
+        """Serialize with sorted keys so equivalent inputs produce the same key."""
+        return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
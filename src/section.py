@@ -0,0 +1,184 @@
+# Section Record Module
+# Compact fixed-field section records with dict-compatible access
+
+from array import array
+from typing import Dict, List, Any, Iterator, Sequence, Union
+
+# Fields readable and writable through the dict-style accessor
+SECTION_FIELDS = (
+    'title',
+    'page_number',
+    'content',
+    'extraction_method',
+    'document_name',
+    'word_count',
+    'sentence_count',
+    'char_count',
+    'avg_word_length',
+    'relevance_score',
+    'scores',
+    'final_score',
+    'importance_rank',
+)
+
+_FIELD_SET = frozenset(SECTION_FIELDS)
+
+# Score component name tuples shared by all sections scored with them
+_SCORE_NAMES: Dict[tuple, tuple] = {}
+
+class Section:
+    """
+    Fixed-field record for an extracted section.
+
+    Sections flow through every module and gain fields stage by stage, so they
+    use __slots__ instead of a per-instance dict. Unset fields behave like
+    missing dict keys, which keeps `'final_score' in section`, `section.get()`
+    and `section['title']` working for code written against plain dicts.
+
+    Content can be stored directly or as a span of a shared source: a string
+    slice, or a separator-joined slice of a shared word list. Span content is
+    materialized on access and not retained unless materialize() is called.
+    Component scores are kept as a packed double array with shared component names.
+    """
+
+    __slots__ = (
+        'title', 'page_number', 'extraction_method', 'document_name',
+        'word_count', 'sentence_count', 'char_count', 'avg_word_length',
+        'relevance_score', 'final_score', 'importance_rank',
+        '_score_names', '_score_values',
+        '_content', '_source', '_start', '_end', '_separator', '_extra'
+    )
+
+    def __init__(self, title: str, page_number: int, content: str = None,
+                 extraction_method: str = None):
+        self.title = title
+        self.page_number = page_number
+        self._content = content
+        self._source = None
+        self._extra = None
+        if extraction_method is not None:
+            self.extraction_method = extraction_method
+
+    @classmethod
+    def from_span(cls, source: Union[str, Sequence[str]], start: int, end: int,
+                  title: str, page_number: int, extraction_method: str = None,
+                  separator: str = ' ') -> 'Section':
+        """
+        Create a section whose content is a span of a shared source.
+
+        Args:
+            source: Shared text (sliced) or word list (sliced and joined)
+            start: Span start index into the source
+            end: Span end index into the source
+            title: Section title
+            page_number: Page the section starts on
+            extraction_method: Extraction method name
+            separator: Joiner used when the source is a word list
+
+        Returns:
+            Section with lazily materialized content
+        """
+        section = cls(title, page_number, None, extraction_method)
+        section._source = source
+        section._start = start
+        section._end = end
+        section._separator = separator
+        return section
+
+    @property
+    def content(self) -> str:
+        """Section text, materialized from the span source if needed."""
+        if self._content is not None:
+            return self._content
+        if self._source is None:
+            return ''
+        span = self._source[self._start:self._end]
+        return span if isinstance(span, str) else self._separator.join(span)
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self._content = value
+        self._source = None
+
+    @property
+    def scores(self) -> Dict[str, float]:
+        """Component scores as a dict (raises AttributeError if unscored)."""
+        return dict(zip(self._score_names, self._score_values.tolist()))
+
+    @scores.setter
+    def scores(self, value: Dict[str, float]) -> None:
+        names = tuple(value)
+        self._score_names = _SCORE_NAMES.setdefault(names, names)
+        self._score_values = array('d', value.values())
+
+    def materialize(self) -> str:
+        """Materialize span content and keep it on the record."""
+        if self._content is None:
+            self._content = self.content
+        return self._content
+
+    def release_content(self) -> None:
+        """Drop materialized content of a span-backed section."""
+        if self._source is not None:
+            self._content = None
+
+    # Dict-compatible access
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a field value, or default if it is unset."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        """Get the names of all set fields."""
+        keys = [key for key in SECTION_FIELDS if hasattr(self, key)]
+        if self._extra:
+            keys.extend(self._extra)
+        return keys
+
+    def items(self) -> List[tuple]:
+        """Get (name, value) pairs of all set fields."""
+        return [(key, self[key]) for key in self.keys()]
+
+    def update(self, values: Dict[str, Any]) -> None:
+        """Set several fields from a dict."""
+        for key, value in values.items():
+            self[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict with content materialized."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"Section(title={self.title!r}, page_number={self.page_number!r})"
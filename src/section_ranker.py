@@ -1,18 +1,105 @@
 # Section Ranking Module
 # Ranks extracted sections by importance and relevance
 
-import numpy as np
+from __future__ import annotations
+
 from typing import Dict, List, Any, Tuple
 import logging
 
+from .token_stream import TokenStream
+from . import tracing
+from .feature_extractor import (CompletenessFeatureExtractor, FEATURE_BITS,
+                                DETAIL_MASK, QUANTITATIVE_MASK)
+from .lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
 logger = logging.getLogger(__name__)
 
+# Supported uniqueness computation modes
+UNIQUENESS_MODES = ('auto', 'exact', 'approximate')
+
+# Tokens in more than 1/DENSE_TOKEN_RATIO of the sections are intersected densely
+DENSE_TOKEN_RATIO = 8
+
+class TokenSetCache:
+    """
+    Section token id sets built once and shared by uniqueness and diversity scoring.
+    All sets share one vocabulary, so ids are comparable across sections. Sets of
+    sections covered by a token stream are taken from its lowercased word ids.
+    """
+    
+    def __init__(self, token_stream: TokenStream = None):
+        self.token_stream = token_stream
+        self.vocabulary = dict(token_stream.lower_vocabulary) if token_stream is not None else {}
+        self._rows = {}
+    
+    def get(self, section: Dict[str, Any]) -> np.ndarray:
+        """Get the sorted unique token ids of a section's lowercased words."""
+        key = id(section)
+        row = self._rows.get(key)
+        if row is None and self.token_stream is not None:
+            stream_index = self.token_stream.index_of(section)
+            if stream_index >= 0:
+                row = self.token_stream.word_set(stream_index)
+                self._rows[key] = row
+        if row is None:
+            vocabulary = self.vocabulary
+            words = set(section.get('content', '').lower().split())
+            ids = [vocabulary.setdefault(word, len(vocabulary)) for word in words]
+            row = np.sort(np.array(ids, dtype=np.int32))
+            self._rows[key] = row
+        return row
+    
+    def build(self, sections: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Concatenate token sets of several sections into one flat array.
+        
+        Returns:
+            Tuple of (token ids of all sections, concatenated; row offsets)
+        """
+        rows = [self.get(section) for section in sections]
+        
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(row) for row in rows])
+        token_ids = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+        
+        return token_ids, offsets
+
 class SectionRanker:
     """
     Ranks document sections based on relevance, quality, and persona requirements.
     """
     
-    def __init__(self):
+    def __init__(self, uniqueness_mode: str = 'auto', approximate_threshold: int = 1000,
+                 background_samples: int = 32, random_seed: int = 0,
+                 stage_two_top_n: int = None, stage_three_top_m: int = None,
+                 top_k: int = 10, full_ranking: bool = False,
+                 mmr_lambda: float = None, max_per_document: int = None,
+                 mmr_pool_size: int = 50):
+        if uniqueness_mode not in UNIQUENESS_MODES:
+            raise ValueError(f"Unknown uniqueness mode: {uniqueness_mode}. Expected one of {UNIQUENESS_MODES}")
+        
+        self.uniqueness_mode = uniqueness_mode
+        self.approximate_threshold = approximate_threshold
+        self.background_samples = background_samples
+        self.random_seed = random_seed
+        
+        # Cascade cutoffs (None keeps every section in the stage)
+        self.stage_two_top_n = stage_two_top_n
+        self.stage_three_top_m = stage_three_top_m
+        
+        # Only the top K sections are sorted and ranked unless full ranking is requested
+        self.top_k = top_k
+        self.full_ranking = full_ranking
+        
+        # Maximal Marginal Relevance reranking (disabled when mmr_lambda is None)
+        self.mmr_lambda = mmr_lambda
+        self.max_per_document = max_per_document
+        self.mmr_pool_size = mmr_pool_size
+        self.last_stats = {}
+        self.feature_extractor = CompletenessFeatureExtractor()
+        
         self.ranking_weights = {
             'relevance_score': 0.4,      # Persona/job relevance
             'quality_score': 0.25,       # Content quality
@@ -22,58 +109,216 @@ class SectionRanker:
         }
     
     def rank_sections(self, sections: List[Dict[str, Any]], 
-                     persona_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+                     persona_profile: Dict[str, Any],
+                     full_ranking: bool = None,
+                     token_stream: TokenStream = None,
+                     uniqueness_mode: str = None) -> List[Dict[str, Any]]:
         """
         Rank sections by importance and relevance.
         
+        Ranking runs as a cascade: every section gets the cheap relevance and
+        position components, the top N also get quality and completeness, and
+        the top M of those also get uniqueness. Stage sizes are recorded in
+        last_stats. Component scores are kept in an (n_sections x n_components)
+        float32 matrix and combined with the ranking weights in one product.
+        When mmr_lambda is set, the ranked top K is chosen by Maximal Marginal
+        Relevance from a pool of the best-scoring sections.
+        
         Args:
             sections: List of extracted sections
             persona_profile: Persona matching profile
+            full_ranking: Rank every section instead of only the top K
+                (defaults to the ranker's full_ranking setting)
+            token_stream: Token stream covering the sections, reused for
+                similarity instead of re-splitting content (optional)
+            uniqueness_mode: Uniqueness computation mode for this call
+                (defaults to the ranker's uniqueness_mode setting)
             
         Returns:
-            Sorted list of sections with importance rankings
+            Top sections sorted with importance rankings, followed by the
+            remaining unranked sections (without importance_rank). Per-document
+            caps can leave fewer ranked sections than top_k.
         """
         if not sections:
+            self.last_stats = {'stages': []}
             return []
         
-        # Calculate all scoring components
-        for i, section in enumerate(sections):
-            scores = self._calculate_all_scores(section, persona_profile, sections)
-            section['scores'] = scores
-            section['final_score'] = self._calculate_final_score(scores)
+        if full_ranking is None:
+            full_ranking = self.full_ranking
+        
+        component_names = list(self.ranking_weights)
+        column = {name: index for index, name in enumerate(component_names)}
+        weights = np.array([self.ranking_weights[name] for name in component_names], dtype=np.float32)
+        scores = np.zeros((len(sections), len(component_names)), dtype=np.float32)
+        
+        # Stage one: cheap components for every section
+        with tracing.span('cascade_stage_1', 'step', sections=len(sections)):
+            scores[:, column['relevance_score']] = [section.get('relevance_score', 0.0) for section in sections]
+            scores[:, column['position_score']] = [self._calculate_position_score(section) for section in sections]
+            all_indices = np.arange(len(sections))
+            stage_two = self._select_stage(scores @ weights, all_indices, self.stage_two_top_n)
+        
+        # Stage two: quality and completeness for the top N
+        with tracing.span('cascade_stage_2', 'step', sections=len(stage_two)):
+            for i in stage_two:
+                scores[i, column['quality_score']] = self._calculate_quality_score(sections[i])
+                scores[i, column['completeness_score']] = self._calculate_completeness_score(
+                    sections[i], persona_profile
+                )
+            stage_three = self._select_stage(scores[stage_two] @ weights, stage_two, self.stage_three_top_m)
+        
+        # Stage three: uniqueness among the top M survivors
+        with tracing.span('cascade_stage_3', 'step', sections=len(stage_three)):
+            token_cache = TokenSetCache(token_stream)
+            scores[stage_three, column['uniqueness_score']] = self._compute_uniqueness_scores(
+                [sections[i] for i in stage_three], token_cache, uniqueness_mode
+            )
+        
+        # Survivors only gain components, so they always outrank pruned sections
+        final_scores = scores @ weights
+        
+        self.last_stats = {
+            'stages': [
+                {'stage': 1, 'input': len(sections), 'pruned': len(sections) - len(stage_two)},
+                {'stage': 2, 'input': len(stage_two), 'pruned': len(stage_two) - len(stage_three)},
+                {'stage': 3, 'input': len(stage_three), 'pruned': 0}
+            ]
+        }
         
-        # Sort by final score (descending)
-        ranked_sections = sorted(sections, 
-                               key=lambda x: x['final_score'], 
-                               reverse=True)
+        # Select and order only the sections that receive importance ranks
+        rank_count = len(sections) if full_ranking else min(self.top_k, len(sections))
+        if self.mmr_lambda is None:
+            top_indices = self._top_k_indices(final_scores, all_indices, rank_count)
+        else:
+            pool_size = len(sections) if full_ranking else max(self.mmr_pool_size, rank_count)
+            pool = self._top_k_indices(final_scores, all_indices, min(pool_size, len(sections)))
+            with tracing.span('mmr', 'step', pool=len(pool)):
+                top_indices = self._select_mmr(sections, pool, final_scores[pool], rank_count, token_cache)
+            self.last_stats['mmr'] = {'pool': len(pool), 'selected': len(top_indices)}
+        
+        ranked_sections = []
+        for rank, i in enumerate(top_indices):
+            section = sections[i]
+            section['scores'] = dict(zip(component_names, scores[i].tolist()))
+            section['final_score'] = float(final_scores[i])
+            section['importance_rank'] = rank + 1
+            ranked_sections.append(section)
+        
+        # Unranked tail keeps its input order
+        is_ranked = np.zeros(len(sections), dtype=bool)
+        is_ranked[top_indices] = True
+        ranked_sections.extend(sections[i] for i in np.flatnonzero(~is_ranked))
+        
+        logger.info(f"Ranked {len(top_indices)} of {len(sections)} sections")
+        return ranked_sections
+    
+    def _select_stage(self, partial_scores: np.ndarray, candidates: np.ndarray,
+                      cutoff: int) -> np.ndarray:
+        """Keep the top candidates by the weighted sum of components computed so far."""
+        if cutoff is None or cutoff >= len(candidates):
+            return candidates
         
-        # Assign importance ranks
-        for i, section in enumerate(ranked_sections):
-            section['importance_rank'] = i + 1
+        return candidates[self._top_k_indices(partial_scores, np.arange(len(candidates)), cutoff)]
+    
+    def _select_mmr(self, sections: List[Dict[str, Any]], pool: np.ndarray,
+                    relevance: np.ndarray, k: int, token_cache: TokenSetCache) -> np.ndarray:
+        """
+        Select k sections from a candidate pool by Maximal Marginal Relevance.
         
-        logger.info(f"Ranked {len(ranked_sections)} sections")
-        return ranked_sections
+        Each candidate's maximum similarity to the selected set is updated
+        incrementally after every pick (one similarity row per pick), giving
+        O(k * pool) similarity evaluations. Per-document caps are enforced.
+        
+        Args:
+            sections: All sections
+            pool: Candidate section indices, best first
+            relevance: Final scores of the pool candidates
+            k: Number of sections to select
+            token_cache: Cached token sets of the sections
+            
+        Returns:
+            Selected section indices in selection order
+        """
+        pool_sections = [sections[i] for i in pool]
+        token_ids, offsets = token_cache.build(pool_sections)
+        sizes = np.diff(offsets).astype(np.float32)
+        
+        # Binary incidence restricted to tokens seen in the pool
+        columns, token_columns = np.unique(token_ids, return_inverse=True)
+        incidence = np.zeros((len(pool), len(columns)), dtype=np.float32)
+        incidence[np.repeat(np.arange(len(pool)), np.diff(offsets)), token_columns] = 1.0
+        
+        document_names = [section.get('document_name', '') for section in pool_sections]
+        _, document_ids = np.unique(document_names, return_inverse=True)
+        document_counts = np.zeros(document_ids.max() + 1 if len(pool) else 0, dtype=np.int32)
+        
+        lam = self.mmr_lambda
+        max_similarity = np.zeros(len(pool), dtype=np.float32)
+        available = np.ones(len(pool), dtype=bool)
+        selected = []
+        
+        while len(selected) < k and available.any():
+            mmr_scores = lam * relevance - (1 - lam) * max_similarity
+            mmr_scores[~available] = -np.inf
+            pick = int(np.argmax(mmr_scores))
+            
+            selected.append(pool[pick])
+            available[pick] = False
+            
+            document_id = document_ids[pick]
+            document_counts[document_id] += 1
+            if self.max_per_document is not None and document_counts[document_id] >= self.max_per_document:
+                available[document_ids == document_id] = False
+            
+            # Jaccard similarity of the pick to every candidate
+            intersections = incidence @ incidence[pick]
+            unions = sizes + sizes[pick] - intersections
+            similarity = np.divide(intersections, unions,
+                                   out=np.zeros_like(intersections), where=unions > 0)
+            np.maximum(max_similarity, similarity, out=max_similarity)
+        
+        return np.array(selected, dtype=np.int64)
+    
+    def _top_k_indices(self, values: np.ndarray, indices: np.ndarray, k: int) -> np.ndarray:
+        """
+        Get the positions of the k largest values, sorted descending.
+        
+        Uses argpartition so only the selected k values are sorted; ties are
+        broken by position to match a stable descending sort.
+        """
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if k < len(values):
+            selected = np.argpartition(-values, k - 1)[:k]
+        else:
+            selected = np.arange(len(values))
+        
+        order = np.lexsort((indices[selected], -values[selected]))
+        return selected[order]
     
     def _calculate_all_scores(self, section: Dict[str, Any], 
                             persona_profile: Dict[str, Any],
-                            all_sections: List[Dict[str, Any]]) -> Dict[str, float]:
+                            all_sections: List[Dict[str, Any]],
+                            uniqueness_score: float = None) -> Dict[str, float]:
         """Calculate all scoring components for a section."""
+        if uniqueness_score is None:
+            uniqueness_score = self._calculate_uniqueness_score(section, all_sections)
         
         return {
             'relevance_score': section.get('relevance_score', 0.0),
             'quality_score': self._calculate_quality_score(section),
             'completeness_score': self._calculate_completeness_score(section, persona_profile),
             'position_score': self._calculate_position_score(section),
-            'uniqueness_score': self._calculate_uniqueness_score(section, all_sections)
+            'uniqueness_score': uniqueness_score
         }
     
     def _calculate_final_score(self, scores: Dict[str, float]) -> float:
         """Calculate weighted final score."""
         final_score = 0.0
         
-        for component, score in scores.items():
-            weight = self.ranking_weights.get(component, 0.0)
-            final_score += score * weight
+        for component, weight in self.ranking_weights.items():
+            if component in scores:
+                final_score += scores[component] * weight
         
         return final_score
     
@@ -109,22 +354,32 @@ class SectionRanker:
         if not content:
             return 0.0
         
-        # Check for different types of information
-        has_specific_details = self._has_specific_details(content)
-        has_actionable_info = self._has_actionable_information(content, persona_profile)
-        has_examples = self._has_examples(content)
-        has_quantitative_data = self._has_quantitative_data(content)
+        # One scan yields every completeness feature
+        mask, _ = self.feature_extractor.extract(content)
         
         # Calculate completeness
         completeness_factors = [
-            has_specific_details,
-            has_actionable_info,
-            has_examples,
-            has_quantitative_data
+            bool(mask & DETAIL_MASK),
+            bool(mask & FEATURE_BITS['actionable']),
+            bool(mask & FEATURE_BITS['example']),
+            bool(mask & QUANTITATIVE_MASK)
         ]
         
         return sum(completeness_factors) / len(completeness_factors)
     
+    def get_completeness_features(self, section: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Get completeness feature match counts for a section (diagnostics).
+        
+        Args:
+            section: Section with content
+            
+        Returns:
+            Feature name -> number of matches
+        """
+        _, counts = self.feature_extractor.extract(section.get('content', ''))
+        return self.feature_extractor.to_dict(counts)
+    
     def _calculate_position_score(self, section: Dict[str, Any]) -> float:
         """Calculate score based on section position in document."""
         page_number = section.get('page_number', 1)
@@ -141,7 +396,11 @@ class SectionRanker:
     
     def _calculate_uniqueness_score(self, section: Dict[str, Any], 
                                   all_sections: List[Dict[str, Any]]) -> float:
-        """Calculate content uniqueness score."""
+        """
+        Calculate content uniqueness score for a single section.
+        
+        Reference implementation; rank_sections uses _compute_uniqueness_scores.
+        """
         current_content = section.get('content', '').lower()
         
         if not current_content:
@@ -168,6 +427,234 @@ class SectionRanker:
         avg_similarity = np.mean(similarity_scores)
         return max(0.0, 1.0 - avg_similarity)
     
+    def _compute_uniqueness_scores(self, sections: List[Dict[str, Any]],
+                                   token_cache: TokenSetCache = None,
+                                   uniqueness_mode: str = None) -> np.ndarray:
+        """
+        Calculate uniqueness scores for all sections in bulk.
+        
+        Each section's token set is built once. Mean Jaccard similarity to every
+        other non-empty section is computed exactly with a sparse co-occurrence
+        product, or estimated from sampled partners for large collections.
+        
+        Args:
+            sections: List of extracted sections
+            token_cache: Token sets to reuse (built on demand if omitted)
+            uniqueness_mode: Mode override (defaults to the ranker's uniqueness_mode)
+            
+        Returns:
+            Uniqueness scores aligned with the input sections
+        """
+        uniqueness_scores = np.zeros(len(sections))
+        
+        nonempty = [i for i, section in enumerate(sections) if section.get('content', '')]
+        if not nonempty:
+            return uniqueness_scores
+        if len(nonempty) == 1:
+            uniqueness_scores[nonempty[0]] = 1.0
+            return uniqueness_scores
+        
+        if token_cache is None:
+            token_cache = TokenSetCache()
+        token_ids, offsets = token_cache.build([sections[i] for i in nonempty])
+        
+        if uniqueness_mode is None:
+            uniqueness_mode = self.uniqueness_mode
+        use_approximate = (
+            uniqueness_mode == 'approximate' or
+            (uniqueness_mode == 'auto' and len(nonempty) > self.approximate_threshold)
+        )
+        if use_approximate:
+            similarity_sums = self._approximate_similarity_sums(token_ids, offsets)
+        else:
+            similarity_sums = self._exact_similarity_sums(token_ids, offsets)
+        
+        avg_similarity = similarity_sums / (len(nonempty) - 1)
+        uniqueness_scores[nonempty] = np.maximum(0.0, 1.0 - avg_similarity)
+        
+        return uniqueness_scores
+    
+    def _exact_similarity_sums(self, token_ids: np.ndarray, offsets: np.ndarray,
+                               chunk_size: int = 1 << 21) -> np.ndarray:
+        """
+        Sum of exact Jaccard similarities to all other sections.
+        
+        Intersections are a sparse product of the section-token incidence
+        with its transpose: each shared token of a section is expanded into
+        the other sections containing it, so only co-occurring pairs are
+        visited. Tokens in more than 1/DENSE_TOKEN_RATIO of the sections
+        (stop words, mostly) would expand into nearly every pair, so their
+        few columns are multiplied as a dense matrix instead. Sections are
+        processed in chunks bounded by chunk_size expanded pairs and
+        accumulator cells.
+        """
+        n_rows = len(offsets) - 1
+        sizes = np.diff(offsets)
+        row_ids = np.repeat(np.arange(n_rows), sizes)
+        
+        document_frequencies = np.bincount(token_ids, minlength=1)
+        incidence, common = self._common_token_incidence(token_ids, row_ids, n_rows, document_frequencies)
+        sparse = ~common & (document_frequencies[token_ids] > 1)
+        
+        # Postings of the remaining tokens shared by two or more sections
+        sparse_rows = row_ids[sparse]
+        sparse_tokens = token_ids[sparse]
+        posting_rows = sparse_rows[np.argsort(sparse_tokens, kind='stable')]
+        posting_counts = np.bincount(sparse_tokens, minlength=len(document_frequencies))
+        posting_offsets = np.zeros(len(document_frequencies) + 1, dtype=np.int64)
+        posting_offsets[1:] = np.cumsum(posting_counts)
+        
+        # Expanded pairs per section, used to cut chunks of rows
+        expansions = posting_counts[sparse_tokens].astype(np.int64)
+        row_offsets = np.zeros(n_rows + 1, dtype=np.int64)
+        row_offsets[1:] = np.cumsum(np.bincount(sparse_rows, minlength=n_rows))
+        work = np.zeros(n_rows + 1, dtype=np.int64)
+        work[1:] = np.cumsum(np.bincount(sparse_rows, weights=expansions, minlength=n_rows)).astype(np.int64)
+        
+        # Each chunk accumulates its intersections in a dense (rows x n_rows) block
+        max_rows = max(1, chunk_size // n_rows)
+        similarity_sums = np.zeros(n_rows)
+        row = 0
+        while row < n_rows:
+            stop_row = int(np.searchsorted(work, work[row] + chunk_size, side='right')) - 1
+            stop_row = min(max(stop_row, row + 1), row + max_rows, n_rows)
+            chunk_rows = stop_row - row
+            
+            intersections = (incidence[row:stop_row] @ incidence.T).astype(np.int64)
+            start, stop = row_offsets[row], row_offsets[stop_row]
+            if start < stop:
+                counts = expansions[start:stop]
+                firsts = np.repeat(sparse_rows[start:stop] - row, counts)
+                within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                seconds = posting_rows[np.repeat(posting_offsets[sparse_tokens[start:stop]], counts) + within]
+                intersections += np.bincount(firsts * n_rows + seconds,
+                                             minlength=chunk_rows * n_rows).reshape(chunk_rows, n_rows)
+            
+            unions = sizes[row:stop_row, None] + sizes[None, :] - intersections
+            similarities = np.divide(intersections, unions, out=np.zeros(unions.shape), where=intersections > 0)
+            similarities[np.arange(chunk_rows), np.arange(row, stop_row)] = 0.0
+            similarity_sums[row:stop_row] = similarities.sum(axis=1)
+            row = stop_row
+        
+        return similarity_sums
+    
+    def _approximate_similarity_sums(self, token_ids: np.ndarray,
+                                     offsets: np.ndarray) -> np.ndarray:
+        """
+        Estimate the sum of Jaccard similarities to all other sections.
+        
+        The total intersection of a section with all others is exact and
+        cheap: the sum of its tokens' document frequencies, minus one each.
+        Similarity is intersection over union, so the total is scaled by the
+        section's ratio of summed Jaccard to summed intersection over randomly
+        sampled partners, computed exactly. Unions vary far less between
+        partners than intersections do, which keeps the ratio stable.
+        """
+        n_rows = len(offsets) - 1
+        sizes = np.diff(offsets)
+        row_ids = np.repeat(np.arange(n_rows), sizes)
+        
+        document_frequencies = np.bincount(token_ids, minlength=1)
+        intersection_totals = np.bincount(row_ids, weights=document_frequencies[token_ids] - 1,
+                                          minlength=n_rows)
+        
+        # Every other section when there are few, else random partners
+        if n_rows - 1 <= self.background_samples:
+            sample_rows = np.repeat(np.arange(n_rows), n_rows - 1)
+            partners = (sample_rows + np.tile(np.arange(1, n_rows), n_rows)) % n_rows
+        else:
+            rng = np.random.default_rng(self.random_seed)
+            sample_rows = np.repeat(np.arange(n_rows), self.background_samples)
+            partners = (sample_rows + rng.integers(1, n_rows, size=len(sample_rows))) % n_rows
+        
+        intersections = self._pair_intersections(token_ids, offsets, row_ids, sample_rows, partners)
+        unions = sizes[sample_rows] + sizes[partners] - intersections
+        similarities = np.divide(intersections, unions, out=np.zeros(len(unions)), where=unions > 0)
+        
+        sampled_similarity = np.bincount(sample_rows, weights=similarities, minlength=n_rows)
+        sampled_intersection = np.bincount(sample_rows, weights=intersections, minlength=n_rows)
+        
+        # Without sampled overlap, assume disjoint unions with an average-size partner
+        ratios = 1.0 / np.maximum(sizes + sizes.mean(), 1.0)
+        np.divide(sampled_similarity, sampled_intersection, out=ratios, where=sampled_intersection > 0)
+        
+        return intersection_totals * ratios
+    
+    def _common_token_incidence(self, token_ids: np.ndarray, row_ids: np.ndarray, n_rows: int,
+                                document_frequencies: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Dense incidence matrix of tokens in more than 1/DENSE_TOKEN_RATIO of the sections.
+        
+        Returns:
+            Tuple of (n_rows x n_common float32 incidence, mask of token
+            occurrences that are common)
+        """
+        common = document_frequencies[token_ids] * DENSE_TOKEN_RATIO > n_rows
+        common_ids = np.unique(token_ids[common])
+        column_of = np.zeros(len(document_frequencies), dtype=np.int64)
+        column_of[common_ids] = np.arange(len(common_ids))
+        incidence = np.zeros((n_rows, len(common_ids)), dtype=np.float32)
+        incidence[row_ids[common], column_of[token_ids[common]]] = 1.0
+        return incidence, common
+    
+    def _pair_intersections(self, token_ids: np.ndarray, offsets: np.ndarray,
+                            row_ids: np.ndarray, first: np.ndarray, second: np.ndarray,
+                            chunk_size: int = 1 << 21) -> np.ndarray:
+        """
+        Exact token set intersection sizes for row pairs.
+        
+        Common tokens are intersected as dot products of dense incidence
+        rows; the remaining tokens of the smaller set are looked up in the
+        sorted (row, token) keys of the larger one.
+        """
+        n_rows = len(offsets) - 1
+        document_frequencies = np.bincount(token_ids, minlength=1)
+        incidence, common = self._common_token_incidence(token_ids, row_ids, n_rows, document_frequencies)
+        
+        intersections = np.zeros(len(first))
+        pair_chunk = max(1, chunk_size // max(1, incidence.shape[1]))
+        for start in range(0, len(first), pair_chunk):
+            stop = start + pair_chunk
+            intersections[start:stop] = np.einsum('ij,ij->i', incidence[first[start:stop]],
+                                                  incidence[second[start:stop]])
+        
+        # Sets are sorted and rows ascending, so (row, token) keys are sorted
+        rare_rows = row_ids[~common]
+        rare_tokens = token_ids[~common]
+        if not len(rare_tokens):
+            return intersections
+        vocabulary_size = len(document_frequencies)
+        keys = rare_rows.astype(np.int64) * vocabulary_size + rare_tokens
+        rare_sizes = np.bincount(rare_rows, minlength=n_rows)
+        rare_offsets = np.zeros(n_rows + 1, dtype=np.int64)
+        rare_offsets[1:] = np.cumsum(rare_sizes)
+        
+        # Look up the rare tokens of the smaller set in the larger one
+        swap = rare_sizes[first] > rare_sizes[second]
+        probe_rows = np.where(swap, second, first)
+        target_rows = np.where(swap, first, second)
+        probe_counts = rare_sizes[probe_rows]
+        
+        cumulative = np.zeros(len(first) + 1, dtype=np.int64)
+        cumulative[1:] = np.cumsum(probe_counts)
+        pair = 0
+        while pair < len(first):
+            stop_pair = int(np.searchsorted(cumulative, cumulative[pair] + chunk_size, side='right')) - 1
+            stop_pair = min(max(stop_pair, pair + 1), len(first))
+            
+            counts = probe_counts[pair:stop_pair]
+            pair_of = np.repeat(np.arange(pair, stop_pair), counts)
+            within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            probes = (target_rows[pair_of].astype(np.int64) * vocabulary_size +
+                      rare_tokens[rare_offsets[probe_rows[pair_of]] + within])
+            
+            found = np.minimum(np.searchsorted(keys, probes), len(keys) - 1)
+            intersections[pair:stop_pair] += np.bincount(pair_of - pair, weights=keys[found] == probes,
+                                                          minlength=stop_pair - pair)
+            pair = stop_pair
+        
+        return intersections
+    
     def _assess_readability(self, content: str) -> float:
         """Assess text readability."""
         words = content.split()
@@ -225,56 +712,6 @@ class SectionRanker:
         quality_factors = [appropriate_length, has_meaningful_words, not_generic]
         return sum(quality_factors) / len(quality_factors)
     
-    def _has_specific_details(self, content: str) -> bool:
-        """Check if content has specific details."""
-        # Look for specific indicators
-        indicators = [
-            r'\\b\\d+%',  # Percentages
-            r'\\$\\d+',   # Money amounts
-            r'\\b\\d{4}\\b',  # Years
-            r'\\b\\d+\\s*(hours?|days?|weeks?|months?)\\b',  # Time periods
-            r'\\b(specifically|particularly|exactly|precisely)\\b'  # Specificity words
-        ]
-        
-        import re
-        return any(re.search(pattern, content, re.IGNORECASE) for pattern in indicators)
-    
-    def _has_actionable_information(self, content: str, persona_profile: Dict[str, Any]) -> bool:
-        """Check if content has actionable information for the persona."""
-        action_words = [
-            'how to', 'steps', 'process', 'method', 'approach', 'strategy',
-            'implement', 'create', 'develop', 'build', 'design', 'plan',
-            'should', 'must', 'need to', 'important to', 'recommended'
-        ]
-        
-        content_lower = content.lower()
-        return any(word in content_lower for word in action_words)
-    
-    def _has_examples(self, content: str) -> bool:
-        """Check if content contains examples."""
-        example_indicators = [
-            'for example', 'such as', 'including', 'like', 'instance',
-            'e.g.', 'i.e.', 'namely', 'case study', 'illustration'
-        ]
-        
-        content_lower = content.lower()
-        return any(indicator in content_lower for indicator in example_indicators)
-    
-    def _has_quantitative_data(self, content: str) -> bool:
-        """Check if content contains quantitative data."""
-        import re
-        
-        # Look for numbers, statistics, measurements
-        patterns = [
-            r'\\b\\d+(\\.\\d+)?%',  # Percentages
-            r'\\b\\d+(\\.\\d+)?\\s*(million|billion|thousand)',  # Large numbers
-            r'\\b\\d+(\\.\\d+)?\\s*(kg|lb|oz|g|L|ml)',  # Measurements
-            r'\\b\\d+(\\.\\d+)?\\s*degrees?',  # Temperatures
-            r'\\b\\d+(\\.\\d+)?\\s*(minutes?|hours?|days?)'  # Time
-        ]
-        
-        return any(re.search(pattern, content, re.IGNORECASE) for pattern in patterns)
-    
     def _calculate_text_similarity(self, text1: str, text2: str) -> float:
         """Calculate similarity between two texts."""
         # Simple word overlap similarity
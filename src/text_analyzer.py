@@ -1,23 +1,33 @@
 # Text Analysis Module
 # Advanced text processing and section extraction
 
+from __future__ import annotations
+
 import re
-import nltk
+import threading
 from typing import Dict, List, Any, Tuple
-import numpy as np
 from collections import Counter
 import logging
 
+from .section import Section
+from . import tracing
+from .lazy_imports import lazy_import
+
+nltk = lazy_import('nltk')
+np = lazy_import('numpy')
+
 logger = logging.getLogger(__name__)
 
+# Systems of one process load NLTK data on first use, possibly on several threads at once
+_nltk_data_lock = threading.Lock()
+
 class TextAnalyzer:
     """
     Handles text analysis, section extraction, and content processing.
     """
     
     def __init__(self):
-        self._download_nltk_data()
-        self.stop_words = set(nltk.corpus.stopwords.words('english'))
+        self._stop_words = None
         
         # Domain-specific keywords for different personas
         self.domain_keywords = {
@@ -48,43 +58,59 @@ class TextAnalyzer:
             ]
         }
     
+    @property
+    def stop_words(self) -> set:
+        """English stop words, loaded (and downloaded if missing) on first use."""
+        if self._stop_words is None:
+            self._download_nltk_data()
+            self._stop_words = set(nltk.corpus.stopwords.words('english'))
+        return self._stop_words
+    
     def _download_nltk_data(self):
-        """Download required NLTK data."""
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
+        """Download required NLTK data (once per process, even when called concurrently)."""
+        with _nltk_data_lock:
+            try:
+                nltk.data.find('tokenizers/punkt')
+                nltk.data.find('corpora/stopwords')
+            except LookupError:
+                nltk.download('punkt', quiet=True)
+                nltk.download('stopwords', quiet=True)
     
-    def extract_sections(self, doc_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def extract_sections(self, doc_content: Dict[str, Any],
+                         use_sliding_window: bool = True) -> List[Section]:
         """
         Extract meaningful sections from document content.
         
         Args:
             doc_content: Document content with pages and text
+            use_sliding_window: Fall back to sliding windows for documents
+                with few header or paragraph sections
             
         Returns:
-            List of extracted sections with metadata
+            List of extracted Section records with metadata
         """
         sections = []
         
         # Method 1: Header-based extraction
-        header_sections = self._extract_by_headers(doc_content)
+        with tracing.span('header_sections', 'step'):
+            header_sections = self._extract_by_headers(doc_content)
         sections.extend(header_sections)
         
         # Method 2: Paragraph-based extraction for documents without clear headers
         if len(header_sections) < 3:
-            paragraph_sections = self._extract_by_paragraphs(doc_content)
+            with tracing.span('paragraph_sections', 'step'):
+                paragraph_sections = self._extract_by_paragraphs(doc_content)
             sections.extend(paragraph_sections)
         
         # Method 3: Sliding window approach for continuous text
-        if len(sections) < 5:
-            window_sections = self._extract_by_sliding_window(doc_content)
+        if len(sections) < 5 and use_sliding_window:
+            with tracing.span('window_sections', 'step'):
+                window_sections = self._extract_by_sliding_window(doc_content)
             sections.extend(window_sections)
         
         # Remove duplicates and merge similar sections
-        sections = self._deduplicate_sections(sections)
+        with tracing.span('deduplicate', 'step', sections=len(sections)):
+            sections = self._deduplicate_sections(sections)
         
         # Add text statistics
         for section in sections:
@@ -92,36 +118,46 @@ class TextAnalyzer:
         
         return sections
     
-    def _extract_by_headers(self, doc_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _extract_by_headers(self, doc_content: Dict[str, Any]) -> List[Section]:
         """Extract sections using document headers."""
         sections = []
         current_section = None
+        content_parts = []
+        
+        def close_section():
+            # Content is joined once per section instead of grown by concatenation
+            if current_section is not None:
+                current_section.content = ''.join(content_parts)
+                if current_section.content.strip():
+                    sections.append(current_section)
         
         for page in doc_content['pages']:
             page_num = page['page_number']
             
+            # Text documents arrive with their markdown sections already parsed
+            if 'sections' in page:
+                for text_section in page['sections']:
+                    close_section()
+                    current_section = Section(text_section['title'], page_num, '', 'header_based')
+                    content_parts = [text_section['content']]
+            
             # Look for headers in structured content
-            if 'structured_content' in page:
+            elif 'structured_content' in page:
                 headers = page['structured_content'].get('headers', [])
                 
                 for header in headers:
                     # Save previous section
-                    if current_section and current_section['content'].strip():
-                        sections.append(current_section)
+                    close_section()
                     
                     # Start new section
-                    current_section = {
-                        'title': header['text'],
-                        'page_number': page_num,
-                        'content': '',
-                        'extraction_method': 'header_based'
-                    }
+                    current_section = Section(header['text'], page_num, '', 'header_based')
+                    content_parts = []
                 
                 # Add paragraphs to current section
-                if current_section:
+                if current_section is not None:
                     paragraphs = page['structured_content'].get('paragraphs', [])
                     for paragraph in paragraphs:
-                        current_section['content'] += paragraph['text'] + "\\n\\n"
+                        content_parts.append(paragraph['text'] + "\\n\\n")
             
             # Fallback: extract from raw text
             else:
@@ -129,25 +165,19 @@ class TextAnalyzer:
                 for line in text_lines:
                     line = line.strip()
                     if self._is_likely_header(line):
-                        if current_section and current_section['content'].strip():
-                            sections.append(current_section)
+                        close_section()
                         
-                        current_section = {
-                            'title': line,
-                            'page_number': page_num,
-                            'content': '',
-                            'extraction_method': 'header_based'
-                        }
-                    elif current_section and line:
-                        current_section['content'] += line + "\\n"
+                        current_section = Section(line, page_num, '', 'header_based')
+                        content_parts = []
+                    elif current_section is not None and line:
+                        content_parts.append(line + "\\n")
         
         # Add final section
-        if current_section and current_section['content'].strip():
-            sections.append(current_section)
+        close_section()
         
         return sections
     
-    def _extract_by_paragraphs(self, doc_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _extract_by_paragraphs(self, doc_content: Dict[str, Any]) -> List[Section]:
         """Extract sections by grouping paragraphs."""
         sections = []
         
@@ -168,16 +198,11 @@ class TextAnalyzer:
                     first_sentence = re.split(r'[.!?]', content)[0]
                     title = self._generate_section_title(first_sentence)
                     
-                    sections.append({
-                        'title': title,
-                        'page_number': page_num,
-                        'content': content,
-                        'extraction_method': 'paragraph_based'
-                    })
+                    sections.append(Section(title, page_num, content, 'paragraph_based'))
         
         return sections
     
-    def _extract_by_sliding_window(self, doc_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _extract_by_sliding_window(self, doc_content: Dict[str, Any]) -> List[Section]:
         """Extract sections using sliding window approach."""
         sections = []
         window_size = 250  # words per section
@@ -199,12 +224,10 @@ class TextAnalyzer:
             # Generate title
             title = self._generate_section_title(content[:100])
             
-            sections.append({
-                'title': title,
-                'page_number': page_num,
-                'content': content,
-                'extraction_method': 'sliding_window'
-            })
+            # Windows overlap, so they share the word list instead of owning copies
+            sections.append(Section.from_span(
+                words, i, i + window_size, title, page_num, 'sliding_window'
+            ))
         
         return sections
     
@@ -258,7 +281,7 @@ class TextAnalyzer:
         
         return 1  # Default to first page
     
-    def _deduplicate_sections(self, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _deduplicate_sections(self, sections: List[Section]) -> List[Section]:
         """Remove duplicate or very similar sections."""
         if not sections:
             return sections
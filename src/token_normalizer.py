@@ -0,0 +1,121 @@
+# Token Normalization Module
+# Punctuation stripping, case folding and light stemming with a memoized term table
+
+import re
+import threading
+from typing import Dict, List, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+EDGE_PUNCTUATION = re.compile(r'^\W+|\W+$')
+VOWELS = set('aeiouy')
+
+
+def light_stem(word: str) -> str:
+    """
+    Reduce a case-folded word to a light stem.
+
+    Handles plurals, -ing/-ed endings and a trailing silent 'e', so that e.g.
+    'planning', 'planned' and 'plans' all map to 'plan'.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+
+    if word.endswith('ies') and len(word) > 4:
+        word = word[:-3] + 'y'
+    elif word.endswith('sses'):
+        word = word[:-2]
+    elif word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            stem = word[:-len(suffix)]
+            if not any(char in VOWELS for char in stem):
+                break
+            # Undo consonant doubling (planning -> plann -> plan)
+            if len(stem) > 3 and stem[-1] == stem[-2] and stem[-1] not in VOWELS and stem[-1] not in 'lsz':
+                stem = stem[:-1]
+            word = stem
+            break
+
+    if word.endswith('e') and len(word) > 3:
+        word = word[:-1]
+
+    return word
+
+
+def normalize_token(token: str) -> str:
+    """Strip edge punctuation, case-fold and lightly stem a raw token."""
+    token = EDGE_PUNCTUATION.sub('', token.casefold())
+    return light_stem(token) if token else ''
+
+
+class TermTable:
+    """
+    Memoized mapping from surface tokens to normalized terms.
+
+    A single table is shared across sections and documents, so each distinct
+    surface form is normalized only once per process. The table holds at most
+    `max_surfaces` forms: a long-running service sees an open-ended
+    vocabulary, so once full the memo starts over instead of growing.
+    """
+
+    def __init__(self, max_surfaces: int = 200000):
+        self.max_surfaces = max_surfaces
+        self.stats = {'resets': 0}
+        self._surface_terms: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._surface_terms)
+
+    def normalize(self, token: str) -> str:
+        """Get the normalized term string for a surface token."""
+        term = self._surface_terms.get(token)
+        if term is None:
+            term = self._add_surface(token)
+        return term
+
+    def normalize_tokens(self, tokens: Iterable[str]) -> List[str]:
+        """Normalize surface tokens, dropping tokens that are pure punctuation."""
+        surface_terms = self._surface_terms
+        normalized = []
+
+        for token in tokens:
+            term = surface_terms.get(token)
+            if term is None:
+                term = self._add_surface(token)
+            if term:
+                normalized.append(term)
+
+        return normalized
+
+    def clear(self) -> None:
+        """Drop all memoized surface forms."""
+        with self._lock:
+            # Replaced rather than cleared, so concurrent readers keep a consistent dict
+            self._surface_terms = {}
+
+    def _add_surface(self, token: str) -> str:
+        """Normalize a new surface form and register it."""
+        term = normalize_token(token)
+
+        with self._lock:
+            if len(self._surface_terms) >= self.max_surfaces:
+                logger.debug(f"Term table reached {self.max_surfaces} surface forms, starting over")
+                self._surface_terms = {}
+                self.stats['resets'] += 1
+            self._surface_terms[token] = term
+
+        return term
+
+
+# Process-wide table shared by all components
+_term_table = TermTable()
+
+
+def get_term_table() -> TermTable:
+    """Get the process-wide term table."""
+    return _term_table
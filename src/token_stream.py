@@ -0,0 +1,146 @@
+# Token Stream Module
+# Per-collection integer token vocabulary with array-backed section token streams
+
+from __future__ import annotations
+
+from typing import Dict, List, Any, Tuple
+import logging
+
+from .token_normalizer import get_term_table
+from .lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+class TokenStream:
+    """
+    Whitespace tokens of every section interned into int32 ids and stored in
+    one shared array, with per-section offsets.
+
+    Each surface token id maps to a collection-local normalized term id
+    (term_of, -1 for pure punctuation) and to a lowercased word id (lower_of),
+    so keyword weights, term counts and word-set similarity run as array
+    operations instead of repeated string splitting and hashing.
+    """
+
+    def __init__(self, tokens: np.ndarray, offsets: np.ndarray, term_of: np.ndarray,
+                 terms: List[str], lower_of: np.ndarray, lower_vocabulary: Dict[str, int],
+                 section_keys: Dict[int, int]):
+        self.tokens = tokens
+        self.offsets = offsets
+        self.term_of = term_of
+        self.terms = terms
+        self.term_index = {term: term_id for term_id, term in enumerate(terms)}
+        self.lower_of = lower_of
+        self.lower_vocabulary = lower_vocabulary
+        self._section_keys = section_keys
+
+        # Derived arrays shared by the batch scorers
+        self.section_of_token = np.repeat(np.arange(len(offsets) - 1, dtype=np.int32),
+                                          np.diff(offsets))
+        self.token_terms = term_of[tokens] if len(tokens) else np.zeros(0, dtype=np.int32)
+
+    @classmethod
+    def build(cls, sections: List[Dict[str, Any]]) -> 'TokenStream':
+        """
+        Tokenize sections into a shared token id array.
+
+        Args:
+            sections: Extracted sections with content
+
+        Returns:
+            Token stream aligned with the section list order
+        """
+        vocabulary = {}
+        ids = []
+        offsets = np.zeros(len(sections) + 1, dtype=np.int64)
+
+        for index, section in enumerate(sections):
+            for token in section.get('content', '').split():
+                ids.append(vocabulary.setdefault(token, len(vocabulary)))
+            offsets[index + 1] = len(ids)
+
+        tokens = np.array(ids, dtype=np.int32)
+
+        # Map surface forms to collection-local normalized terms and lowercased words
+        term_table = get_term_table()
+        terms = []
+        term_index = {}
+        term_of = np.full(len(vocabulary), -1, dtype=np.int32)
+        lower_vocabulary = {}
+        lower_of = np.zeros(len(vocabulary), dtype=np.int32)
+
+        for token, surface_id in vocabulary.items():
+            term = term_table.normalize(token)
+            if term:
+                term_of[surface_id] = term_index.setdefault(term, len(terms))
+                if len(term_index) > len(terms):
+                    terms.append(term)
+            lower_of[surface_id] = lower_vocabulary.setdefault(token.lower(), len(lower_vocabulary))
+
+        section_keys = {id(section): index for index, section in enumerate(sections)}
+
+        logger.debug(f"Token stream: {len(tokens)} tokens, {len(vocabulary)} surface forms, "
+                     f"{len(terms)} terms")
+
+        return cls(tokens, offsets, term_of, terms, lower_of, lower_vocabulary, section_keys)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def index_of(self, section: Dict[str, Any]) -> int:
+        """Get a section's position in the stream, or -1 if it was not tokenized here."""
+        return self._section_keys.get(id(section), -1)
+
+    def section_tokens(self, index: int) -> np.ndarray:
+        """Get the surface token ids of a section (a view of the shared array)."""
+        return self.tokens[self.offsets[index]:self.offsets[index + 1]]
+
+    def section_terms(self, index: int) -> np.ndarray:
+        """Get the normalized term ids of a section, punctuation dropped."""
+        terms = self.token_terms[self.offsets[index]:self.offsets[index + 1]]
+        return terms[terms >= 0]
+
+    def word_set(self, index: int) -> np.ndarray:
+        """Get the sorted unique lowercased word ids of a section."""
+        return np.unique(self.lower_of[self.section_tokens(index)])
+
+    def word_counts(self) -> np.ndarray:
+        """Get the whitespace token count of every section."""
+        return np.diff(self.offsets)
+
+    def term_lengths(self) -> np.ndarray:
+        """Get the normalized term count of every section."""
+        return np.bincount(self.section_of_token[self.token_terms >= 0],
+                           minlength=len(self)).astype(np.int32)
+
+    def term_weight_vector(self, term_weights: Dict[str, float]) -> np.ndarray:
+        """Get a dense weight per local term id (0 for terms not in the query)."""
+        weights = np.zeros(len(self.terms), dtype=np.float64)
+        for term, weight in term_weights.items():
+            term_id = self.term_index.get(term)
+            if term_id is not None:
+                weights[term_id] = weight
+        return weights
+
+    def term_frequencies(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Count every (section, term) occurrence.
+
+        Returns:
+            Tuple of (section ids, term ids, frequencies) sorted by section, then term
+        """
+        valid = self.token_terms >= 0
+        n_terms = max(len(self.terms), 1)
+        keys = self.section_of_token[valid].astype(np.int64) * n_terms + self.token_terms[valid]
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        return ((unique_keys // n_terms).astype(np.int32),
+                (unique_keys % n_terms).astype(np.int32),
+                counts.astype(np.int32))
+
+    def document_frequencies(self) -> Dict[str, int]:
+        """Get the number of sections containing each normalized term."""
+        _, term_ids, _ = self.term_frequencies()
+        frequencies = np.bincount(term_ids, minlength=len(self.terms))
+        return {term: int(frequencies[term_id]) for term_id, term in enumerate(self.terms)}
@@ -0,0 +1,199 @@
+# Top-K Retrieval Module
+# Early-terminating MaxScore retrieval of the most relevant sections
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Any, Tuple
+import logging
+
+from .collection_stats import CollectionStatistics, InvertedIndex
+from .persona_matcher import PersonaMatcher
+from .lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+# Slack added to upper bounds to absorb floating point rounding
+BOUND_EPSILON = 1e-9
+
+class MaxScoreRetriever:
+    """
+    Retrieves the top-K sections by persona relevance without fully scoring the tail.
+
+    Query terms are ordered by their BM25 upper bound. Terms whose combined bound
+    cannot lift a section above the current K-th score become non-essential, and
+    sections reachable only through non-essential terms are never fully scored.
+    """
+
+    def __init__(self, persona_matcher: PersonaMatcher):
+        self.persona_matcher = persona_matcher
+        self.last_stats = {}
+
+    def retrieve(self, sections: List[Dict[str, Any]],
+                 persona_profile: Dict[str, Any],
+                 collection_stats: CollectionStatistics,
+                 index: InvertedIndex, k: int) -> List[Tuple[int, float]]:
+        """
+        Find the K sections with the highest relevance scores.
+
+        Args:
+            sections: Extracted sections, aligned with the inverted index
+            persona_profile: Persona matching profile
+            collection_stats: Collection statistics for BM25 scoring
+            index: Inverted index over the same sections
+            k: Number of sections to retrieve
+
+        Returns:
+            List of (section index, relevance score) sorted by score (descending)
+        """
+        n_sections = len(sections)
+        if n_sections == 0 or k <= 0:
+            self.last_stats = {'sections': n_sections, 'fully_scored': 0, 'skipped': n_sections}
+            return []
+
+        matcher = self.persona_matcher
+        priors = np.array([matcher.calculate_prior_score(section, persona_profile)
+                           for section in sections])
+        static_bounds = priors + matcher.context_upper_bound(persona_profile)
+
+        term_ids, term_contributions, term_bounds = self._build_query_postings(
+            persona_profile, collection_stats, index
+        )
+        n_terms = len(term_ids)
+        cumulative_bounds = np.cumsum(term_bounds) if n_terms else np.zeros(0)
+        max_static = float(static_bounds.max())
+
+        top = []  # min-heap of (score, section index)
+        threshold = -1.0
+        non_essential = 0
+        non_essential_bound = 0.0
+        visited = np.zeros(n_sections, dtype=bool)
+        fully_scored = 0
+
+        def score_section(section_index: int) -> None:
+            nonlocal threshold, non_essential, non_essential_bound, fully_scored
+
+            score = matcher.calculate_relevance(
+                sections[section_index], persona_profile, collection_stats
+            )
+            fully_scored += 1
+
+            if len(top) < k:
+                heapq.heappush(top, (score, section_index))
+            elif score > top[0][0]:
+                heapq.heapreplace(top, (score, section_index))
+
+            if len(top) == k:
+                threshold = top[0][0]
+                # Promote low-bound terms to non-essential as the threshold rises
+                while (non_essential < n_terms and
+                       cumulative_bounds[non_essential] + max_static <= threshold):
+                    non_essential += 1
+                non_essential_bound = float(cumulative_bounds[non_essential - 1]) if non_essential else 0.0
+
+        # Document-at-a-time traversal over essential posting lists
+        positions = [0] * n_terms
+        cursor_heap = [(int(term_ids[j][0]), j) for j in range(n_terms)]
+        heapq.heapify(cursor_heap)
+
+        while cursor_heap:
+            section_index = cursor_heap[0][0]
+            partial_score = 0.0
+            has_essential = False
+
+            while cursor_heap and cursor_heap[0][0] == section_index:
+                _, j = heapq.heappop(cursor_heap)
+                if j < non_essential:
+                    continue  # Dropped: term became non-essential
+
+                partial_score += term_contributions[j][positions[j]]
+                has_essential = True
+                positions[j] += 1
+                if positions[j] < len(term_ids[j]):
+                    heapq.heappush(cursor_heap, (int(term_ids[j][positions[j]]), j))
+
+            if not has_essential:
+                continue
+
+            visited[section_index] = True
+            bound = static_bounds[section_index] + partial_score + non_essential_bound
+            if len(top) == k and bound + BOUND_EPSILON <= threshold:
+                continue
+
+            # Refine the bound with non-essential terms, highest bound first
+            pruned = False
+            for j in range(non_essential - 1, -1, -1):
+                remaining_bound = float(cumulative_bounds[j - 1]) if j > 0 else 0.0
+                position = np.searchsorted(term_ids[j], section_index)
+                if position < len(term_ids[j]) and term_ids[j][position] == section_index:
+                    partial_score += term_contributions[j][position]
+
+                bound = static_bounds[section_index] + partial_score + remaining_bound
+                if len(top) == k and bound + BOUND_EPSILON <= threshold:
+                    pruned = True
+                    break
+
+            if not pruned:
+                score_section(section_index)
+
+        # Sections never reached can only contain non-essential terms
+        unvisited = np.flatnonzero(~visited)
+        for section_index in unvisited[np.argsort(-static_bounds[unvisited], kind='stable')]:
+            bound = static_bounds[section_index] + non_essential_bound
+            if len(top) == k and bound + BOUND_EPSILON <= threshold:
+                break
+            score_section(int(section_index))
+
+        results = sorted(((index_, score) for score, index_ in top),
+                         key=lambda item: (-item[1], item[0]))
+
+        self.last_stats = {
+            'sections': n_sections,
+            'fully_scored': fully_scored,
+            'skipped': n_sections - fully_scored
+        }
+        logger.info(f"Top-{k} retrieval fully scored {fully_scored} of {n_sections} sections")
+
+        return results
+
+    def _build_query_postings(self, persona_profile: Dict[str, Any],
+                              collection_stats: CollectionStatistics,
+                              index: InvertedIndex) -> Tuple[List[np.ndarray], List[np.ndarray], np.ndarray]:
+        """
+        Precompute weighted BM25 contributions for each query term's postings.
+
+        Returns:
+            Posting section indices, weighted contributions and per-term upper
+            bounds, ordered by ascending upper bound
+        """
+        matcher = self.persona_matcher
+        term_weights, max_score = matcher.get_bm25_query(persona_profile, collection_stats)
+
+        if max_score == 0 or collection_stats.avg_section_length == 0:
+            return [], [], np.zeros(0)
+
+        k1 = matcher.bm25_k1
+        b = matcher.bm25_b
+        component_weight = matcher.relevance_weights['keyword_score']
+
+        query_postings = []
+        for term, term_weight in term_weights.items():
+            ids, counts = index.get_postings(term)
+            if len(ids) == 0 or term_weight <= 0:
+                continue
+
+            lengths = index.section_lengths[ids]
+            length_norm = k1 * (1 - b + b * lengths / collection_stats.avg_section_length)
+            contributions = (component_weight * term_weight * counts * (k1 + 1)
+                             / (counts + length_norm) / max_score)
+            query_postings.append((float(contributions.max()), ids, contributions))
+
+        query_postings.sort(key=lambda item: item[0])
+
+        term_ids = [ids for _, ids, _ in query_postings]
+        term_contributions = [contributions for _, _, contributions in query_postings]
+        term_bounds = np.array([bound for bound, _, _ in query_postings])
+
+        return term_ids, term_contributions, term_bounds
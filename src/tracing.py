@@ -0,0 +1,175 @@
+# Tracing Module
+# Optional span tracing exported in the Chrome trace-event format (Perfetto, chrome://tracing)
+
+import os
+import json
+import time
+import cProfile
+import threading
+import contextlib
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Events kept before new spans are dropped (a long-running service keeps one tracer)
+MAX_EVENTS = 1_000_000
+
+# Category of the top-level processing stages, the only spans that are profiled
+STAGE = 'stage'
+
+# Process-wide tracer; None when tracing is off
+_tracer = None
+_tracer_lock = threading.Lock()
+
+# Returned by span() while tracing is off
+_NO_SPAN = contextlib.nullcontext()
+
+class Tracer:
+    """
+    Records timed spans as Chrome trace "complete" events.
+
+    Spans nest naturally per thread, so pipelined stages appear on their own
+    worker-thread tracks. With profiling enabled, each stage span also runs
+    under a cProfile profiler (one accumulated profile per stage name, main
+    thread only) written next to the trace as <trace>.<stage>.prof.
+    """
+
+    def __init__(self, trace_path: str, profile: bool = False):
+        self.trace_path = Path(trace_path)
+        self.profile = profile
+        self.dropped_events = 0
+        self._events: List[Dict[str, Any]] = []
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._profiling = False
+        self._thread_names: Dict[int, str] = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = STAGE, **args: Any):
+        """Record the enclosed block as a span with optional arguments."""
+        profiler = self._start_profile(name) if category == STAGE and self.profile else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+            self._add_event(name, category, start, end, args)
+
+    def save(self) -> bool:
+        """Write the trace file (and stage profiles) with everything recorded so far."""
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+            profiles = dict(self._profiles)
+
+        pid = os.getpid()
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                     'args': {'name': 'document-intelligence'}}]
+        metadata.extend({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                         'args': {'name': thread_name}}
+                        for tid, thread_name in thread_names.items())
+
+        try:
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.trace_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'traceEvents': metadata + events,
+                    'displayTimeUnit': 'ms',
+                    'otherData': {'dropped_events': self.dropped_events}
+                }, f)
+
+            for stage_name, profiler in profiles.items():
+                profiler.dump_stats(str(self.trace_path.with_suffix(f".{stage_name}.prof")))
+        except Exception as e:
+            logger.warning(f"Could not save trace: {str(e)}")
+            return False
+
+        logger.info(f"Trace saved to: {self.trace_path} ({len(events)} events)")
+        return True
+
+    def _start_profile(self, name: str) -> Optional[cProfile.Profile]:
+        """Enable the stage's profiler unless another stage is already profiled."""
+        if self._profiling or threading.current_thread() is not threading.main_thread():
+            return None
+
+        profiler = self._profiles.setdefault(name, cProfile.Profile())
+        try:
+            profiler.enable()
+        except ValueError:
+            return None  # Another profiler (e.g. an external one) is active
+        self._profiling = True
+        return profiler
+
+    def _add_event(self, name: str, category: str, start: float, end: float,
+                   args: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self._origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': os.getpid(),
+            'tid': thread.ident
+        }
+        if args:
+            event['args'] = args
+
+        with self._lock:
+            if len(self._events) >= MAX_EVENTS:
+                self.dropped_events += 1
+                return
+            self._events.append(event)
+            self._thread_names.setdefault(thread.ident, thread.name)
+
+def enable(trace_path: str, profile: bool = False) -> Tracer:
+    """
+    Turn on process-wide tracing.
+
+    Args:
+        trace_path: Chrome trace JSON file to write
+        profile: Also capture a cProfile profile per stage
+
+    Returns:
+        The active tracer (the existing one if tracing is already on)
+    """
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer(trace_path, profile)
+        elif Path(trace_path) != _tracer.trace_path:
+            logger.warning(f"Tracing already enabled, keeping {_tracer.trace_path}")
+        return _tracer
+
+def disable() -> None:
+    """Turn off tracing, discarding unsaved events."""
+    global _tracer
+    with _tracer_lock:
+        _tracer = None
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the active tracer, or None when tracing is off."""
+    return _tracer
+
+def span(name: str, category: str = STAGE, **args: Any):
+    """
+    Context manager tracing a block; a shared no-op when tracing is off.
+
+    Args:
+        name: Span name
+        category: Span category ('stage', 'document', 'pages', ...)
+        **args: Values shown with the span in the trace viewer
+
+    Returns:
+        Context manager for the traced block
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name, category, **args)
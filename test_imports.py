@@ -0,0 +1,97 @@
+# Import Time Test for Document Intelligence System
+# Guards CLI startup latency by measuring `import main` with -X importtime
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+# Cumulative import time budget for `import main` (override with IMPORT_TIME_BUDGET_MS)
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', 400))
+
+# Libraries that must only load on first use
+HEAVY_MODULES = ('numpy', 'fitz', 'pymupdf', 'nltk')
+
+def measure_import(statement: str):
+    """
+    Run a statement in a fresh interpreter with -X importtime.
+
+    Returns:
+        Tuple of (cumulative microseconds per imported module, modules loaded
+        after the statement)
+    """
+    code = f"{statement}\nimport sys\nprint(','.join(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=str(Path(__file__).parent), capture_output=True, text=True, check=True
+    )
+
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time: self [us] | cumulative | imported package"
+        _, cumulative, name = line.split('|')
+        import_times[name.strip()] = int(cumulative)
+
+    loaded = set(result.stdout.strip().split(','))
+    return import_times, loaded
+
+def test_import_time():
+    """`import main` stays within the startup budget and loads no heavy library."""
+    import_times, loaded = measure_import("import main")
+
+    main_ms = import_times['main'] / 1000
+    print(f"✓ import main: {main_ms:.1f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)")
+    assert main_ms <= IMPORT_TIME_BUDGET_MS, (
+        f"import main took {main_ms:.1f} ms, over the {IMPORT_TIME_BUDGET_MS:.0f} ms budget"
+    )
+
+    eager = [name for name in HEAVY_MODULES if name in loaded]
+    assert not eager, f"Heavy modules imported at startup: {eager}"
+    print(f"✓ Not imported at startup: {', '.join(HEAVY_MODULES)}")
+
+def test_system_construction_is_lazy():
+    """Constructing the system does not load heavy libraries either."""
+    _, loaded = measure_import("import main\nmain.DocumentIntelligenceSystem()")
+
+    eager = [name for name in HEAVY_MODULES if name in loaded]
+    assert not eager, f"Heavy modules imported by DocumentIntelligenceSystem(): {eager}"
+    print("✓ System construction loads no heavy library")
+
+def test_text_documents_skip_pymupdf():
+    """Text documents are read directly, without loading PyMuPDF."""
+    text_document = next((Path(__file__).parent / 'input').glob('*.pdf.txt'))
+    _, loaded = measure_import(
+        "from src.pdf_processor import PDFProcessor\n"
+        "processor = PDFProcessor()\n"
+        f"assert processor.extract_text({str(text_document)!r})['full_text']\n"
+        f"assert processor.extract_signature({str(text_document)!r})['text']"
+    )
+
+    eager = [name for name in ('fitz', 'pymupdf') if name in loaded]
+    assert not eager, f"Extracting {text_document.name} imported: {eager}"
+    print("✓ Text documents do not load PyMuPDF")
+
+def test_warm_up_loads_libraries():
+    """warm_up() imports the lazily loaded libraries for long-running processes."""
+    _, loaded = measure_import("import main\nmain.DocumentIntelligenceSystem().warm_up()")
+
+    missing = [name for name in ('numpy', 'nltk') if name not in loaded]
+    assert not missing, f"Not imported by warm_up(): {missing}"
+    print("✓ warm_up() loads heavy libraries")
+
+def main():
+    """Main test function."""
+    try:
+        test_import_time()
+        test_system_construction_is_lazy()
+        test_text_documents_skip_pymupdf()
+        test_warm_up_loads_libraries()
+        print("\n🎉 Import time tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Memory Monitor Test for Document Intelligence System
+# Checks that monitors of concurrently running systems share allocation tracing
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from src.memory_monitor import MemoryMonitor
+
+def test_shared_tracing():
+    """One monitor stopping does not end tracing inside another monitor's stage."""
+    assert not tracemalloc.is_tracing()
+    first = MemoryMonitor(trace_allocations=True)
+    second = MemoryMonitor(trace_allocations=True)
+    first.start()
+    second.start()
+
+    with second.stage('rank'):
+        first.stop()
+        assert tracemalloc.is_tracing(), "Tracing stopped while another monitor uses it"
+        data = [bytearray(1024) for _ in range(1000)]
+
+    record = second.stages['rank']
+    assert record['traced_peak_mb'] > 0.5 and record['top_allocators']
+    assert record['net_allocated_mb'] > 0.5
+    del data
+
+    second.stop()
+    assert not tracemalloc.is_tracing(), "Tracing left running after the last monitor stopped"
+    print("✓ Allocation tracing is shared between monitors")
+
+def test_tracing_stopped_elsewhere():
+    """A stage survives tracing being stopped outside the monitors."""
+    monitor = MemoryMonitor(trace_allocations=True)
+    monitor.start()
+    with monitor.stage('extract'):
+        tracemalloc.stop()
+    monitor.stop()
+
+    record = monitor.stages['extract']
+    assert record['calls'] == 1 and 'traced_peak_mb' not in record
+    assert not tracemalloc.is_tracing()
+    print("✓ Stages tolerate tracing stopped elsewhere")
+
+def test_external_tracing_kept():
+    """Tracing started outside the monitors keeps running after they stop."""
+    tracemalloc.start()
+    try:
+        monitor = MemoryMonitor(trace_allocations=True)
+        monitor.start()
+        with monitor.stage('score'):
+            pass
+        monitor.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    print("✓ Externally started tracing is left running")
+
+def main():
+    """Main test function."""
+    try:
+        test_shared_tracing()
+        test_tracing_stopped_elsewhere()
+        test_external_tracing_kept()
+        print("\n🎉 Memory monitor tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Memory monitor test failed: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Ranking Test for Document Intelligence System
+# Checks MMR per-document caps and importance rank uniqueness in the output
+
+import sys
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from main import DocumentIntelligenceSystem
+
+INPUT_DIR = Path(__file__).parent / 'input'
+
+def create_collection(temp_dir: str) -> Path:
+    """Copy the bundled travel documents with a dict-form job description."""
+    input_dir = Path(temp_dir) / "input"
+    input_dir.mkdir()
+    for document in INPUT_DIR.glob('*.pdf.txt'):
+        shutil.copy(document, input_dir / document.name)
+
+    test_input = {
+        "persona": {"role": "Travel Planner", "focus": "Group Travel for Young Adults"},
+        "job_to_be_done": {"task": "Plan a trip of 4 days for a group of 10 college friends."}
+    }
+    with open(input_dir / "persona.json", 'w') as f:
+        json.dump(test_input, f, indent=2)
+    return input_dir
+
+def run_system(input_dir: Path, output_dir: Path, **options) -> dict:
+    """Process a collection and load its output."""
+    result = DocumentIntelligenceSystem(**options).process_collection(str(input_dir), str(output_dir))
+    assert result['status'] == 'success', result.get('error')
+    with open(result['output_path'], 'r') as f:
+        return json.load(f)
+
+def check_ranks(output: dict, max_per_document: int = None) -> None:
+    """Ranks are 1..N without repeats, caps hold, and refinement covers ranked sections only."""
+    sections = output['extracted_sections']
+    ranks = [section['importance_rank'] for section in sections]
+    assert ranks == list(range(1, len(sections) + 1)), f"Importance ranks not unique and consecutive: {ranks}"
+
+    if max_per_document is not None:
+        documents = [section['document'] for section in sections]
+        for document in set(documents):
+            assert documents.count(document) <= max_per_document, \
+                f"{document} appears {documents.count(document)} times (cap {max_per_document})"
+
+    ranked_documents = {section['document'] for section in sections}
+    refined_documents = {subsection['document'] for subsection in output['subsection_analysis']}
+    assert refined_documents <= ranked_documents, \
+        f"Refined sections from unranked documents: {refined_documents - ranked_documents}"
+
+def test_mmr_document_cap():
+    """A per-document cap below top K leaves fewer, uniquely ranked sections."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_dir = create_collection(temp_dir)
+        document_count = len(list(input_dir.glob('*.pdf.txt')))
+
+        for cap in (1, 2):
+            output = run_system(input_dir, Path(temp_dir) / f"output_cap{cap}",
+                                mmr_lambda=0.7, max_per_document=cap)
+            check_ranks(output, cap)
+            assert len(output['extracted_sections']) == min(10, cap * document_count)
+            print(f"✓ Cap {cap}: {len(output['extracted_sections'])} sections, ranks unique")
+
+def test_default_ranks_unique():
+    """Without MMR the top 10 sections get ranks 1..10."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_dir = create_collection(temp_dir)
+        output = run_system(input_dir, Path(temp_dir) / "output")
+        check_ranks(output)
+        assert len(output['extracted_sections']) == 10
+        print("✓ Default ranking: 10 sections, ranks unique")
+
+def main():
+    """Main test function."""
+    try:
+        test_mmr_document_cap()
+        test_default_ranks_unique()
+        print("\n🎉 Ranking tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Ranking test failed: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
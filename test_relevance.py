@@ -0,0 +1,60 @@
+# Relevance Scoring Test for Document Intelligence System
+# Checks batch token-stream scoring against per-section scoring on edge-case inputs
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from src.persona_matcher import PersonaMatcher
+from src.collection_stats import CollectionStatistics
+from src.token_stream import TokenStream
+
+PERSONA = {'role': 'Travel Planner'}
+JOB = {'task': 'Plan a trip of 4 days for a group of 10 college friends.'}
+
+# Collections of sections with no word tokens, empty content and ordinary text
+COLLECTIONS = [
+    [{'title': 'Symbols', 'content': '... !!! ---'}],
+    [{'title': 'Symbols', 'content': '... !!! ---'}, {'title': 'Empty', 'content': ''}],
+    [{'title': 'Symbols', 'content': '... !!! ---'},
+     {'title': 'Trip Ideas', 'content': 'A budget trip for a group of college friends: hotel, beach and nightlife.'}],
+]
+
+def check_batch_matches_per_section(mode: str) -> None:
+    matcher = PersonaMatcher(scoring_mode=mode)
+    persona_profile = matcher.analyze_persona(PERSONA, JOB)
+
+    for sections in COLLECTIONS:
+        token_stream = TokenStream.build(sections)
+        collection_stats = CollectionStatistics.build(sections, token_stream) if mode == 'bm25' else None
+
+        expected = [matcher.calculate_relevance(section, persona_profile, collection_stats) for section in sections]
+        scores = matcher.calculate_relevance_batch(sections, persona_profile, collection_stats, token_stream)
+        assert len(scores) == len(expected)
+        for score, reference in zip(scores, expected):
+            assert abs(score - reference) < 1e-9, f"{mode}: batch score {score} != per-section {reference}"
+
+def test_keyword_stream_without_word_tokens():
+    """Keyword stream scoring handles sections with no word tokens (regression)."""
+    check_batch_matches_per_section('keyword')
+    print("✓ Keyword batch scoring matches per-section scoring")
+
+def test_bm25_stream_without_word_tokens():
+    """BM25 stream scoring handles sections with no word tokens."""
+    check_batch_matches_per_section('bm25')
+    print("✓ BM25 batch scoring matches per-section scoring")
+
+def main():
+    """Main test function."""
+    try:
+        test_keyword_stream_without_word_tokens()
+        test_bm25_stream_without_word_tokens()
+        print("\n🎉 Relevance scoring tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Relevance scoring test failed: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Result Cache Test for Document Intelligence System
+# Checks TTL expiry, LRU eviction and cache hits of the on-disk result cache
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from src.result_cache import ResultCache, ENTRY_SUFFIX
+
+def create_collection(collection_dir: Path) -> None:
+    """Copy the bundled travel documents with a dict-form job description."""
+    for document in (Path(__file__).parent / 'input').glob('*.pdf.txt'):
+        shutil.copy(document, collection_dir / document.name)
+
+    test_input = {
+        "persona": {"role": "Travel Planner"},
+        "job_to_be_done": {"task": "Plan a trip of 4 days for a group of 10 college friends."}
+    }
+    with open(collection_dir / "persona.json", 'w') as f:
+        json.dump(test_input, f, indent=2)
+
+def set_last_used(cache: ResultCache, key: str, timestamp: float) -> None:
+    """Set an entry's last-use time (its file modification time)."""
+    os.utime(cache.cache_dir / f"{key}{ENTRY_SUFFIX}", (timestamp, timestamp))
+
+def test_ttl_expiry():
+    """Entries older than the TTL are misses and are removed."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResultCache(temp_dir, ttl_seconds=0.2)
+        assert cache.put('fresh', b'payload', {'sections_extracted': 3})
+        assert cache.get('fresh') == (b'payload', {'sections_extracted': 3})
+
+        time.sleep(0.3)
+        assert cache.get('fresh') is None
+        assert cache.stats['expired'] == 1
+        assert not list(Path(temp_dir).glob(f"*{ENTRY_SUFFIX}")), "Expired entry was not removed"
+
+        # Without a TTL entries never expire
+        cache = ResultCache(temp_dir)
+        cache.put('kept', b'payload')
+        time.sleep(0.3)
+        assert cache.get('kept') == (b'payload', {})
+    print("✓ Expired entries are misses and removed")
+
+def test_lru_eviction():
+    """Least recently used entries go first when over the entry or byte limit."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResultCache(temp_dir, max_entries=2)
+        now = time.time()
+        cache.put('a', b'first')
+        set_last_used(cache, 'a', now - 30)
+        cache.put('b', b'second')
+        set_last_used(cache, 'b', now - 20)
+
+        # Using 'a' makes 'b' the least recently used entry
+        assert cache.get('a') is not None
+        cache.put('c', b'third')
+        assert cache.get('b') is None, "Least recently used entry was not evicted"
+        assert cache.get('a') is not None and cache.get('c') is not None
+        assert cache.stats['evictions'] == 1
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResultCache(temp_dir, max_bytes=1)
+        cache.put('a', b'x' * 100)
+        assert cache.get('a') is None, "Entry over the byte limit was kept"
+
+        cache = ResultCache(temp_dir)
+        cache.put('a', b'x' * 100)
+        cache.put('b', b'x' * 100)
+        entry_size = (cache.cache_dir / f"a{ENTRY_SUFFIX}").stat().st_size
+        set_last_used(cache, 'a', time.time() - 30)
+        cache.max_bytes = entry_size * 2 + entry_size // 2  # Room for two entries
+        cache.put('c', b'x' * 100)
+        assert cache.get('a') is None
+        assert cache.get('b') is not None and cache.get('c') is not None
+    print("✓ Least recently used entries are evicted")
+
+def test_cache_hit_result():
+    """A cache hit restores the same output and reports the same counts."""
+    from main import DocumentIntelligenceSystem
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        collection_dir = Path(temp_dir) / 'collection'
+        collection_dir.mkdir()
+        create_collection(collection_dir)
+
+        system = DocumentIntelligenceSystem(result_cache_dir=str(Path(temp_dir) / 'cache'))
+        miss = system.process_collection(str(collection_dir), str(Path(temp_dir) / 'miss'))
+        hit = system.process_collection(str(collection_dir), str(Path(temp_dir) / 'hit'))
+
+        assert miss['status'] == 'success' and not miss['cache_hit']
+        assert hit['status'] == 'success' and hit['cache_hit']
+        assert Path(hit['output_path']).read_bytes() == Path(miss['output_path']).read_bytes()
+        assert hit['sections_extracted'] == miss['sections_extracted']
+        assert hit['subsections_analyzed'] == miss['subsections_analyzed']
+        assert [path.name for path in Path(temp_dir, 'hit').iterdir()] == ['output.json'], \
+            "Temporary file left behind"
+    print("✓ Cache hits restore the output and its counts")
+
+def main():
+    """Main test function."""
+    try:
+        test_ttl_expiry()
+        test_lru_eviction()
+        test_cache_hit_result()
+        print("\n🎉 Result cache tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Result cache test failed: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# Service Test for Document Intelligence System
+# Checks request coalescing, admission control and HTTP responses of the local server
+
+import sys
+import json
+import time
+import socket
+import shutil
+import tempfile
+import threading
+import http.client
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from server import DocumentIntelligenceService, create_server
+from src.token_normalizer import TermTable
+
+class BlockingService(DocumentIntelligenceService):
+    """Service whose processing waits until released, recording each request processed."""
+
+    def __init__(self, **kwargs):
+        super().__init__({}, **kwargs)
+        self.processed = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _process(self, request):
+        self.processed.append(request)
+        self.started.set()
+        assert self.release.wait(10), "Request was never released"
+        return 200, json.dumps({'input_dir': request['input_dir']}).encode('utf-8')
+
+def run_in_thread(service, request, responses):
+    """Handle a request on a new thread, appending its response."""
+    thread = threading.Thread(target=lambda: responses.append(service.handle(request)))
+    thread.start()
+    return thread
+
+def wait_for(condition, timeout: float = 10.0) -> bool:
+    """Poll until a condition holds or the timeout passes."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_request_coalescing():
+    """Identical concurrent requests are processed once and share the response."""
+    service = BlockingService()
+    responses = []
+    leader = run_in_thread(service, {'input_dir': 'collection'}, responses)
+    assert service.started.wait(10)
+
+    followers = [run_in_thread(service, {'input_dir': 'collection'}, responses) for _ in range(3)]
+    assert wait_for(lambda: service.stats['coalesced'] == 3), "Identical requests were not coalesced"
+
+    service.release.set()
+    for thread in [leader] + followers:
+        thread.join(10)
+
+    assert len(service.processed) == 1
+    assert len(responses) == 4 and len(set(responses)) == 1
+    assert responses[0][0] == 200
+    assert service.health()['requests']['in_flight'] == 0
+
+    # Once the first request has finished, the same request is processed again
+    service.handle({'input_dir': 'collection'})
+    assert len(service.processed) == 2
+    print("✓ Identical in-flight requests are coalesced")
+
+def test_admission_rejection():
+    """Requests beyond max_pending are rejected with 503 without being processed."""
+    service = BlockingService(concurrency=1, max_pending=1)
+    responses = []
+    admitted = run_in_thread(service, {'input_dir': 'first'}, responses)
+    assert service.started.wait(10)
+
+    status, body = service.handle({'input_dir': 'second'})
+    assert status == 503, f"Expected 503, got {status}"
+    assert json.loads(body)['status'] == 'error'
+    assert service.stats['rejected'] == 1
+
+    service.release.set()
+    admitted.join(10)
+    assert responses[0][0] == 200
+    assert [request['input_dir'] for request in service.processed] == ['first']
+
+    # Capacity is released once the admitted request finishes
+    assert service.handle({'input_dir': 'third'})[0] == 200
+    print("✓ Requests over the admission limit are rejected")
+
+def test_http_process():
+    """POST /process returns the same output as processing the collection directly."""
+    from main import DocumentIntelligenceSystem
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_dir = Path(temp_dir) / 'input'
+        input_dir.mkdir()
+        for document in (Path(__file__).parent / 'input').glob('*.pdf.txt'):
+            shutil.copy(document, input_dir / document.name)
+        with open(input_dir / 'persona.json', 'w') as f:
+            json.dump({
+                "persona": {"role": "Travel Planner"},
+                "job_to_be_done": {"task": "Plan a trip of 4 days for a group of 10 college friends."}
+            }, f)
+
+        expected = DocumentIntelligenceSystem().process_collection(str(input_dir), str(Path(temp_dir) / 'output'))
+        expected_output = json.loads(Path(expected['output_path']).read_text())
+
+        server = create_server(DocumentIntelligenceService({}), port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=30)
+            connection.request('POST', '/process', json.dumps({'input_dir': str(input_dir)}))
+            response = connection.getresponse()
+            assert response.status == 200
+            output = json.loads(response.read())
+
+            connection.request('POST', '/process', b'[]')
+            response = connection.getresponse()
+            assert response.status == 400
+            response.read()
+
+            connection.request('GET', '/health')
+            health = json.loads(connection.getresponse().read())
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        for output_json in (output, expected_output):
+            del output_json['metadata']['processing_timestamp']
+        assert output == expected_output, "Service output differs from direct processing"
+        assert health['requests']['requests'] == 1
+        print("✓ HTTP requests are served")
+
+def test_unix_socket_path():
+    """Only stale sockets are replaced; other files and live sockets are left alone."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = DocumentIntelligenceService({})
+
+        # A regular file at the socket path is not deleted
+        regular_file = Path(temp_dir) / 'notes.txt'
+        regular_file.write_text('keep me')
+        try:
+            create_server(service, unix_socket=str(regular_file))
+            assert False, "Server replaced a regular file"
+        except ValueError:
+            pass
+        assert regular_file.read_text() == 'keep me'
+
+        # A socket nobody listens on is replaced
+        socket_path = str(Path(temp_dir) / 'service.sock')
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+        server = create_server(service, unix_socket=socket_path)
+
+        # A live server's socket is not taken over
+        try:
+            create_server(service, unix_socket=socket_path)
+            assert False, "Server took over a live socket"
+        except ValueError:
+            pass
+        finally:
+            server.server_close()
+    print("✓ Unix socket path is only replaced when stale")
+
+def test_term_table_bound():
+    """The shared term table stays within its size limit."""
+    term_table = TermTable(max_surfaces=100)
+    for index in range(1000):
+        assert term_table.normalize(f"Planning{index}.") == f"planning{index}"
+        assert len(term_table) <= 100
+    assert term_table.stats['resets'] > 0
+    assert term_table.normalize_tokens(['Trips', '--', 'planned']) == ['trip', 'plan']
+    print("✓ Term table is bounded")
+
+def main():
+    """Main test function."""
+    try:
+        test_request_coalescing()
+        test_admission_rejection()
+        test_http_process()
+        test_unix_socket_path()
+        test_term_table_bound()
+        print("\n🎉 Service tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Service test failed: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Top-K Retrieval Test for Document Intelligence System
+# Checks MaxScore retrieval against brute-force BM25 scoring
+
+import sys
+import random
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from src.persona_matcher import PersonaMatcher
+from src.collection_stats import CollectionStatistics, InvertedIndex
+from src.token_stream import TokenStream
+from src.topk_retriever import MaxScoreRetriever
+
+TOPIC_WORDS = ['itinerary', 'hotel', 'restaurant', 'beach', 'budget', 'group', 'friends',
+               'nightlife', 'train', 'college', 'trip', 'activities', 'culture', 'local']
+FILLER_WORDS = ['the', 'a', 'and', 'of', 'to', 'in', 'with', 'visitors', 'region', 'city',
+                'historic', 'quiet', 'evening', 'walk', 'view', 'famous', 'nearby', 'offers']
+
+def create_sections(count: int, seed: int):
+    """Create sections of random topic and filler words."""
+    rng = random.Random(seed)
+    sections = []
+    for index in range(count):
+        topic_ratio = rng.random() * 0.5
+        words = [rng.choice(TOPIC_WORDS) if rng.random() < topic_ratio else rng.choice(FILLER_WORDS)
+                 for _ in range(rng.randint(5, 80))]
+        sections.append({
+            'title': ' '.join(rng.sample(TOPIC_WORDS + FILLER_WORDS, 3)).title(),
+            'content': ' '.join(words),
+            'document': f"doc_{index % 4}.pdf",
+            'page_number': index // 4 + 1
+        })
+    # Sections with no scoring terms at all
+    sections.append({'title': '', 'content': 'the of and', 'document': 'doc_0.pdf', 'page_number': 1})
+    sections.append({'title': '', 'content': '', 'document': 'doc_1.pdf', 'page_number': 1})
+    return sections
+
+def test_topk_matches_brute_force():
+    """MaxScore top-K returns the brute-force BM25 top K with identical scores."""
+    matcher = PersonaMatcher(scoring_mode='bm25')
+    persona_profile = matcher.analyze_persona(
+        {'role': 'Travel Planner'},
+        {'task': 'Plan a trip of 4 days for a group of 10 college friends.'}
+    )
+    retriever = MaxScoreRetriever(matcher)
+
+    for seed in range(5):
+        sections = create_sections(60, seed)
+        token_stream = TokenStream.build(sections)
+        collection_stats = CollectionStatistics.build(sections, token_stream)
+        index = InvertedIndex.build(sections, token_stream)
+        scores = matcher.calculate_relevance_batch(sections, persona_profile, collection_stats, token_stream)
+
+        for k in (1, 5, 10, len(sections), len(sections) + 5):
+            retrieved = retriever.retrieve(sections, persona_profile, collection_stats, index, k)
+            expected_count = min(k, len(sections))
+            assert len(retrieved) == expected_count, f"seed {seed}, k {k}: {len(retrieved)} sections"
+
+            # Retrieved scores are the brute-force scores, in descending order
+            for section_index, score in retrieved:
+                assert abs(score - scores[section_index]) < 1e-9
+            retrieved_scores = [score for _, score in retrieved]
+            assert retrieved_scores == sorted(retrieved_scores, reverse=True)
+
+            # Same score multiset as the brute-force top K (ties may pick other sections)
+            expected = sorted(scores, reverse=True)[:expected_count]
+            assert all(abs(a - b) < 1e-9 for a, b in zip(retrieved_scores, expected)), \
+                f"seed {seed}, k {k}: top-K scores differ from brute force"
+
+    print("✓ MaxScore top-K matches brute-force BM25")
+
+def test_topk_empty():
+    """No sections or K of 0 retrieve nothing."""
+    matcher = PersonaMatcher(scoring_mode='bm25')
+    persona_profile = matcher.analyze_persona({'role': 'Travel Planner'}, {'task': 'Plan a trip'})
+    sections = create_sections(3, 0)
+    token_stream = TokenStream.build(sections)
+    collection_stats = CollectionStatistics.build(sections, token_stream)
+    index = InvertedIndex.build(sections, token_stream)
+
+    retriever = MaxScoreRetriever(matcher)
+    assert retriever.retrieve(sections, persona_profile, collection_stats, index, 0) == []
+    assert retriever.retrieve([], persona_profile, collection_stats, index, 5) == []
+    print("✓ Empty retrieval handled")
+
+def main():
+    """Main test function."""
+    try:
+        test_topk_matches_brute_force()
+        test_topk_empty()
+        print("\n🎉 Top-K retrieval tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Top-K retrieval test failed: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()